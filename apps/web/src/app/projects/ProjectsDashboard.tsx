@@ -9,11 +9,13 @@ import {
   CreateProjectPayload,
   ProjectDetail,
   ProjectSummary,
-  createProject
+  createProject,
+  getProjectsPage
 } from "@/lib/api";
 
 interface ProjectsDashboardProps {
   initialProjects: ProjectSummary[];
+  initialNextCursor: string | null;
   organizationId: number;
   clientId: number | null;
   canOpenConsole: boolean;
@@ -46,12 +48,15 @@ function detailToSummary(detail: ProjectDetail): ProjectSummary {
 
 export function ProjectsDashboard({
   initialProjects,
+  initialNextCursor,
   organizationId,
   clientId,
   canOpenConsole,
   canEnterIntake
 }: ProjectsDashboardProps) {
   const [projects, setProjects] = useState<ProjectSummary[]>(initialProjects);
+  const [nextCursor, setNextCursor] = useState<string | null>(initialNextCursor);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [formState, setFormState] = useState<FormState>(initialFormState);
   const [error, setError] = useState<string | null>(null);
   const [success, setSuccess] = useState<string | null>(null);
@@ -115,6 +120,30 @@ export function ProjectsDashboard({
     });
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) {
+      return;
+    }
+
+    setError(null);
+    setIsLoadingMore(true);
+    try {
+      const page = await getProjectsPage(
+        { organizationId, clientId: clientId ?? undefined },
+        { cursor: nextCursor }
+      );
+      setProjects((previous) => {
+        const known = new Set(previous.map((project) => project.id));
+        return [...previous, ...page.items.filter((project) => !known.has(project.id))];
+      });
+      setNextCursor(page.nextCursor);
+    } catch (loadError) {
+      setError(loadError instanceof Error ? loadError.message : "Failed to load more projects");
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   return (
     <div className="flex flex-col gap-8">
       <header className="flex flex-col gap-4 md:flex-row md:items-center md:justify-between">
@@ -248,6 +277,13 @@ export function ProjectsDashboard({
             </table>
           </div>
         )}
+        {nextCursor ? (
+          <div className="flex justify-center">
+            <Button variant="outline" onClick={handleLoadMore} disabled={isLoadingMore}>
+              {isLoadingMore ? "Loading..." : "Load more projects"}
+            </Button>
+          </div>
+        ) : null}
       </section>
     </div>
   );
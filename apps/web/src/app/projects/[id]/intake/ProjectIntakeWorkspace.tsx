@@ -6,6 +6,7 @@ import { useEffect, useMemo, useState } from "react";
 import { Button } from "@/components/ui/button";
 import {
   extractRequirements,
+  listRequirementsPage,
   type PersonaSummary,
   type Requirement
 } from "@/lib/api";
@@ -15,6 +16,7 @@ interface ProjectIntakeWorkspaceProps {
   projectName: string;
   personas: PersonaSummary[];
   initialRequirements: Requirement[];
+  initialNextCursor: string | null;
   canExtract: boolean;
 }
 
@@ -38,12 +40,15 @@ export function ProjectIntakeWorkspace({
   projectName,
   personas,
   initialRequirements,
+  initialNextCursor,
   canExtract
 }: ProjectIntakeWorkspaceProps) {
   const [selectedPersonaId, setSelectedPersonaId] = useState<string>(personas[0]?.id ?? "");
   const [message, setMessage] = useState("");
   const [messages, setMessages] = useState<ConversationMessage[]>([]);
   const [requirements, setRequirements] = useState<Requirement[]>(() => [...initialRequirements]);
+  const [nextCursor, setNextCursor] = useState<string | null>(initialNextCursor);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
@@ -67,6 +72,26 @@ export function ProjectIntakeWorkspace({
     );
   }, [requirements]);
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) {
+      return;
+    }
+
+    setIsLoadingMore(true);
+    try {
+      const page = await listRequirementsPage(projectId, undefined, { cursor: nextCursor });
+      setRequirements((previous) => {
+        const known = new Set(previous.map((requirement) => requirement.id));
+        return [...previous, ...page.items.filter((requirement) => !known.has(requirement.id))];
+      });
+      setNextCursor(page.nextCursor);
+    } catch (loadError) {
+      setError(loadError instanceof Error ? loadError.message : "Failed to load more requirements");
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const handlePersonaChange = (event: ChangeEvent<HTMLSelectElement>) => {
     setSelectedPersonaId(event.target.value);
     setMessages([]);
@@ -272,6 +297,11 @@ export function ProjectIntakeWorkspace({
             })}
           </ul>
         )}
+        {nextCursor ? (
+          <Button variant="outline" onClick={handleLoadMore} disabled={isLoadingMore}>
+            {isLoadingMore ? "Loading..." : "Load more requirements"}
+          </Button>
+        ) : null}
       </aside>
     </div>
   );
@@ -3,7 +3,7 @@ import { notFound } from "next/navigation";
 import { getServerSession } from "next-auth";
 
 import { ProjectIntakeWorkspace } from "./ProjectIntakeWorkspace";
-import { getProject, listRequirements } from "@/lib/api";
+import { getProject, listRequirementsPage, type Requirement } from "@/lib/api";
 import { authOptions } from "@/lib/auth/options";
 import { hasRequiredRole } from "@/lib/auth/guards";
 import { Roles } from "@/lib/auth/roles";
@@ -26,9 +26,12 @@ export default async function ProjectIntakePage({ params }: ProjectIntakePagePro
     notFound();
   }
 
-  let initialRequirements = [];
+  let initialRequirements: Requirement[] = [];
+  let initialNextCursor: string | null = null;
   try {
-    initialRequirements = await listRequirements(project.id);
+    const firstPage = await listRequirementsPage(project.id);
+    initialRequirements = firstPage.items;
+    initialNextCursor = firstPage.nextCursor;
   } catch (error) {
     console.error(`Failed to load requirements for project ${projectId}`, error);
   }
@@ -62,6 +65,7 @@ export default async function ProjectIntakePage({ params }: ProjectIntakePagePro
         projectName={project.name}
         personas={project.personas}
         initialRequirements={initialRequirements}
+        initialNextCursor={initialNextCursor}
         canExtract={canExtract}
       />
     </main>
@@ -1,7 +1,7 @@
 import { getServerSession } from "next-auth";
 
 import { ProjectsDashboard } from "./ProjectsDashboard";
-import { getProjects, type ProjectSummary } from "@/lib/api";
+import { getProjectsPage, type ProjectSummary } from "@/lib/api";
 import { authOptions } from "@/lib/auth/options";
 import { hasRequiredRole } from "@/lib/auth/guards";
 import { Roles } from "@/lib/auth/roles";
@@ -47,8 +47,11 @@ export default async function ProjectsPage({ searchParams }: ProjectsPageProps)
   const clientId = parseClientId(searchParams);
 
   let initialProjects: ProjectSummary[] = [];
+  let initialNextCursor: string | null = null;
   try {
-    initialProjects = await getProjects({ organizationId, clientId: clientId ?? undefined });
+    const firstPage = await getProjectsPage({ organizationId, clientId: clientId ?? undefined });
+    initialProjects = firstPage.items;
+    initialNextCursor = firstPage.nextCursor;
   } catch (error) {
     console.error("Failed to load projects", error);
   }
@@ -61,6 +64,7 @@ export default async function ProjectsPage({ searchParams }: ProjectsPageProps)
     <main className="container flex min-h-screen flex-col gap-8 py-12">
       <ProjectsDashboard
         initialProjects={initialProjects}
+        initialNextCursor={initialNextCursor}
         organizationId={organizationId}
         clientId={clientId}
         canOpenConsole={canOpenConsole}
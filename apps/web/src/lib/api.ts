@@ -104,6 +104,18 @@ export interface UpdateRequirementPayload {
   confidence?: number | null;
 }
 
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+export interface PageParams {
+  cursor?: string | null;
+  limit?: number;
+}
+
+const NEXT_CURSOR_HEADER = "X-Next-Cursor";
+
 type JsonRecord = Record<string, unknown>;
 
 type RequestOptions = RequestInit & { cache?: RequestCache };
@@ -123,7 +135,7 @@ function removeUndefined<T extends JsonRecord>(input: T): JsonRecord {
   );
 }
 
-async function requestJson<T>(path: string, init?: RequestOptions): Promise<T> {
+async function send(path: string, init?: RequestOptions): Promise<Response> {
   const response = await fetch(buildUrl(path), {
     cache: "no-store",
     headers: {
@@ -138,6 +150,12 @@ async function requestJson<T>(path: string, init?: RequestOptions): Promise<T> {
     throw new Error(`Request failed with status ${response.status}: ${message}`);
   }
 
+  return response;
+}
+
+async function requestJson<T>(path: string, init?: RequestOptions): Promise<T> {
+  const response = await send(path, init);
+
   if (response.status === 204) {
     return undefined as T;
   }
@@ -145,6 +163,47 @@ async function requestJson<T>(path: string, init?: RequestOptions): Promise<T> {
   return (await response.json()) as T;
 }
 
+function applyPageParams(search: URLSearchParams, page?: PageParams) {
+  if (page?.cursor) {
+    search.set("cursor", page.cursor);
+  }
+  if (page?.limit !== undefined) {
+    search.set("limit", String(page.limit));
+  }
+}
+
+async function requestPage<T>(
+  path: string,
+  search: URLSearchParams,
+  normalize: (dto: JsonRecord) => T,
+  page?: PageParams
+): Promise<Page<T>> {
+  const params = new URLSearchParams(search);
+  applyPageParams(params, page);
+
+  const response = await send(`${path}?${params.toString()}`);
+  const body = (await response.json()) as JsonRecord[];
+  return {
+    items: body.map((dto) => normalize(dto)),
+    nextCursor: response.headers.get(NEXT_CURSOR_HEADER)
+  };
+}
+
+async function requestAllPages<T>(
+  path: string,
+  search: URLSearchParams,
+  normalize: (dto: JsonRecord) => T
+): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: Page<T> = await requestPage(path, search, normalize, { cursor });
+    items.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return items;
+}
+
 function normalizeProjectBase(dto: JsonRecord): ProjectBase {
   return {
     id: dto.id as number,
@@ -225,7 +284,7 @@ export interface GetProjectsParams {
   userId?: number;
 }
 
-export async function getProjects(params: GetProjectsParams): Promise<ProjectSummary[]> {
+function projectSearchParams(params: GetProjectsParams): URLSearchParams {
   const search = new URLSearchParams({
     organization_id: String(params.organizationId)
   });
@@ -238,8 +297,18 @@ export async function getProjects(params: GetProjectsParams): Promise<ProjectSum
     search.set("user_id", String(params.userId));
   }
 
-  const response = await requestJson<JsonRecord[]>(`/v1/projects?${search.toString()}`);
-  return response.map((project) => normalizeProjectSummary(project));
+  return search;
+}
+
+export async function getProjectsPage(
+  params: GetProjectsParams,
+  page?: PageParams
+): Promise<Page<ProjectSummary>> {
+  return requestPage("/v1/projects", projectSearchParams(params), normalizeProjectSummary, page);
+}
+
+export async function getProjects(params: GetProjectsParams): Promise<ProjectSummary[]> {
+  return requestAllPages("/v1/projects", projectSearchParams(params), normalizeProjectSummary);
 }
 
 export async function createProject(payload: CreateProjectPayload): Promise<ProjectDetail> {
@@ -296,8 +365,7 @@ export async function deleteProject(projectId: number): Promise<void> {
 
 export async function listPersonas(projectId: number): Promise<Persona[]> {
   const search = new URLSearchParams({ project_id: String(projectId) });
-  const response = await requestJson<JsonRecord[]>(`/v1/personas?${search.toString()}`);
-  return response.map((persona) => normalizePersona(persona));
+  return requestAllPages("/v1/personas", search, normalizePersona);
 }
 
 export async function createPersona(payload: CreatePersonaPayload): Promise<Persona> {
@@ -345,17 +413,32 @@ export async function deletePersona(personaId: string): Promise<void> {
   });
 }
 
-export async function listRequirements(
-  projectId: number,
-  personaId?: string
-): Promise<Requirement[]> {
+function requirementSearchParams(projectId: number, personaId?: string): URLSearchParams {
   const search = new URLSearchParams({ project_id: String(projectId) });
   if (personaId) {
     search.set("persona_id", personaId);
   }
+  return search;
+}
 
-  const response = await requestJson<JsonRecord[]>(`/v1/requirements?${search.toString()}`);
-  return response.map((requirement) => normalizeRequirement(requirement));
+export async function listRequirementsPage(
+  projectId: number,
+  personaId?: string,
+  page?: PageParams
+): Promise<Page<Requirement>> {
+  return requestPage(
+    "/v1/requirements",
+    requirementSearchParams(projectId, personaId),
+    normalizeRequirement,
+    page
+  );
+}
+
+export async function listRequirements(
+  projectId: number,
+  personaId?: string
+): Promise<Requirement[]> {
+  return requestAllPages("/v1/requirements", requirementSearchParams(projectId, personaId), normalizeRequirement);
 }
 
 export async function extractRequirements(
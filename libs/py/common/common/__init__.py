@@ -1,6 +1,6 @@
 """Shared models and utilities for ai-pm services."""
 
-from . import models, utils
+from . import embeddings, extraction, intake, models, reembed, utils
 
-__all__ = ["models", "utils", "__version__"]
+__all__ = ["embeddings", "extraction", "intake", "models", "reembed", "utils", "__version__"]
 __version__ = "0.1.0"
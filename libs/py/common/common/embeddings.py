@@ -0,0 +1,139 @@
+"""Text embedding providers for conversation turns.
+
+Providers embed a batch of texts per call into a fixed number of dimensions,
+matching the ``vector`` column created by the migrations. The default
+`HashingEmbedder` needs no model files or network access: word unigrams and
+bigrams are hashed into signed buckets (the "hashing trick") and each row is
+L2-normalized, so cosine similarity reflects shared vocabulary.
+"""
+
+from __future__ import annotations
+
+import importlib
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Protocol, runtime_checkable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .extraction import tokenize
+
+# Dimension of stored embeddings; changing it requires a migration and a re-embed.
+EMBEDDING_DIMENSION = 384
+DEFAULT_EMBEDDER = "hashing"
+EMBED_BATCH_WORKFLOW_NAME = "EmbedBatchWorkflow"
+
+
+@runtime_checkable
+class EmbeddingProvider(Protocol):
+    """Embeds batches of texts into ``dimension``-sized float32 vectors."""
+
+    @property
+    def dimension(self) -> int:
+        """Length of every embedding produced."""
+        ...
+
+    @property
+    def model_version(self) -> str:
+        """Identifier that changes whenever the provider would embed a text differently."""
+        ...
+
+    def embed(self, texts: Sequence[str]) -> NDArray[np.float32]:
+        """Return an array shaped ``(len(texts), dimension)``."""
+        ...
+
+
+class HashingEmbedder:
+    """Deterministic, offline embedder built on signed feature hashing."""
+
+    def __init__(self, dimension: int = EMBEDDING_DIMENSION) -> None:
+        self._dimension = dimension
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    @property
+    def model_version(self) -> str:
+        return f"hashing-v1-{self._dimension}"
+
+    def embed(self, texts: Sequence[str]) -> NDArray[np.float32]:
+        rows: list[int] = []
+        tokens: list[str] = []
+        for index, text in enumerate(texts):
+            features = tokenize(text)
+            tokens.extend(features)
+            rows.extend([index] * len(features))
+
+        count = len(tokens)
+        hashes = np.fromiter(map(zlib.crc32, map(str.encode, tokens)), dtype=np.uint32, count=count)
+        # The low bits pick the bucket and the top bit the sign, so collisions tend to cancel out.
+        buckets = (hashes % self._dimension).astype(np.intp)
+        signs = np.where(hashes >> 31, -1.0, 1.0)
+        flat = np.asarray(rows, dtype=np.intp) * self._dimension + buckets
+        size = len(texts) * self._dimension
+        vectors = np.bincount(flat, weights=signs, minlength=size).astype(np.float64, copy=False)
+        vectors = vectors.reshape(len(texts), self._dimension)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors.astype(np.float32)
+
+
+@dataclass(slots=True)
+class EmbedBatchRequest:
+    """Texts sent to the worker to be embedded together."""
+
+    texts: list[str]
+    provider: str = DEFAULT_EMBEDDER
+
+
+@dataclass(slots=True)
+class EmbedBatchResult:
+    """Embeddings for an `EmbedBatchRequest`, in request order."""
+
+    vectors: list[list[float]] = field(default_factory=list)
+
+
+def load_embedder(spec: str = DEFAULT_EMBEDDER, dimension: int = EMBEDDING_DIMENSION) -> EmbeddingProvider:
+    """Resolve an embedding provider from configuration.
+
+    ``spec`` is ``"hashing"`` for the built-in provider or ``"module:factory"``
+    naming a zero-argument callable returning any `EmbeddingProvider`. The
+    provider must produce ``dimension``-sized vectors.
+    """
+    if spec == DEFAULT_EMBEDDER:
+        provider: EmbeddingProvider = HashingEmbedder(dimension)
+    else:
+        module_name, _, attribute = spec.partition(":")
+        if not attribute:
+            raise ValueError(f"Unknown embedding provider {spec!r}")
+        provider = getattr(importlib.import_module(module_name), attribute)()
+        if not isinstance(provider, EmbeddingProvider):
+            raise TypeError(f"{spec!r} did not produce an EmbeddingProvider")
+
+    if provider.dimension != dimension:
+        raise ValueError(f"{spec!r} produces {provider.dimension}-dimensional embeddings, expected {dimension}")
+    return provider
+
+
+@cache
+def get_embedder(spec: str = DEFAULT_EMBEDDER) -> EmbeddingProvider:
+    """Process-wide embedding provider for a spec, loaded on first use."""
+    return load_embedder(spec)
+
+
+__all__ = [
+    "DEFAULT_EMBEDDER",
+    "EMBEDDING_DIMENSION",
+    "EMBED_BATCH_WORKFLOW_NAME",
+    "EmbedBatchRequest",
+    "EmbedBatchResult",
+    "EmbeddingProvider",
+    "HashingEmbedder",
+    "get_embedder",
+    "load_embedder",
+]
@@ -0,0 +1,194 @@
+"""Batched requirement classifiers used by intake extraction.
+
+A classifier receives a batch of segments and returns one `ExtractedRequirement`
+per segment. The built-in `HashedLinearClassifier` hashes word unigrams and
+bigrams into a fixed number of buckets and scores the whole batch against a
+linear model with a handful of NumPy operations, so the cost per segment is
+dominated by tokenization rather than Python-level scoring loops.
+"""
+
+from __future__ import annotations
+
+import importlib
+import re
+import zlib
+from collections.abc import Mapping, Sequence
+from functools import cache
+from itertools import pairwise
+from os import PathLike
+from typing import Protocol, runtime_checkable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .intake import ExtractedRequirement, RequirementType
+
+DEFAULT_CLASSIFIER = "hashed-linear"
+DEFAULT_FEATURE_BUCKETS = 2**18
+CLASSES: tuple[RequirementType, ...] = tuple(RequirementType)
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Seed vocabulary for the built-in model until weights trained on labelled
+# requirements are shipped. Entries may be unigrams or bigrams.
+_SEED_LEXICON: Mapping[RequirementType, tuple[str, ...]] = {
+    RequirementType.FEATURE: (
+        "add", "allow", "allows", "ability", "able to", "support", "enable", "new", "let",
+        "create", "export", "import", "integrate", "integration", "notify", "want",
+    ),
+    RequirementType.BUG: (
+        "bug", "crash", "crashes", "crashed", "error", "errors", "broken", "fails", "failed",
+        "failing", "exception", "incorrect", "wrong", "regression", "doesn't", "does not",
+        "cannot", "can't", "not working", "stuck", "freezes", "missing",
+    ),
+    RequirementType.IMPROVEMENT: (
+        "improve", "improved", "improvement", "faster", "better", "optimize", "optimise",
+        "enhance", "simplify", "streamline", "reduce", "speed up", "slow", "easier", "cleaner",
+        "more intuitive", "refine", "polish",
+    ),
+    RequirementType.CONSTRAINT: (
+        "must", "must not", "shall", "never", "at least", "at most", "no more", "within",
+        "maximum", "minimum", "limit", "comply", "compliance", "gdpr", "hipaa", "soc", "budget",
+        "deadline", "only", "required", "mandatory", "sla", "latency",
+    ),
+}
+_SEED_WEIGHT = 2.0
+_SEED_BIAS = {RequirementType.FEATURE: 0.25}
+
+
+@runtime_checkable
+class RequirementClassifier(Protocol):
+    """Assigns a requirement type and confidence to every segment of a batch."""
+
+    def classify(self, segments: Sequence[str]) -> list[ExtractedRequirement]:
+        """Return one extracted requirement per segment, in order."""
+        ...
+
+
+def tokenize(segment: str) -> list[str]:
+    """Lowercased word unigrams followed by adjacent bigrams."""
+    words = _TOKEN.findall(segment.lower())
+    return words + [f"{first} {second}" for first, second in pairwise(words)]
+
+
+def _buckets(tokens: list[str], buckets: int) -> NDArray[np.intp]:
+    # crc32 rather than hash(): bucket ids must be stable across processes.
+    hashes = np.fromiter(map(zlib.crc32, map(str.encode, tokens)), dtype=np.uint32, count=len(tokens))
+    return (hashes % buckets).astype(np.intp)
+
+
+class HashedLinearClassifier:
+    """Linear model over hashed bag-of-words features, scored a batch at a time."""
+
+    def __init__(self, weights: NDArray[np.float32], bias: NDArray[np.float32]) -> None:
+        if weights.ndim != 2 or weights.shape[1] != len(CLASSES):
+            raise ValueError(f"weights must have shape (buckets, {len(CLASSES)})")
+        if bias.shape != (len(CLASSES),):
+            raise ValueError(f"bias must have shape ({len(CLASSES)},)")
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+
+    @property
+    def buckets(self) -> int:
+        """Number of hashed feature buckets."""
+        return int(self.weights.shape[0])
+
+    @classmethod
+    def seeded(cls, buckets: int = DEFAULT_FEATURE_BUCKETS) -> HashedLinearClassifier:
+        """Build the built-in model from the seed lexicon."""
+        weights = np.zeros((buckets, len(CLASSES)), dtype=np.float32)
+        for column, requirement_type in enumerate(CLASSES):
+            for term in _SEED_LEXICON[requirement_type]:
+                weights[_buckets([term], buckets)[0], column] += _SEED_WEIGHT
+        bias = np.array([_SEED_BIAS.get(requirement_type, 0.0) for requirement_type in CLASSES], dtype=np.float32)
+        return cls(weights, bias)
+
+    @classmethod
+    def load(cls, path: str | PathLike[str]) -> HashedLinearClassifier:
+        """Load weights saved with `save`."""
+        with np.load(path) as archive:
+            return cls(archive["weights"], archive["bias"])
+
+    def save(self, path: str | PathLike[str]) -> None:
+        """Persist the model as an ``.npz`` archive."""
+        np.savez_compressed(path, weights=self.weights, bias=self.bias)
+
+    def _feature_ids(self, segments: Sequence[str]) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+        """Flattened bucket ids for the batch plus the offset where each segment starts."""
+        tokens: list[str] = []
+        offsets = np.empty(len(segments), dtype=np.intp)
+        for index, segment in enumerate(segments):
+            offsets[index] = len(tokens)
+            tokens.extend(tokenize(segment))
+        return _buckets(tokens, self.buckets), offsets
+
+    def decision_function(self, segments: Sequence[str]) -> NDArray[np.float32]:
+        """Class logits for each segment, shaped ``(len(segments), len(CLASSES))``."""
+        logits = np.tile(self.bias, (len(segments), 1))
+        if not segments:
+            return logits
+
+        ids, offsets = self._feature_ids(segments)
+        if ids.size:
+            # Sum each segment's feature rows in one pass; segments without tokens keep the bias.
+            counts = np.diff(np.append(offsets, ids.size))
+            non_empty = counts > 0
+            logits[non_empty] += np.add.reduceat(self.weights[ids], offsets[non_empty], axis=0)
+        return logits
+
+    def predict_proba(self, segments: Sequence[str]) -> NDArray[np.float32]:
+        """Softmax class probabilities for each segment."""
+        logits = self.decision_function(segments)
+        logits -= logits.max(axis=1, keepdims=True)
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=1, keepdims=True)
+        return logits
+
+    def classify(self, segments: Sequence[str]) -> list[ExtractedRequirement]:
+        """Label each segment with its most probable type."""
+        probabilities = self.predict_proba(segments)
+        labels = probabilities.argmax(axis=1)
+        confidences = probabilities[np.arange(len(segments)), labels].astype(np.float64).round(4)
+        return [
+            ExtractedRequirement(text=segment, type=CLASSES[label], confidence=confidence)
+            for segment, label, confidence in zip(segments, labels.tolist(), confidences.tolist())
+        ]
+
+
+def load_classifier(spec: str = DEFAULT_CLASSIFIER) -> RequirementClassifier:
+    """Resolve a classifier from configuration.
+
+    ``spec`` is ``"hashed-linear"`` for the built-in model, a path to an ``.npz``
+    archive of `HashedLinearClassifier` weights, or ``"module:factory"`` naming a
+    zero-argument callable that returns any `RequirementClassifier`.
+    """
+    if spec == DEFAULT_CLASSIFIER:
+        return HashedLinearClassifier.seeded()
+    if spec.endswith(".npz"):
+        return HashedLinearClassifier.load(spec)
+
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown classifier {spec!r}")
+    classifier = getattr(importlib.import_module(module_name), attribute)()
+    if not isinstance(classifier, RequirementClassifier):
+        raise TypeError(f"{spec!r} did not produce a RequirementClassifier")
+    return classifier
+
+
+@cache
+def get_classifier(spec: str = DEFAULT_CLASSIFIER) -> RequirementClassifier:
+    """Process-wide classifier instance for a spec, loaded on first use."""
+    return load_classifier(spec)
+
+
+__all__ = [
+    "CLASSES",
+    "DEFAULT_CLASSIFIER",
+    "DEFAULT_FEATURE_BUCKETS",
+    "HashedLinearClassifier",
+    "RequirementClassifier",
+    "get_classifier",
+    "load_classifier",
+    "tokenize",
+]
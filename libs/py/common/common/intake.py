@@ -0,0 +1,143 @@
+"""Requirement intake contract shared by the API and the Temporal worker."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .extraction import RequirementClassifier
+
+INTAKE_WORKFLOW_NAME = "IntakeWorkflow"
+MAX_SEGMENT_CHARS = 65_536
+_SEGMENT_STRIP = " -\u2022"
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+
+
+class RequirementType(StrEnum):
+    """Requirement classification categories produced by extraction.
+
+    A `StrEnum` rather than a `str` mixin so Temporal's JSON converter restores it.
+    """
+
+    FEATURE = "feature"
+    BUG = "bug"
+    IMPROVEMENT = "improvement"
+    CONSTRAINT = "constraint"
+
+
+@dataclass(slots=True)
+class IntakeRequest:
+    """Raw intake text submitted for extraction on behalf of a persona."""
+
+    project_id: int
+    persona_id: str
+    text: str
+    # Intake job the worker records the outcome on; ``None`` only returns the result.
+    job_id: str | None = None
+
+
+@dataclass(slots=True)
+class ExtractedRequirement:
+    """A single requirement recovered from intake text."""
+
+    text: str
+    type: RequirementType = RequirementType.FEATURE
+    confidence: float | None = None
+
+
+@dataclass(slots=True)
+class IntakeResult:
+    """Outcome of an intake extraction run."""
+
+    requirements: list[ExtractedRequirement] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class IntakeJobOutcome:
+    """Requirements, or the error, the worker records on a finished intake job."""
+
+    job_id: str
+    project_id: int
+    persona_id: str
+    requirements: list[ExtractedRequirement] = field(default_factory=list)
+    error: str | None = None
+
+
+def _split_sentences(line: str) -> list[str]:
+    return [cleaned for sentence in _SENTENCE_BOUNDARY.split(line) if (cleaned := sentence.strip(_SEGMENT_STRIP))]
+
+
+class SegmentStream:
+    """Incrementally split text chunks into sentence segments without buffering the whole input.
+
+    Only the trailing partial line is held between chunks, and a line longer than
+    ``max_segment_chars`` is emitted in pieces so memory stays bounded.
+    """
+
+    def __init__(self, max_segment_chars: int = MAX_SEGMENT_CHARS) -> None:
+        self._max_segment_chars = max_segment_chars
+        self._pending = ""
+
+    def feed(self, chunk: str) -> list[str]:
+        """Consume a chunk and return the segments completed by it."""
+        lines = (self._pending + chunk.replace("\r", "")).splitlines(keepends=True)
+        self._pending = ""
+        if lines and lines[-1].splitlines() == [lines[-1]]:
+            self._pending = lines.pop()
+
+        segments = [sentence for line in lines for sentence in _split_sentences(line.splitlines()[0])]
+        while len(self._pending) > self._max_segment_chars:
+            piece = self._pending[: self._max_segment_chars]
+            self._pending = self._pending[self._max_segment_chars :]
+            segments.extend(_split_sentences(piece))
+        return segments
+
+    def close(self) -> list[str]:
+        """Flush the trailing line once the input is exhausted."""
+        segments = _split_sentences(self._pending)
+        self._pending = ""
+        return segments
+
+
+def iter_segments(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield segments from an iterable of text chunks, one per sentence of each non-empty line."""
+    stream = SegmentStream()
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    yield from stream.close()
+
+
+def segment_text(text: str) -> list[str]:
+    """Split raw text into candidate requirement segments, one per sentence of each line."""
+    cleaned = list(iter_segments([text]))
+    if not cleaned and text.strip():
+        cleaned = [text.strip()]
+    return cleaned
+
+
+def extract_requirements(text: str, classifier: RequirementClassifier | None = None) -> list[ExtractedRequirement]:
+    """Segment text and classify all segments as one batch, with the built-in model by default."""
+    if classifier is None:
+        from .extraction import get_classifier
+
+        classifier = get_classifier()
+    return classifier.classify(segment_text(text))
+
+
+__all__ = [
+    "INTAKE_WORKFLOW_NAME",
+    "MAX_SEGMENT_CHARS",
+    "ExtractedRequirement",
+    "IntakeJobOutcome",
+    "IntakeRequest",
+    "IntakeResult",
+    "RequirementType",
+    "SegmentStream",
+    "extract_requirements",
+    "iter_segments",
+    "segment_text",
+]
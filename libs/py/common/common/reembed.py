@@ -0,0 +1,91 @@
+"""Re-embedding contract shared by the API and the Temporal worker.
+
+`ReembedWorkflow` recomputes every stored conversation turn embedding, for
+example after the embedding provider or dimension changes. The turn id space
+is split into ``concurrency`` contiguous UUID ranges that are walked in
+parallel, one keyset page per activity. Each range's cursor lives in the
+workflow input, so when the workflow continues as new (every
+``pages_per_run`` pages) or is resumed after a crash, finished pages are not
+processed again.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, field
+
+from .embeddings import DEFAULT_EMBEDDER
+
+REEMBED_WORKFLOW_NAME = "ReembedWorkflow"
+_UUID_SPACE = 1 << 128
+
+
+@dataclass(slots=True)
+class ReembedPartition:
+    """Turn ids above ``after_id`` up to and including ``before_id``; ``None`` leaves a side open."""
+
+    after_id: str | None = None
+    before_id: str | None = None
+    done: bool = False
+
+
+@dataclass(slots=True)
+class ReembedRequest:
+    """Options for a re-embed run, plus the checkpoint carried across continue-as-new."""
+
+    provider: str = DEFAULT_EMBEDDER
+    page_size: int = 500
+    concurrency: int = 4
+    rows_per_second: float | None = None
+    pages_per_run: int = 500
+    partitions: list[ReembedPartition] = field(default_factory=list)
+    processed: int = 0
+    total: int | None = None
+
+
+@dataclass(slots=True)
+class ReembedPageRequest:
+    """One keyset page of a partition to re-embed."""
+
+    provider: str
+    page_size: int
+    after_id: str | None = None
+    before_id: str | None = None
+
+
+@dataclass(slots=True)
+class ReembedPageResult:
+    """Outcome of re-embedding a page: rows written and the last id seen."""
+
+    count: int = 0
+    last_id: str | None = None
+
+
+@dataclass(slots=True)
+class ReembedProgress:
+    """Progress of a re-embed run, as returned by its ``progress`` query."""
+
+    processed: int = 0
+    total: int | None = None
+    partitions: int = 0
+    completed_partitions: int = 0
+
+
+def split_id_space(count: int) -> list[ReembedPartition]:
+    """Split the UUID space into ``count`` equal ranges; random (v4) ids spread evenly across them."""
+    bounds = [str(uuid.UUID(int=_UUID_SPACE * index // count)) for index in range(1, count)]
+    return [
+        ReembedPartition(after_id=after_id, before_id=before_id)
+        for after_id, before_id in zip([None, *bounds], [*bounds, None])
+    ]
+
+
+__all__ = [
+    "REEMBED_WORKFLOW_NAME",
+    "ReembedPageRequest",
+    "ReembedPageResult",
+    "ReembedPartition",
+    "ReembedProgress",
+    "ReembedRequest",
+    "split_id_space",
+]
@@ -2,9 +2,16 @@
 
 from fastapi import APIRouter
 
+from app.api.async_routes import async_router
 from app.api.v1 import router as v1_router
+from app.config import Settings
+from app.db.base import DATABASE_MODES
+
+_mode = Settings().database_mode
+if _mode not in DATABASE_MODES:
+    raise ValueError(f"Unknown database mode {_mode!r}; expected one of {DATABASE_MODES}")
 
 api_router = APIRouter()
-api_router.include_router(v1_router, prefix="/v1", tags=["v1"])
+api_router.include_router(v1_router if _mode == "sync" else async_router(v1_router), prefix="/v1", tags=["v1"])
 
 __all__ = ["api_router"]
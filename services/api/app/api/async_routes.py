@@ -0,0 +1,121 @@
+"""Async variants of the sync route handlers, selected with ``DATABASE_MODE=async``.
+
+Sync handlers run on the anyio threadpool, so concurrency is capped by its
+size (40 threads by default) and every request pays a thread hand-off. In
+async mode `async_router` rebuilds a router so each sync handler that takes a
+`get_session` session becomes a coroutine. The wrapper receives an
+`AsyncSession` and runs the original handler body through
+`AsyncSession.run_sync`, so the handler code is shared between the two modes
+while its queries are awaited on the async driver on the event loop.
+
+Handlers doing CPU-heavy work besides their queries (embedding text, scoring
+vectors) are marked with `keep_in_threadpool` and stay sync, since running
+them on the event loop would stall every other request. Handlers that are
+already coroutines, and read-only handlers routed to replicas through
+`get_read_session`, are left as they are.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any, TypeVar, get_type_hints
+
+from fastapi import APIRouter, Depends, params
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.base import get_async_session, get_session
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_ROUTE_ATTRIBUTES = (
+    "response_model",
+    "status_code",
+    "tags",
+    "dependencies",
+    "summary",
+    "description",
+    "response_description",
+    "responses",
+    "deprecated",
+    "methods",
+    "operation_id",
+    "response_model_include",
+    "response_model_exclude",
+    "response_model_by_alias",
+    "response_model_exclude_unset",
+    "response_model_exclude_defaults",
+    "response_model_exclude_none",
+    "include_in_schema",
+    "response_class",
+    "name",
+    "callbacks",
+    "openapi_extra",
+    "generate_unique_id_function",
+)
+
+
+def keep_in_threadpool(endpoint: F) -> F:
+    """Keep a sync handler on the threadpool in async mode."""
+    endpoint.__keep_in_threadpool__ = True  # type: ignore[attr-defined]
+    return endpoint
+
+
+def _session_parameter(endpoint: Callable[..., Any]) -> str | None:
+    for parameter in inspect.signature(endpoint).parameters.values():
+        if isinstance(parameter.default, params.Depends) and parameter.default.dependency is get_session:
+            return parameter.name
+    return None
+
+
+def _async_endpoint(endpoint: Callable[..., Any], session_parameter: str) -> Callable[..., Any]:
+    # Annotations are resolved here because FastAPI would look string annotations up in this module.
+    hints = get_type_hints(endpoint, include_extras=True)
+    signature = inspect.signature(endpoint)
+    parameters = [
+        parameter.replace(annotation=AsyncSession, default=Depends(get_async_session))
+        if parameter.name == session_parameter
+        else parameter.replace(annotation=hints.get(parameter.name, parameter.annotation))
+        for parameter in signature.parameters.values()
+    ]
+
+    @functools.wraps(endpoint)
+    async def run(**kwargs: Any) -> Any:
+        session: AsyncSession = kwargs.pop(session_parameter)
+
+        def call(sync_session: Session) -> Any:
+            return endpoint(**kwargs, **{session_parameter: sync_session})
+
+        return await session.run_sync(call)
+
+    run.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=parameters,
+        return_annotation=hints.get("return", signature.return_annotation),
+    )
+    return run
+
+
+def async_router(router: APIRouter) -> APIRouter:
+    """Copy of ``router`` whose eligible sync handlers run on `AsyncSession`."""
+    converted = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            converted.routes.append(route)
+            continue
+        endpoint: Callable[..., Any] = route.endpoint
+        if (
+            inspect.iscoroutinefunction(endpoint)
+            or getattr(endpoint, "__keep_in_threadpool__", False)
+            or (session_parameter := _session_parameter(endpoint)) is None
+        ):
+            converted.routes.append(route)
+            continue
+        attributes: dict[str, Any] = {attribute: getattr(route, attribute) for attribute in _ROUTE_ATTRIBUTES}
+        converted.routes.append(APIRoute(route.path, _async_endpoint(endpoint, session_parameter), **attributes))
+    return converted
+
+
+__all__ = ["async_router", "keep_in_threadpool"]
@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Annotated
 
-from fastapi import Header, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 
 ALLOWED_ROLES = {"admin", "lead", "client"}
 DEV_USER_HEADER = "x-dev-user"
@@ -87,4 +87,11 @@ async def get_current_user(
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
 
-__all__ = ["AuthenticatedUser", "get_current_user"]
+async def require_admin(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
+    """Return the current user, rejecting anyone without the admin role."""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required")
+    return current_user
+
+
+__all__ = ["AuthenticatedUser", "get_current_user", "require_admin"]
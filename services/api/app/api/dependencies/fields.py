@@ -0,0 +1,90 @@
+"""Sparse fieldset helpers shared by read endpoints.
+
+``fields=id,text`` limits each returned object to those fields and lets the
+endpoint trim its SQL ``SELECT`` to the columns behind them. Some fields are
+left out by default because they are large (conversation turn embeddings);
+``include=embedding`` opts back into them. Responses built this way skip
+response-model validation, so endpoints return them through `sparse_json`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Annotated, Any
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import RowMapping
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def _split(value: str | None) -> frozenset[str] | None:
+    names = frozenset(name for name in (part.strip() for part in (value or "").split(",")) if name)
+    return names or None
+
+
+@dataclass(slots=True, frozen=True)
+class FieldSelection:
+    """Fields requested through ``fields=`` (``None`` for the defaults) and opted into through ``include=``."""
+
+    fields: frozenset[str] | None
+    include: frozenset[str]
+
+    def resolve(self, model: type[BaseModel], opt_in: Collection[str] = ()) -> list[str]:
+        """Names of ``model``'s fields to return, in declaration order."""
+        available = list(model.model_fields)
+        unknown = ((self.fields or frozenset()) | self.include) - set(available)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        if self.fields is None:
+            return [name for name in available if name not in opt_in or name in self.include]
+        return [name for name in available if name in self.fields or name in self.include]
+
+
+def get_field_selection(
+    fields: Annotated[
+        str | None,
+        Query(description="Comma-separated fields to return; defaults to every field except opt-in ones."),
+    ] = None,
+    include: Annotated[
+        str | None,
+        Query(description="Comma-separated opt-in fields to add, such as embedding."),
+    ] = None,
+) -> FieldSelection:
+    """Parse sparse fieldset query parameters."""
+    return FieldSelection(fields=_split(fields), include=_split(include) or frozenset())
+
+
+def columns_for(entity: Any, names: Iterable[str], *required: str) -> list[InstrumentedAttribute[Any]]:
+    """ORM columns of ``entity`` for the selected names plus ``required`` ones, without duplicates."""
+    wanted = dict.fromkeys([*required, *names])
+    return [getattr(entity, name) for name in wanted]
+
+
+def serialize(
+    model: type[BaseModel], values: RowMapping | Mapping[str, Any], names: Sequence[str]
+) -> dict[str, Any]:
+    """JSON-ready dict of the selected fields, using ``model``'s serializers."""
+    selected = set(names)
+    # model_construct skips validation, so fields that were not selected (or loaded) may be absent.
+    present = {name: value for name, value in values.items() if name in selected}
+    return model.model_construct(**present).model_dump(mode="json", include=selected)
+
+
+def sparse_json(content: Any, response: Response, status_code: int = status.HTTP_200_OK) -> JSONResponse:
+    """JSON response carrying the headers (pagination links) set on the injected ``response``."""
+    return JSONResponse(content=content, status_code=status_code, headers=dict(response.headers))
+
+
+__all__ = [
+    "FieldSelection",
+    "columns_for",
+    "get_field_selection",
+    "serialize",
+    "sparse_json",
+]
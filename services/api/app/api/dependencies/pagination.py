@@ -0,0 +1,144 @@
+"""Keyset pagination helpers shared by list endpoints."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Any, TypeVar
+
+from fastapi import HTTPException, Query, Request, Response, status
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import DateTime
+
+from app.api.dependencies.streaming import wants_ndjson
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+class _keyset_timestamp(FunctionElement):
+    """Cursor timestamp rendered to compare consistently with stored values.
+
+    SQLite stores ``CURRENT_TIMESTAMP`` defaults as second-resolution text while
+    bound datetimes carry microseconds, so the bound value is normalized there.
+    The column side is left bare so composite indexes can serve the ordering.
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(_keyset_timestamp)
+def _compile_keyset_timestamp(element: _keyset_timestamp, compiler: Any, **kw: Any) -> str:
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(_keyset_timestamp, "sqlite")
+def _compile_keyset_timestamp_sqlite(element: _keyset_timestamp, compiler: Any, **kw: Any) -> str:
+    return f"datetime({compiler.process(element.clauses, **kw)})"
+
+
+def encode_cursor(created_at: datetime, identifier: Any) -> str:
+    """Encode the `(created_at, id)` position of a row as an opaque cursor."""
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(identifier)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a cursor produced by `encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), str(data["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+@dataclass(slots=True)
+class Pagination:
+    """Requested page window plus the response used to advertise the next page.
+
+    ``stream`` is set for NDJSON requests, which read every row after the
+    cursor rather than a single page.
+    """
+
+    limit: int
+    after: tuple[datetime, str] | None
+    request: Request
+    response: Response
+    stream: bool = False
+
+    def apply(
+        self,
+        stmt: Select[Any],
+        created_at_column: ColumnElement[datetime] | InstrumentedAttribute[datetime],
+        id_column: ColumnElement[Any] | InstrumentedAttribute[Any],
+    ) -> Select[Any]:
+        """Restrict a statement to the rows following the cursor, in keyset order.
+
+        Streamed requests are not limited to a page.
+        """
+        if self.after is not None:
+            after_created_at, raw_id = self.after
+            try:
+                after_id = id_column.type.python_type(raw_id)
+            except (TypeError, ValueError) as exc:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+            stmt = stmt.where(
+                tuple_(created_at_column, id_column)
+                > tuple_(_keyset_timestamp(after_created_at), literal(after_id, id_column.type))
+            )
+
+        stmt = stmt.order_by(created_at_column.asc(), id_column.asc())
+        if self.stream:
+            return stmt
+        # One extra row tells us whether another page exists without a COUNT query.
+        return stmt.limit(self.limit + 1)
+
+    def finalize(self, rows: Sequence[T], key: Callable[[T], tuple[datetime, Any]]) -> list[T]:
+        """Trim the look-ahead row and expose the next cursor through response headers."""
+        items = list(rows[: self.limit])
+        if len(rows) <= self.limit or not items:
+            return items
+
+        next_cursor = encode_cursor(*key(items[-1]))
+        next_url = self.request.url.include_query_params(cursor=next_cursor, limit=self.limit)
+        self.response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        self.response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return items
+
+
+def get_pagination(
+    request: Request,
+    response: Response,
+    cursor: Annotated[str | None, Query(description="Opaque cursor returned by the previous page.")] = None,
+    limit: Annotated[
+        int,
+        Query(ge=1, le=MAX_PAGE_SIZE, description="Maximum number of items to return."),
+    ] = DEFAULT_PAGE_SIZE,
+) -> Pagination:
+    """Parse keyset pagination query parameters."""
+    after = decode_cursor(cursor) if cursor else None
+    return Pagination(limit=limit, after=after, request=request, response=response, stream=wants_ndjson(request))
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "MAX_PAGE_SIZE",
+    "NEXT_CURSOR_HEADER",
+    "Pagination",
+    "decode_cursor",
+    "encode_cursor",
+    "get_pagination",
+]
@@ -0,0 +1,29 @@
+"""Referential checks for write handlers in one round trip.
+
+A payload pointing at a project, a persona and a user used to be validated
+with one ``session.get`` each before the write. `lookup_references` runs the
+lookups as scalar subqueries of a single ``SELECT`` instead, so validation
+costs one round trip however many rows a payload references.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Row, Select, null, select
+from sqlalchemy.orm import Session
+
+
+def lookup_references(session: Session, **lookups: Select[Any] | None) -> Row[Any]:
+    """Run single-column ``lookups`` together; each is ``None`` when no row matched or it was skipped.
+
+    Pass ``None`` for an optional reference that is not set, so it costs nothing.
+    """
+    columns = [
+        (null() if query is None else query.scalar_subquery()).label(name)
+        for name, query in lookups.items()
+    ]
+    return session.execute(select(*columns)).one()
+
+
+__all__ = ["lookup_references"]
@@ -2,11 +2,13 @@
 
 from fastapi import APIRouter
 
-from app.api.v1 import auth, health, intake, personas, projects, requirements
+from app.api.v1 import admin, auth, conversations, health, intake, personas, projects, requirements
 
 router = APIRouter()
 router.include_router(health.router, tags=["health"])
+router.include_router(admin.router)
 router.include_router(auth.router)
+router.include_router(conversations.router)
 router.include_router(intake.router)
 router.include_router(personas.router)
 router.include_router(projects.router)
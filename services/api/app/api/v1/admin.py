@@ -0,0 +1,42 @@
+"""Operational endpoints restricted to admins."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from pydantic import BaseModel, ConfigDict
+
+from app.api.dependencies.auth import require_admin
+from app.telemetry.slow_queries import get_slow_query_log
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+class SlowQueryResponse(BaseModel):
+    """A statement from a request slower than ``SLOW_REQUEST_SECONDS``."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    recorded_at: datetime
+    route: str
+    request_seconds: float
+    statement: str
+    seconds: float
+    parameters: Any
+    plan: Any | None
+    explain_error: str | None
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryResponse])
+def list_slow_queries(limit: int = Query(default=50, ge=1, le=1000)) -> list[SlowQueryResponse]:
+    """Return the most recent slow statements, newest first, with any captured plans."""
+    return [SlowQueryResponse.model_validate(entry) for entry in get_slow_query_log().recent(limit)]
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
+def clear_slow_queries() -> Response:
+    """Empty the slow-query log."""
+    get_slow_query_log().clear()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
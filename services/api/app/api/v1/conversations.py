@@ -5,16 +5,30 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, ConfigDict, Field, field_serializer
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.async_routes import keep_in_threadpool
+from app.api.dependencies.fields import FieldSelection, columns_for, get_field_selection, serialize, sparse_json
+from app.api.dependencies.pagination import Pagination, get_pagination
+from app.api.dependencies.references import lookup_references
+from app.api.dependencies.streaming import NDJSON_RESPONSES, stream_ndjson
+from app.config import get_settings
 from app.db.base import get_session
 from app.db.models import ConversationTurn, Persona, Project
+from app.db.replicas import get_read_session
+from app.db.vector_search import SearchTuning, get_vector_backend
+from app.embedding_batcher import embedding_is_deferred, get_embedding_batcher
+from app.embedding_cache import get_cached_embedder
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 
+MAX_SIMILAR_RESULTS = 100
+# Returned by read endpoints only when requested with include=embedding.
+OPT_IN_FIELDS = ("embedding",)
+
 
 class ConversationTurnCreate(BaseModel):
     """Payload for recording a conversation turn."""
@@ -31,14 +45,20 @@ class ConversationTurnResponse(BaseModel):
     project_id: int
     persona_id: UUID
     text: str
-    embedding: list[float]
+    embedding: list[float] | None = Field(description="Null while the embedding is still being computed.")
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
     @field_serializer("embedding")
-    def serialize_embedding(self, embedding: list[float]) -> list[float]:
-        return list(embedding)
+    def serialize_embedding(self, embedding: list[float] | None) -> list[float] | None:
+        return None if embedding is None else [float(value) for value in embedding]
+
+
+class SimilarConversationTurn(ConversationTurnResponse):
+    """Conversation turn returned by a similarity search."""
+
+    distance: float = Field(description="Cosine distance from the query text; smaller is closer.")
 
 
 def _ensure_project_exists(session: Session, project_id: int) -> None:
@@ -46,57 +66,128 @@ def _ensure_project_exists(session: Session, project_id: int) -> None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
 
-def _get_persona(session: Session, persona_id: UUID) -> Persona:
-    persona = session.get(Persona, persona_id)
-    if persona is None:
+def _ensure_persona_in_project(session: Session, project_id: int, persona_id: UUID) -> None:
+    references = lookup_references(
+        session,
+        project=select(Project.id).where(Project.id == project_id),
+        persona_project=select(Persona.project_id).where(Persona.id == persona_id),
+    )
+    if references.project is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    if references.persona_project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Persona not found")
-    return persona
+    if references.persona_project != project_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Persona does not belong to the provided project",
+        )
 
 
-def _generate_embedding_stub(text: str) -> list[float]:
-    """Return a deterministic embedding placeholder until model integration exists."""
-    normalized = float(len(text))
-    checksum = sum(ord(char) for char in text) % 1000
-    return [normalized, float(checksum), 0.0]
+def _embed(texts: list[str]) -> list[list[float]]:
+    """Embed a batch of texts with the configured provider, reusing cached embeddings."""
+    return get_cached_embedder(get_settings().embedding_provider).embed(texts).tolist()
 
 
 @router.post("", response_model=ConversationTurnResponse, status_code=status.HTTP_201_CREATED)
+@keep_in_threadpool
 def create_conversation_turn(
-    payload: ConversationTurnCreate, session: Session = Depends(get_session)
+    payload: ConversationTurnCreate,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
 ) -> ConversationTurn:
-    """Record a new conversation turn for a project."""
-    _ensure_project_exists(session, payload.project_id)
-    persona = _get_persona(session, payload.persona_id)
-    if persona.project_id != payload.project_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Persona does not belong to the provided project",
-        )
+    """Record a new conversation turn for a project.
 
+    In deferred embedding mode the turn is stored with a null embedding and
+    embedded, batched with other pending turns, after the response is sent.
+    """
+    _ensure_persona_in_project(session, payload.project_id, payload.persona_id)
+
+    deferred = embedding_is_deferred(get_settings())
     conversation_turn = ConversationTurn(
         project_id=payload.project_id,
         persona_id=payload.persona_id,
         text=payload.text,
-        embedding=_generate_embedding_stub(payload.text),
+        embedding=None if deferred else _embed([payload.text])[0],
     )
     session.add(conversation_turn)
     session.commit()
-    session.refresh(conversation_turn)
+    if deferred:
+        background_tasks.add_task(get_embedding_batcher().run)
+    else:
+        get_vector_backend(session).add(session, [conversation_turn])
     return conversation_turn
 
 
-@router.get("", response_model=list[ConversationTurnResponse])
+@router.get("/similar", response_model=list[SimilarConversationTurn])
+@keep_in_threadpool
+def find_similar_conversation_turns(
+    response: Response,
+    project_id: int = Query(..., description="Project whose turns are searched."),
+    text: str = Query(..., min_length=1, description="Text to find similar turns for."),
+    k: int = Query(default=10, ge=1, le=MAX_SIMILAR_RESULTS, description="Number of turns to return."),
+    ef_search: int | None = Query(
+        default=None,
+        ge=1,
+        le=1000,
+        description="HNSW candidate list size; larger improves recall at the cost of latency.",
+    ),
+    probes: int | None = Query(
+        default=None,
+        ge=1,
+        le=1000,
+        description="IVFFlat lists to visit; larger improves recall at the cost of latency.",
+    ),
+    selection: FieldSelection = Depends(get_field_selection),
+    session: Session = Depends(get_session),
+) -> Response:
+    """Return the project's conversation turns nearest to the text, closest first."""
+    names = selection.resolve(SimilarConversationTurn, OPT_IN_FIELDS)
+    _ensure_project_exists(session, project_id)
+
+    query = get_cached_embedder(get_settings().embedding_provider).embed([text])[0]
+    matches = get_vector_backend(session).search(
+        session,
+        project_id,
+        query,
+        k,
+        SearchTuning(ef_search=ef_search, probes=probes),
+    )
+    content = [
+        serialize(
+            SimilarConversationTurn,
+            {name: getattr(turn, name) for name in names if name != "distance"} | {"distance": distance},
+            names,
+        )
+        for turn, distance in matches
+    ]
+    return sparse_json(content, response)
+
+
+@router.get("", response_model=list[ConversationTurnResponse], responses=NDJSON_RESPONSES)
 def list_conversation_turns(
     project_id: int = Query(..., description="Project identifier to filter conversation turns."),
     persona_id: UUID | None = Query(default=None, description="Optional persona filter."),
-    session: Session = Depends(get_session),
-) -> list[ConversationTurn]:
-    """Return conversation turns for a project with optional persona filtering."""
+    page: Pagination = Depends(get_pagination),
+    selection: FieldSelection = Depends(get_field_selection),
+    session: Session = Depends(get_read_session),
+) -> Response:
+    """Return conversation turns for a project with optional persona filtering.
+
+    Embeddings are only loaded and returned with ``include=embedding``.
+    """
+    names = selection.resolve(ConversationTurnResponse, OPT_IN_FIELDS)
     _ensure_project_exists(session, project_id)
 
-    stmt = select(ConversationTurn).where(ConversationTurn.project_id == project_id)
+    stmt = select(*columns_for(ConversationTurn, names, "id", "created_at")).where(
+        ConversationTurn.project_id == project_id
+    )
     if persona_id is not None:
         stmt = stmt.where(ConversationTurn.persona_id == persona_id)
-    stmt = stmt.order_by(ConversationTurn.created_at.asc())
+    stmt = page.apply(stmt, ConversationTurn.created_at, ConversationTurn.id)
+    if page.stream:
+        return stream_ndjson(
+            stmt, lambda row: serialize(ConversationTurnResponse, row._mapping, names), bind=session.get_bind()
+        )
 
-    return list(session.scalars(stmt).all())
+    rows = page.finalize(session.execute(stmt).all(), key=lambda row: (row.created_at, row.id))
+    return sparse_json([serialize(ConversationTurnResponse, row._mapping, names) for row in rows], page.response)
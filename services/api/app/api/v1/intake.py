@@ -2,19 +2,75 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+import codecs
+import hashlib
+import json
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field, model_validator
+from common.extraction import get_classifier
+from common.intake import (
+    INTAKE_WORKFLOW_NAME,
+    ExtractedRequirement,
+    IntakeRequest,
+    SegmentStream,
+    segment_text,
+)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
+from temporalio.client import Client, WorkflowExecutionStatus
+from temporalio.service import RPCError, RPCStatusCode
 
+from app.api.dependencies.references import lookup_references
 from app.api.v1.requirements import RequirementResponse
+from app.cache import Cache, get_cache
+from app.config import get_settings
 from app.db.base import get_session
-from app.db.models import Persona, Project, Requirement, RequirementType
+from app.db.models import (
+    IntakeJob,
+    IntakeJobStatus,
+    Persona,
+    Project,
+    Requirement,
+    RequirementType,
+)
+from app.db.rollups import apply_project_stats_deltas, requirement_type_column
+from app.temporal import get_temporal_client
 
 router = APIRouter(prefix="/intake", tags=["intake"])
 
+# Temporal rejects payloads above 2 MiB; leave headroom for the JSON envelope.
+MAX_ASYNC_TEXT_BYTES = 1_800_000
+
+# Requirements buffered before each INSERT of a streamed upload.
+STREAM_BATCH_SIZE = 1_000
+
+# Set on responses replayed from the intake deduplication cache.
+IDEMPOTENT_REPLAY_HEADER = "Idempotent-Replayed"
+
+# Marks a request that is still extracting; expires so a crashed request cannot block retries forever.
+_DEDUP_PENDING = b"pending"
+_DEDUP_PENDING_TTL = 60.0
+
+_OPEN_JOB_STATUSES = (IntakeJobStatus.PENDING, IntakeJobStatus.RUNNING)
+
+
+class IntakeMode(str, Enum):
+    """Whether extraction runs inside the request or on the worker."""
+
+    SYNC = "sync"
+    ASYNC = "async"
+
 
 class IntakeExtractPayload(BaseModel):
     """Incoming request body for requirement extraction."""
@@ -24,74 +80,386 @@ class IntakeExtractPayload(BaseModel):
     text: str = Field(min_length=1)
 
     @model_validator(mode="after")
-    def _ensure_non_empty_text(self) -> "IntakeExtractPayload":
+    def _ensure_non_empty_text(self) -> IntakeExtractPayload:
         if not self.text.strip():
             raise ValueError("text must contain non-whitespace characters")
         return self
 
 
-class ExtractedRequirement(BaseModel):
-    """Structured requirement returned by the stub extractor."""
+class IntakeJobResponse(BaseModel):
+    """Status of an asynchronous extraction job and, once completed, its requirements."""
 
-    text: str = Field(min_length=1)
-    type: RequirementType = RequirementType.FEATURE
-    confidence: float | None = Field(default=None, ge=0.0, le=1.0)
+    id: UUID
+    project_id: int
+    persona_id: UUID
+    status: IntakeJobStatus
+    error: str | None
+    created_at: datetime
+    completed_at: datetime | None
+    requirements: list[RequirementResponse] = Field(default_factory=list)
 
+    model_config = ConfigDict(from_attributes=True)
 
-def _ensure_project_exists(session: Session, project_id: int) -> None:
-    if session.get(Project, project_id) is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
+class IntakeStreamResult(BaseModel):
+    """Summary of a streamed intake upload."""
 
-def _ensure_persona_exists(session: Session, persona_id: UUID) -> None:
-    if session.get(Persona, persona_id) is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Persona not found")
+    created: int
+
+
+@dataclass(slots=True)
+class _IntakeDedup:
+    """Idempotency bookkeeping for one extract request.
+
+    Submissions are keyed by project, persona and a hash of the normalized
+    segments, so re-pasted text with different whitespace or bullets matches.
+    """
+
+    cache: Cache | None
+    key: str
+    window: float
+
+    @classmethod
+    def for_request(cls, mode: IntakeMode, payload: IntakeExtractPayload) -> _IntakeDedup:
+        settings = get_settings()
+        normalized = "\n".join(" ".join(segment.split()) for segment in segment_text(payload.text))
+        digest = hashlib.sha256(normalized.encode()).hexdigest()
+        key = f"intake:{mode.value}:{payload.project_id}:{payload.persona_id}:{digest}"
+        window = settings.intake_dedup_window_seconds
+        return cls(cache=get_cache() if window > 0 else None, key=key, window=window)
+
+    def claim(self) -> dict[str, Any] | None:
+        """Return the stored result of an earlier identical request, or reserve the key for this one."""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self.key)
+        if cached is None and self.cache.add(self.key, _DEDUP_PENDING, _DEDUP_PENDING_TTL):
+            return None
+        if cached is None or cached == _DEDUP_PENDING:
+            raise HTTPException(status.HTTP_409_CONFLICT, detail="An identical intake request is already in progress")
+        return json.loads(cached)
+
+    def reclaim(self) -> None:
+        """Take over a key whose stored result is no longer usable."""
+        if self.cache is not None:
+            self.cache.set(self.key, _DEDUP_PENDING, _DEDUP_PENDING_TTL)
+
+    def store(self, result: dict[str, Any]) -> None:
+        if self.cache is not None:
+            self.cache.set(self.key, json.dumps(result).encode(), self.window)
+
+    def release(self) -> None:
+        if self.cache is not None:
+            self.cache.delete(self.key)
 
 
-def _extract_requirements_stub(text: str) -> list[ExtractedRequirement]:
-    """Stubbed requirement extractor that splits non-empty lines into requirements."""
-    segments: Iterable[str] = (
-        segment.strip(" -\u2022")
-        for segment in text.replace("\r", "").splitlines()
+def _ensure_targets_exist(session: Session, project_id: int, persona_id: UUID) -> None:
+    references = lookup_references(
+        session,
+        project=select(Project.id).where(Project.id == project_id),
+        persona=select(Persona.id).where(Persona.id == persona_id),
     )
-    cleaned = [segment for segment in segments if segment]
-    if not cleaned:
-        cleaned = [text.strip()]
+    if references.project is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    if references.persona is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Persona not found")
 
-    return [ExtractedRequirement(text=segment) for segment in cleaned if segment]
 
+def _extract_segments(segments: Sequence[str]) -> list[ExtractedRequirement]:
+    """Classify a batch of segments with the configured classifier."""
+    return get_classifier(get_settings().intake_classifier).classify(segments)
 
-@router.post(
-    "/extract",
-    response_model=list[RequirementResponse],
-    status_code=status.HTTP_201_CREATED,
-)
-def extract_requirements(
-    payload: IntakeExtractPayload,
-    session: Session = Depends(get_session),
-) -> list[Requirement]:
-    """Convert raw text into requirements and persist them for the given persona."""
-    _ensure_project_exists(session, payload.project_id)
-    _ensure_persona_exists(session, payload.persona_id)
 
-    extracted = _extract_requirements_stub(payload.text)
-    if not extracted:
-        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Unable to extract requirements")
+def _extract_requirements(text: str) -> list[ExtractedRequirement]:
+    """Split text into segments and classify them as one batch."""
+    return _extract_segments(segment_text(text))
+
 
+def _persist_extracted(
+    session: Session,
+    project_id: int,
+    persona_id: UUID,
+    extracted: Sequence[Any],
+) -> list[Requirement]:
+    """Stage requirements for extracted items; the caller owns the transaction."""
     saved: list[Requirement] = []
     for requirement in extracted:
         instance = Requirement(
-            project_id=payload.project_id,
-            persona_id=payload.persona_id,
+            id=uuid.uuid4(),
+            project_id=project_id,
+            persona_id=persona_id,
             text=requirement.text,
-            type=requirement.type,
+            type=RequirementType(requirement.type),
             confidence=requirement.confidence,
         )
         session.add(instance)
         saved.append(instance)
+    return saved
+
+
+def _requirements_by_id(session: Session, requirement_ids: Sequence[str]) -> list[Requirement]:
+    """Load requirements in the order of ``requirement_ids``, skipping any that were deleted."""
+    ids = [UUID(value) for value in requirement_ids]
+    found = {
+        requirement.id: requirement
+        for requirement in session.scalars(select(Requirement).where(Requirement.id.in_(ids)))
+    }
+    return [found[requirement_id] for requirement_id in ids if requirement_id in found]
+
+
+def _extract_inline(
+    session: Session,
+    payload: IntakeExtractPayload,
+    dedup: _IntakeDedup,
+) -> tuple[list[Requirement], bool]:
+    """Extract and store requirements, or replay a recent identical request; flags replays."""
+    _ensure_targets_exist(session, payload.project_id, payload.persona_id)
+
+    cached = dedup.claim()
+    if cached is not None:
+        replayed = _requirements_by_id(session, cached["requirement_ids"])
+        if len(replayed) == len(cached["requirement_ids"]):
+            return replayed, True
+        dedup.reclaim()
+
+    try:
+        extracted = _extract_requirements(payload.text)
+        if not extracted:
+            raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Unable to extract requirements")
+
+        saved = _persist_extracted(session, payload.project_id, payload.persona_id, extracted)
+        session.commit()
+    except BaseException:
+        dedup.release()
+        raise
+
+    dedup.store({"requirement_ids": [str(requirement.id) for requirement in saved]})
+    return saved, False
+
+
+def _insert_segments(
+    session: Session,
+    project_id: int,
+    persona_id: UUID,
+    segments: Sequence[str],
+    counts: Counter[str],
+) -> None:
+    """Insert one batch of segments with a single executemany, bypassing the identity map."""
+    rows = [
+        {
+            "project_id": project_id,
+            "persona_id": persona_id,
+            "text": requirement.text,
+            "type": RequirementType(requirement.type),
+            "confidence": requirement.confidence,
+        }
+        for requirement in _extract_segments(segments)
+    ]
+    session.execute(insert(Requirement), rows)
+    counts["requirement_count"] += len(rows)
+    for row in rows:
+        counts[requirement_type_column(row["type"])] += 1
 
+
+def _finish_stream(session: Session, project_id: int, counts: Counter[str]) -> None:
+    apply_project_stats_deltas(session, {project_id: counts})
+    session.commit()
+
+
+async def _iter_request_text(request: Request) -> AsyncIterator[str]:
+    """Decode the request body chunk by chunk, honouring the declared charset."""
+    charset = "utf-8"
+    for parameter in request.headers.get("content-type", "").split(";")[1:]:
+        key, _, value = parameter.strip().partition("=")
+        if key.lower() == "charset" and value:
+            charset = value.strip('"')
+    try:
+        decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError as exc:
+        raise HTTPException(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Unsupported charset") from exc
+
+    async for chunk in request.stream():
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def _create_job(session: Session, payload: IntakeExtractPayload) -> IntakeJob:
+    _ensure_targets_exist(session, payload.project_id, payload.persona_id)
+
+    job = IntakeJob(project_id=payload.project_id, persona_id=payload.persona_id)
+    session.add(job)
+    session.commit()
+    return job
+
+
+def _fail_job(session: Session, job: IntakeJob, error: str) -> None:
+    session.execute(
+        update(IntakeJob)
+        .where(IntakeJob.id == job.id, IntakeJob.status.in_(_OPEN_JOB_STATUSES))
+        .values(status=IntakeJobStatus.FAILED, error=error, completed_at=func.now())
+    )
     session.commit()
-    for requirement in saved:
-        session.refresh(requirement)
+    session.refresh(job)
+
+
+def _job_response(session: Session, job: IntakeJob) -> IntakeJobResponse:
+    response = IntakeJobResponse.model_validate(job)
+    if job.requirement_ids:
+        response.requirements = [
+            RequirementResponse.model_validate(requirement)
+            for requirement in _requirements_by_id(session, job.requirement_ids)
+        ]
+    return response
+
+
+async def _workflow_error(job: IntakeJob) -> str | None:
+    """Explain why the job's workflow ended without recording an outcome, or return ``None``."""
+    client = await get_temporal_client()
+    try:
+        description = await client.get_workflow_handle(job.workflow_id).describe()
+    except RPCError as exc:
+        if exc.status != RPCStatusCode.NOT_FOUND:
+            raise HTTPException(
+                status.HTTP_503_SERVICE_UNAVAILABLE, detail="Background processing is unavailable"
+            ) from exc
+        return "Workflow not found"
+
+    if description.status in (None, WorkflowExecutionStatus.RUNNING, WorkflowExecutionStatus.COMPLETED):
+        return None
+    return f"Workflow {description.status.name.lower()}"
+
+
+async def _start_job(session: Session, payload: IntakeExtractPayload, client: Client) -> IntakeJob:
+    if len(payload.text.encode()) > MAX_ASYNC_TEXT_BYTES:
+        raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Intake text is too large")
+
+    job = await run_in_threadpool(_create_job, session, payload)
+    try:
+        await client.start_workflow(
+            INTAKE_WORKFLOW_NAME,
+            IntakeRequest(
+                project_id=payload.project_id,
+                persona_id=str(payload.persona_id),
+                text=payload.text,
+                job_id=str(job.id),
+            ),
+            id=job.workflow_id,
+            task_queue=get_settings().temporal_task_queue,
+        )
+    except RPCError as exc:
+        await run_in_threadpool(_fail_job, session, job, "Unable to start extraction workflow")
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, detail="Background processing is unavailable") from exc
+    return job
+
+
+@router.post(
+    "/extract",
+    response_model=list[RequirementResponse],
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": IntakeJobResponse}},
+)
+async def extract_requirements(
+    payload: IntakeExtractPayload,
+    response: Response,
+    mode: IntakeMode = Query(default=IntakeMode.SYNC, description="Run extraction inline or on the worker."),
+    session: Session = Depends(get_session),
+) -> Any:
+    """Convert raw text into requirements, inline or as a background job.
+
+    In async mode a job is queued on the worker and `202 Accepted` is returned
+    with the job; poll `GET /intake/jobs/{id}` for its status and results.
+    Resubmitting the same text for the same persona within the deduplication
+    window replays the earlier result (flagged by `Idempotent-Replayed`)
+    instead of extracting and storing the requirements again.
+    """
+    # Segmenting and hashing scale with the payload, so they stay off the event loop.
+    dedup = await run_in_threadpool(_IntakeDedup.for_request, mode, payload)
+    if mode is IntakeMode.SYNC:
+        saved, replayed = await run_in_threadpool(_extract_inline, session, payload, dedup)
+        if replayed:
+            response.headers[IDEMPOTENT_REPLAY_HEADER] = "true"
+        return saved
+
+    headers: dict[str, str] = {}
+    cached = await run_in_threadpool(dedup.claim)
+    job: IntakeJob | None = None
+    if cached is not None:
+        job = await run_in_threadpool(session.get, IntakeJob, UUID(cached["job_id"]))
+        if job is not None and job.status is not IntakeJobStatus.FAILED:
+            headers[IDEMPOTENT_REPLAY_HEADER] = "true"
+        else:
+            job = None
+            await run_in_threadpool(dedup.reclaim)
+
+    if job is None:
+        try:
+            job = await _start_job(session, payload, await get_temporal_client())
+        except BaseException:
+            await run_in_threadpool(dedup.release)
+            raise
+        await run_in_threadpool(dedup.store, {"job_id": str(job.id)})
+
+    body = await run_in_threadpool(_job_response, session, job)
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=body.model_dump(mode="json"), headers=headers)
+
+
+@router.post(
+    "/stream",
+    response_model=IntakeStreamResult,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": {"required": True, "content": {"text/plain": {"schema": {"type": "string"}}}}},
+)
+async def stream_requirements(
+    request: Request,
+    project_id: int = Query(...),
+    persona_id: UUID = Query(...),
+    session: Session = Depends(get_session),
+) -> IntakeStreamResult:
+    """Extract requirements from a (chunked) ``text/plain`` upload of any size.
+
+    The body is segmented as it arrives and written in batches of
+    `STREAM_BATCH_SIZE`, so memory use does not grow with the upload. All
+    batches are committed together once the body has been read.
+    """
+    media_type = request.headers.get("content-type", "text/plain").split(";")[0].strip().lower()
+    if media_type != "text/plain":
+        raise HTTPException(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Expected a text/plain body")
+    await run_in_threadpool(_ensure_targets_exist, session, project_id, persona_id)
+
+    segmenter = SegmentStream()
+    counts: Counter[str] = Counter()
+    batch: list[str] = []
+    async for text in _iter_request_text(request):
+        batch.extend(segmenter.feed(text))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            await run_in_threadpool(_insert_segments, session, project_id, persona_id, batch, counts)
+            batch = []
+    batch.extend(segmenter.close())
+    if batch:
+        await run_in_threadpool(_insert_segments, session, project_id, persona_id, batch, counts)
+
+    if not counts["requirement_count"]:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Unable to extract requirements")
+    await run_in_threadpool(_finish_stream, session, project_id, counts)
+    return IntakeStreamResult(created=counts["requirement_count"])
+
+
+@router.get("/jobs/{job_id}", response_model=IntakeJobResponse)
+async def get_intake_job(
+    job_id: UUID,
+    session: Session = Depends(get_session),
+) -> IntakeJobResponse:
+    """Return the status of an intake job and, once the worker has stored them, its requirements.
+
+    Polling never writes: the worker records the outcome when the workflow
+    finishes. A job whose workflow ended without recording one (terminated,
+    timed out or lost) is reported as failed.
+    """
+    job = await run_in_threadpool(session.get, IntakeJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Intake job not found")
 
-    return saved
\ No newline at end of file
+    response = await run_in_threadpool(_job_response, session, job)
+    if job.status in _OPEN_JOB_STATUSES and (error := await _workflow_error(job)) is not None:
+        response.status, response.error = IntakeJobStatus.FAILED, error
+    return response
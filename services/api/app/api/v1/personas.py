@@ -10,6 +10,10 @@ from pydantic import BaseModel, ConfigDict, Field, model_validator
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.dependencies.fields import FieldSelection, columns_for, get_field_selection, serialize, sparse_json
+from app.api.dependencies.pagination import Pagination, get_pagination
+from app.api.dependencies.references import lookup_references
+from app.api.dependencies.streaming import NDJSON_RESPONSES, stream_ndjson
 from app.db.base import get_session
 from app.db.models import Persona, PersonaRole, Project, User
 
@@ -57,10 +61,15 @@ def _ensure_project_exists(session: Session, project_id: int) -> None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
 
-def _ensure_user_exists(session: Session, user_id: int | None) -> None:
-    if user_id is None:
-        return
-    if session.get(User, user_id) is None:
+def _ensure_references_exist(session: Session, project_id: int, user_id: int | None) -> None:
+    references = lookup_references(
+        session,
+        project=select(Project.id).where(Project.id == project_id),
+        user=None if user_id is None else select(User.id).where(User.id == user_id),
+    )
+    if references.project is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    if user_id is not None and references.user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
 
@@ -74,8 +83,7 @@ def _get_persona_or_404(session: Session, persona_id: UUID) -> Persona:
 @router.post("", response_model=PersonaResponse, status_code=status.HTTP_201_CREATED)
 def create_persona(payload: PersonaCreate, session: Session = Depends(get_session)) -> Persona:
     """Create a persona for a project."""
-    _ensure_project_exists(session, payload.project_id)
-    _ensure_user_exists(session, payload.user_id)
+    _ensure_references_exist(session, payload.project_id, payload.user_id)
 
     persona = Persona(
         project_id=payload.project_id,
@@ -85,26 +93,44 @@ def create_persona(payload: PersonaCreate, session: Session = Depends(get_sessio
     )
     session.add(persona)
     session.commit()
-    session.refresh(persona)
     return persona
 
 
-@router.get("", response_model=list[PersonaResponse])
+@router.get("", response_model=list[PersonaResponse], responses=NDJSON_RESPONSES)
 def list_personas(
     project_id: int = Query(..., description="Project identifier to filter personas."),
+    page: Pagination = Depends(get_pagination),
+    selection: FieldSelection = Depends(get_field_selection),
     session: Session = Depends(get_session),
-) -> list[Persona]:
+) -> Response:
     """List personas associated with a project."""
+    names = selection.resolve(PersonaResponse)
     _ensure_project_exists(session, project_id)
 
-    stmt = select(Persona).where(Persona.project_id == project_id).order_by(Persona.created_at.asc())
-    return list(session.scalars(stmt).all())
+    stmt = select(*columns_for(Persona, names, "id", "created_at")).where(Persona.project_id == project_id)
+    stmt = page.apply(stmt, Persona.created_at, Persona.id)
+    if page.stream:
+        return stream_ndjson(
+            stmt, lambda row: serialize(PersonaResponse, row._mapping, names), bind=session.get_bind()
+        )
+
+    rows = page.finalize(session.execute(stmt).all(), key=lambda row: (row.created_at, row.id))
+    return sparse_json([serialize(PersonaResponse, row._mapping, names) for row in rows], page.response)
 
 
 @router.get("/{persona_id}", response_model=PersonaResponse)
-def get_persona(persona_id: UUID, session: Session = Depends(get_session)) -> Persona:
+def get_persona(
+    persona_id: UUID,
+    response: Response,
+    selection: FieldSelection = Depends(get_field_selection),
+    session: Session = Depends(get_session),
+) -> Response:
     """Retrieve a persona by identifier."""
-    return _get_persona_or_404(session, persona_id)
+    names = selection.resolve(PersonaResponse)
+    row = session.execute(select(*columns_for(Persona, names)).where(Persona.id == persona_id)).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Persona not found")
+    return sparse_json(serialize(PersonaResponse, row._mapping, names), response)
 
 
 @router.patch("/{persona_id}", response_model=PersonaResponse)
@@ -122,9 +148,7 @@ def update_persona(
     if "display_name" in update_data:
         persona.display_name = update_data["display_name"]
 
-    session.add(persona)
     session.commit()
-    session.refresh(persona)
     return persona
 
 
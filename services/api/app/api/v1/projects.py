@@ -2,30 +2,60 @@
 
 from __future__ import annotations
 
+import tempfile
+from collections.abc import Iterable, Iterator
 from datetime import datetime
-from typing import Any
+from typing import IO, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, Field, model_validator
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
-
-from app.db.base import get_session
+from sqlalchemy import Column, MetaData, Select, Table, Uuid, func, insert, literal, select
+from sqlalchemy.orm import Session, joinedload
+
+from app.api.dependencies.fields import FieldSelection, columns_for, get_field_selection, serialize, sparse_json
+from app.api.dependencies.pagination import Pagination, get_pagination
+from app.api.dependencies.references import lookup_references
+from app.api.dependencies.streaming import NDJSON_RESPONSES, stream_ndjson
+from app.config import get_settings
+from app.db.base import SessionLocal, get_session
+from app.db.functions import new_uuid
 from app.db.models import (
     Client,
+    ConversationTurn,
     Organization,
     Persona,
     PersonaRole,
     Project,
+    ProjectStats,
     ProjectStatus,
     Requirement,
-    RequirementType,
     User,
 )
+from app.db.replicas import get_read_session
+from app.db.rollups import REQUIREMENT_TYPE_COLUMNS, rebuild_project_stats
+from app.db.snapshots import SNAPSHOT_MEDIA_TYPE, SnapshotError, export_snapshot, import_snapshot
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+# Summary fields read from the project_stats rollup rather than the projects table.
+_SUMMARY_COUNT_FIELDS = ("persona_count", "requirement_count")
+# Snapshot uploads larger than this are spooled to disk while they are received.
+_SNAPSHOT_SPOOL_BYTES = 8 * 1024 * 1024
+
+# Old to new persona ids of one clone. It lives on the request's connection and
+# is created and dropped inside the clone's transaction, so a failed clone
+# rolls it back with everything else.
+_persona_remap = Table(
+    "clone_persona_remap",
+    MetaData(),
+    Column("old_id", Uuid, primary_key=True),
+    Column("new_id", Uuid, nullable=False),
+    prefixes=["TEMPORARY"],
+)
+
 
 class ProjectCreate(BaseModel):
     """Payload for creating a project."""
@@ -51,6 +81,24 @@ class ProjectUpdate(BaseModel):
         return self
 
 
+class ProjectClone(BaseModel):
+    """Options for cloning a project and a chosen subset of its child rows."""
+
+    name: str | None = Field(default=None, min_length=1, max_length=255)
+    description: str | None = Field(default=None, max_length=2000)
+    client_id: int | None = Field(default=None)
+    status: ProjectStatus | None = None
+    include_personas: bool = True
+    include_requirements: bool = True
+    include_conversation_turns: bool = False
+
+    @model_validator(mode="after")
+    def validate_children(self) -> "ProjectClone":
+        if (self.include_requirements or self.include_conversation_turns) and not self.include_personas:
+            raise ValueError("Requirements and conversation turns can only be cloned with their personas")
+        return self
+
+
 class ProjectBaseResponse(BaseModel):
     """Shared attributes describing a project."""
 
@@ -96,26 +144,36 @@ class ProjectDetailResponse(ProjectBaseResponse):
     requirement_counts: RequirementCounts
 
 
-def _ensure_organization_exists(session: Session, organization_id: int) -> None:
-    if session.get(Organization, organization_id) is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
+def _client_organization(client_id: Any) -> Select[Any]:
+    return select(Client.organization_id).where(Client.id == client_id)
 
 
-def _ensure_client_association(session: Session, client_id: int | None, organization_id: int) -> None:
+def _check_client_association(client_id: int | None, client_organization_id: int | None, organization_id: int) -> None:
     if client_id is None:
         return
-    client = session.get(Client, client_id)
-    if client is None:
+    if client_organization_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
-    if client.organization_id != organization_id:
+    if client_organization_id != organization_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Client does not belong to the specified organization",
         )
 
 
-def _ensure_user_exists(session: Session, user_id: int) -> None:
-    if session.get(User, user_id) is None:
+def _ensure_references_exist(
+    session: Session, organization_id: int, client_id: int | None, user_id: int | None = None
+) -> None:
+    """Check the organization, the client's membership in it and the user with one lookup."""
+    references = lookup_references(
+        session,
+        organization=select(Organization.id).where(Organization.id == organization_id),
+        client_organization=None if client_id is None else _client_organization(client_id),
+        user=None if user_id is None else select(User.id).where(User.id == user_id),
+    )
+    if references.organization is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
+    _check_client_association(client_id, references.client_organization, organization_id)
+    if user_id is not None and references.user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
 
@@ -138,51 +196,45 @@ def _project_base_dict(project: Project) -> dict[str, Any]:
     }
 
 
-def _calculate_requirement_counts(session: Session, project_id: int) -> RequirementCounts:
-    rows = session.execute(
-        select(Requirement.type, func.count(Requirement.id))
-        .where(Requirement.project_id == project_id)
-        .group_by(Requirement.type)
-    ).all()
+def _requirement_counts(stats: ProjectStats | None) -> RequirementCounts:
+    if stats is None:
+        return RequirementCounts(total=0, by_type={})
 
     by_type: dict[str, int] = {}
-    for requirement_type, count in rows:
-        if isinstance(requirement_type, RequirementType):
-            key = requirement_type.value
-        else:
-            key = str(requirement_type)
-        by_type[key] = count
+    for requirement_type, column in REQUIREMENT_TYPE_COLUMNS.items():
+        count = getattr(stats, column)
+        if count:
+            by_type[requirement_type.value] = count
 
-    total = sum(by_type.values())
-    return RequirementCounts(total=total, by_type=by_type)
+    return RequirementCounts(total=stats.requirement_count, by_type=by_type)
 
 
-def _build_project_detail(session: Session, project: Project) -> ProjectDetailResponse:
-    base = _project_base_dict(project)
-    personas = [PersonaSummary.model_validate(persona) for persona in project.personas]
-    requirement_counts = _calculate_requirement_counts(session, project.id)
+def _calculate_requirement_counts(session: Session, project_id: int) -> RequirementCounts:
+    return _requirement_counts(session.get(ProjectStats, project_id, populate_existing=True))
+
 
+def _build_project_detail(
+    project: Project, personas: Iterable[Any], requirement_counts: RequirementCounts
+) -> ProjectDetailResponse:
+    """Assemble the detail payload from data the handler already holds, without querying."""
     return ProjectDetailResponse(
-        **base,
-        personas=personas,
+        **_project_base_dict(project),
+        personas=[PersonaSummary.model_validate(persona) for persona in personas],
         requirement_counts=requirement_counts,
     )
 
 
-def _build_project_summary(project: Project, persona_count: int, requirement_count: int) -> ProjectSummaryResponse:
-    base = _project_base_dict(project)
-    return ProjectSummaryResponse(
-        **base,
-        persona_count=persona_count,
-        requirement_count=requirement_count,
+def _load_project_detail(session: Session, project: Project) -> ProjectDetailResponse:
+    personas = session.scalars(
+        select(Persona).where(Persona.project_id == project.id).order_by(Persona.created_at, Persona.id)
     )
+    return _build_project_detail(project, personas, _calculate_requirement_counts(session, project.id))
 
 
 @router.post("", response_model=ProjectDetailResponse, status_code=status.HTTP_201_CREATED)
 def create_project(payload: ProjectCreate, session: Session = Depends(get_session)) -> ProjectDetailResponse:
     """Create a project within an organization."""
-    _ensure_organization_exists(session, payload.organization_id)
-    _ensure_client_association(session, payload.client_id, payload.organization_id)
+    _ensure_references_exist(session, payload.organization_id, payload.client_id)
 
     project = Project(
         name=payload.name,
@@ -193,44 +245,34 @@ def create_project(payload: ProjectCreate, session: Session = Depends(get_sessio
     )
     session.add(project)
     session.commit()
-    session.refresh(project)
-    return _build_project_detail(session, project)
+    # A new project has no personas, and its rollup row starts at zero.
+    return _build_project_detail(project, [], _requirement_counts(None))
 
 
-@router.get("", response_model=list[ProjectSummaryResponse])
+@router.get("", response_model=list[ProjectSummaryResponse], responses=NDJSON_RESPONSES)
 def list_projects(
     organization_id: int = Query(..., description="Organization identifier to filter projects."),
     client_id: int | None = Query(default=None, description="Optional client filter."),
     user_id: int | None = Query(default=None, description="Optional user filter via persona assignments."),
-    session: Session = Depends(get_session),
-) -> list[ProjectSummaryResponse]:
-    """List projects for an organization with optional client or user filtering."""
-    _ensure_organization_exists(session, organization_id)
-    _ensure_client_association(session, client_id, organization_id)
-    if user_id is not None:
-        _ensure_user_exists(session, user_id)
-
-    persona_counts = (
-        select(Persona.project_id, func.count(Persona.id).label("persona_count"))
-        .group_by(Persona.project_id)
-        .subquery()
-    )
-    requirement_counts = (
-        select(Requirement.project_id, func.count(Requirement.id).label("requirement_count"))
-        .group_by(Requirement.project_id)
-        .subquery()
-    )
-
-    stmt = (
-        select(
-            Project,
-            func.coalesce(persona_counts.c.persona_count, 0),
-            func.coalesce(requirement_counts.c.requirement_count, 0),
-        )
-        .outerjoin(persona_counts, persona_counts.c.project_id == Project.id)
-        .outerjoin(requirement_counts, requirement_counts.c.project_id == Project.id)
-        .where(Project.organization_id == organization_id)
-    )
+    page: Pagination = Depends(get_pagination),
+    selection: FieldSelection = Depends(get_field_selection),
+    session: Session = Depends(get_read_session),
+) -> Response:
+    """List projects for an organization with optional client or user filtering.
+
+    The rollup table is only joined when a count field is selected.
+    """
+    names = selection.resolve(ProjectSummaryResponse)
+    _ensure_references_exist(session, organization_id, client_id, user_id)
+
+    counts = [name for name in _SUMMARY_COUNT_FIELDS if name in names]
+    base_names = [name for name in names if name not in _SUMMARY_COUNT_FIELDS]
+    stmt = select(
+        *columns_for(Project, base_names, "id", "created_at"),
+        *(func.coalesce(getattr(ProjectStats, name), 0).label(name) for name in counts),
+    ).where(Project.organization_id == organization_id)
+    if counts:
+        stmt = stmt.outerjoin(ProjectStats, ProjectStats.project_id == Project.id)
 
     if client_id is not None:
         stmt = stmt.where(Project.client_id == client_id)
@@ -240,20 +282,42 @@ def list_projects(
             Project.id.in_(select(Persona.project_id).where(Persona.user_id == user_id))
         )
 
-    stmt = stmt.order_by(Project.created_at.asc())
-    rows = session.execute(stmt).all()
+    stmt = page.apply(stmt, Project.created_at, Project.id)
+    if page.stream:
+        return stream_ndjson(
+            stmt, lambda row: serialize(ProjectSummaryResponse, row._mapping, names), bind=session.get_bind()
+        )
 
-    return [
-        _build_project_summary(project, persona_count or 0, requirement_count or 0)
-        for project, persona_count, requirement_count in rows
-    ]
+    rows = page.finalize(session.execute(stmt).all(), key=lambda row: (row.created_at, row.id))
+    return sparse_json([serialize(ProjectSummaryResponse, row._mapping, names) for row in rows], page.response)
 
 
 @router.get("/{project_id}", response_model=ProjectDetailResponse)
-def get_project(project_id: int, session: Session = Depends(get_session)) -> ProjectDetailResponse:
-    """Fetch project details including personas and requirement rollups."""
-    project = _get_project_or_404(session, project_id)
-    return _build_project_detail(session, project)
+def get_project(
+    project_id: int,
+    response: Response,
+    selection: FieldSelection = Depends(get_field_selection),
+    session: Session = Depends(get_read_session),
+) -> Response:
+    """Fetch project details including personas and requirement rollups.
+
+    Personas and requirement counts are only queried when selected.
+    """
+    names = selection.resolve(ProjectDetailResponse)
+    base_names = [name for name in names if name in ProjectBaseResponse.model_fields]
+    row = session.execute(select(*columns_for(Project, base_names, "id")).where(Project.id == project_id)).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    values = dict(row._mapping)
+    if "personas" in names:
+        personas = session.scalars(
+            select(Persona).where(Persona.project_id == project_id).order_by(Persona.created_at, Persona.id)
+        )
+        values["personas"] = [PersonaSummary.model_validate(persona) for persona in personas]
+    if "requirement_counts" in names:
+        values["requirement_counts"] = _calculate_requirement_counts(session, project_id)
+    return sparse_json(serialize(ProjectDetailResponse, values, names), response)
 
 
 @router.patch("/{project_id}", response_model=ProjectDetailResponse)
@@ -262,8 +326,14 @@ def update_project(
     payload: ProjectUpdate,
     session: Session = Depends(get_session),
 ) -> ProjectDetailResponse:
-    """Update a project's mutable fields."""
-    project = _get_project_or_404(session, project_id)
+    """Update a project's mutable fields.
+
+    The project, its personas and its rollup row are read in one query up
+    front; the update does not change them, so they also build the response.
+    """
+    project = session.get(Project, project_id, options=[joinedload(Project.personas), joinedload(Project.stats)])
+    if project is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
     update_data = payload.model_dump(exclude_unset=True)
     if "name" in update_data:
@@ -273,10 +343,9 @@ def update_project(
     if "status" in update_data:
         project.status = update_data["status"]
 
-    session.add(project)
     session.commit()
-    session.refresh(project)
-    return _build_project_detail(session, project)
+    personas = sorted(project.personas, key=lambda persona: (persona.created_at, persona.id))
+    return _build_project_detail(project, personas, _requirement_counts(project.stats))
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
@@ -289,3 +358,164 @@ def delete_project(project_id: int, session: Session = Depends(get_session)) ->
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+def _clone_children(session: Session, source_id: int, target_id: int, payload: ProjectClone) -> list[Any]:
+    """Copy the selected child rows with set-based ``INSERT ... SELECT`` statements.
+
+    Fresh persona ids are generated into a temporary old-to-new mapping table
+    that the persona, requirement and turn copies join to, so no statement
+    binds a parameter per persona however large the template is. The copied
+    personas are returned, in creation order, for the response.
+    """
+    if not payload.include_personas:
+        return []
+    connection = session.connection()
+    _persona_remap.create(connection)
+    session.execute(
+        insert(_persona_remap).from_select(
+            ["old_id", "new_id"], select(Persona.id, new_uuid()).where(Persona.project_id == source_id)
+        )
+    )
+
+    persona_columns = ["user_id", "role", "display_name", "created_at", "updated_at"]
+    personas = session.execute(
+        insert(Persona)
+        .from_select(
+            ["id", "project_id", *persona_columns],
+            select(
+                _persona_remap.c.new_id,
+                literal(target_id),
+                *(getattr(Persona, column) for column in persona_columns),
+            )
+            .join_from(Persona, _persona_remap, Persona.id == _persona_remap.c.old_id)
+            .where(Persona.project_id == source_id),
+        )
+        .returning(Persona.id, Persona.role, Persona.display_name, Persona.created_at)
+    ).all()
+
+    children: list[tuple[Any, list[str]]] = []
+    if personas and payload.include_requirements:
+        children.append((Requirement, ["text", "type", "confidence", "cluster_id", "created_at", "updated_at"]))
+    if personas and payload.include_conversation_turns:
+        # Embeddings are copied as stored, so the clone needs no re-embedding.
+        children.append((ConversationTurn, ["text", "embedding", "created_at"]))
+    for model, columns in children:
+        session.execute(
+            insert(model).from_select(
+                ["id", "project_id", "persona_id", *columns],
+                select(
+                    new_uuid(),
+                    literal(target_id),
+                    _persona_remap.c.new_id,
+                    *(getattr(model, column) for column in columns),
+                )
+                .join_from(model, _persona_remap, model.persona_id == _persona_remap.c.old_id)
+                .where(model.project_id == source_id),
+            )
+        )
+    _persona_remap.drop(connection)
+    return sorted(personas, key=lambda persona: (persona.created_at, persona.id))
+
+
+@router.post("/{project_id}/clone", response_model=ProjectDetailResponse, status_code=status.HTTP_201_CREATED)
+def clone_project(
+    project_id: int,
+    payload: ProjectClone,
+    session: Session = Depends(get_session),
+) -> ProjectDetailResponse:
+    """Create a copy of a project, for example from a template, in one transaction."""
+    client = payload.client_id if "client_id" in payload.model_fields_set else Project.client_id
+    row = session.execute(
+        select(Project, _client_organization(client).scalar_subquery()).where(Project.id == project_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    source, client_organization_id = row
+    client_id = payload.client_id if "client_id" in payload.model_fields_set else source.client_id
+    _check_client_association(client_id, client_organization_id, source.organization_id)
+
+    project = Project(
+        name=payload.name or source.name,
+        description=payload.description if "description" in payload.model_fields_set else source.description,
+        organization_id=source.organization_id,
+        client_id=client_id,
+        status=payload.status or source.status,
+    )
+    session.add(project)
+    session.flush()
+    personas = _clone_children(session, source.id, project.id, payload)
+    rebuild_project_stats(session, [project.id])
+    requirement_counts = _calculate_requirement_counts(session, project.id)
+    session.commit()
+    return _build_project_detail(project, personas, requirement_counts)
+
+
+def _snapshot_chunks(project_id: int) -> Iterator[bytes]:
+    # The stream outlives the request's session dependency, so it reads through its own session.
+    with SessionLocal() as session:
+        yield from export_snapshot(session, project_id)
+
+
+@router.get(
+    "/{project_id}/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {SNAPSHOT_MEDIA_TYPE: {}}}},
+)
+def export_project(project_id: int, session: Session = Depends(get_session)) -> StreamingResponse:
+    """Stream a gzip-compressed NDJSON snapshot of a project and its child rows."""
+    _get_project_or_404(session, project_id)
+    return StreamingResponse(
+        _snapshot_chunks(project_id),
+        media_type=SNAPSHOT_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}.ndjson.gz"'},
+    )
+
+
+def _import_project(
+    session: Session,
+    snapshot: IO[bytes],
+    organization_id: int,
+    client_id: int | None,
+    name: str | None,
+) -> ProjectDetailResponse:
+    _ensure_references_exist(session, organization_id, client_id)
+    try:
+        project = import_snapshot(session, snapshot, organization_id, client_id, name)
+    except SnapshotError as exc:
+        session.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    session.commit()
+    return _load_project_detail(session, project)
+
+
+@router.post(
+    "/import",
+    response_model=ProjectDetailResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": {"required": True, "content": {SNAPSHOT_MEDIA_TYPE: {}}}},
+)
+async def import_project(
+    request: Request,
+    organization_id: int = Query(..., description="Organization that will own the imported project."),
+    client_id: int | None = Query(default=None, description="Optional client for the imported project."),
+    name: str | None = Query(default=None, min_length=1, max_length=255, description="Override the exported name."),
+    session: Session = Depends(get_session),
+) -> ProjectDetailResponse:
+    """Create a project from a snapshot produced by the export endpoint.
+
+    The upload is spooled to disk as it arrives and loaded in one transaction.
+    Uploads larger than ``SNAPSHOT_MAX_UPLOAD_BYTES`` are rejected with a 413.
+    """
+    max_bytes = get_settings().snapshot_max_upload_bytes
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes:
+        raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Snapshot is too large")
+    with tempfile.SpooledTemporaryFile(max_size=_SNAPSHOT_SPOOL_BYTES) as snapshot:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Snapshot is too large")
+            # Past the spool size, writes go to disk, so they stay off the event loop.
+            await run_in_threadpool(snapshot.write, chunk)
+        await run_in_threadpool(snapshot.seek, 0)
+        return await run_in_threadpool(_import_project, session, snapshot, organization_id, client_id, name)
@@ -2,19 +2,28 @@
 
 from __future__ import annotations
 
+from collections import Counter, defaultdict
 from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, ConfigDict, Field, model_validator
-from sqlalchemy import select, text
+from sqlalchemy import delete, insert, select, text, update
 from sqlalchemy.orm import Session
 
+from app.api.dependencies.fields import FieldSelection, columns_for, get_field_selection, serialize, sparse_json
+from app.api.dependencies.pagination import Pagination, get_pagination
+from app.api.dependencies.references import lookup_references
+from app.api.dependencies.streaming import NDJSON_RESPONSES, stream_ndjson
 from app.db.base import get_session
 from app.db.models import Persona, Project, Requirement, RequirementType
+from app.db.replicas import get_read_session
+from app.db.rollups import ProjectStatsDeltas, apply_project_stats_deltas, requirement_type_column
 
 router = APIRouter(prefix="/requirements", tags=["requirements"])
 
+MAX_BULK_ITEMS = 10_000
+
 
 class RequirementCreate(BaseModel):
     """Payload for creating a requirement."""
@@ -56,21 +65,209 @@ class RequirementResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-def _ensure_project_exists(session: Session, project_id: int) -> None:
-    if session.get(Project, project_id) is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+class RequirementBulkUpdateItem(BaseModel):
+    """A single requirement update within a bulk request."""
+
+    id: UUID
+    type: RequirementType | None = None
+    confidence: float | None = Field(default=None, ge=0.0, le=1.0)
+
+    @model_validator(mode="after")
+    def validate_payload(self) -> "RequirementBulkUpdateItem":
+        if not self.model_fields_set - {"id"}:
+            raise ValueError("At least one field besides id must be provided")
+        return self
+
+
+class RequirementBulkCreate(BaseModel):
+    """Payload for creating many requirements at once."""
+
+    items: list[RequirementCreate] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class RequirementBulkUpdate(BaseModel):
+    """Payload for updating many requirements at once."""
+
+    items: list[RequirementBulkUpdateItem] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class RequirementBulkDelete(BaseModel):
+    """Payload for deleting many requirements at once."""
+
+    ids: list[UUID] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkItemError(BaseModel):
+    """Failure for one item of a bulk request; other items are still applied."""
+
+    index: int
+    detail: str
+
+
+class RequirementBulkCreateResult(BaseModel):
+    """Outcome of a bulk create."""
 
+    created: list[RequirementResponse]
+    errors: list[BulkItemError]
 
-def _ensure_persona_exists(session: Session, persona_id: UUID) -> None:
-    if session.get(Persona, persona_id) is None:
+
+class RequirementBulkUpdateResult(BaseModel):
+    """Outcome of a bulk update."""
+
+    updated: list[RequirementResponse]
+    errors: list[BulkItemError]
+
+
+class RequirementBulkDeleteResult(BaseModel):
+    """Outcome of a bulk delete."""
+
+    deleted: list[UUID]
+    errors: list[BulkItemError]
+
+
+_RESPONSE_COLUMNS = tuple(getattr(Requirement, field) for field in RequirementResponse.model_fields)
+
+
+def _ensure_references_exist(session: Session, project_id: int, persona_id: UUID) -> None:
+    references = lookup_references(
+        session,
+        project=select(Project.id).where(Project.id == project_id),
+        persona=select(Persona.id).where(Persona.id == persona_id),
+    )
+    if references.project is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    if references.persona is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Persona not found")
 
 
+@router.post("/bulk", response_model=RequirementBulkCreateResult)
+def bulk_create_requirements(
+    payload: RequirementBulkCreate, session: Session = Depends(get_session)
+) -> RequirementBulkCreateResult:
+    """Create many requirements with one lookup per referenced table and one multi-row INSERT."""
+    project_ids = {item.project_id for item in payload.items}
+    persona_ids = {item.persona_id for item in payload.items}
+    known_projects = set(session.scalars(select(Project.id).where(Project.id.in_(project_ids))))
+    persona_projects = dict(
+        session.execute(select(Persona.id, Persona.project_id).where(Persona.id.in_(persona_ids))).tuples().all()
+    )
+
+    errors: list[BulkItemError] = []
+    rows: list[dict[str, object]] = []
+    deltas: ProjectStatsDeltas = defaultdict(Counter)
+    for index, item in enumerate(payload.items):
+        if item.project_id not in known_projects:
+            errors.append(BulkItemError(index=index, detail="Project not found"))
+            continue
+        if item.persona_id not in persona_projects:
+            errors.append(BulkItemError(index=index, detail="Persona not found"))
+            continue
+        if persona_projects[item.persona_id] != item.project_id:
+            errors.append(BulkItemError(index=index, detail="Persona does not belong to the provided project"))
+            continue
+        rows.append(item.model_dump())
+        deltas[item.project_id]["requirement_count"] += 1
+        deltas[item.project_id][requirement_type_column(item.type)] += 1
+
+    created: list[RequirementResponse] = []
+    if rows:
+        result = session.execute(
+            insert(Requirement).returning(*_RESPONSE_COLUMNS, sort_by_parameter_order=True),
+            rows,
+        )
+        created = [RequirementResponse.model_validate(row) for row in result]
+        apply_project_stats_deltas(session, deltas)
+        session.commit()
+
+    return RequirementBulkCreateResult(created=created, errors=errors)
+
+
+@router.patch("/bulk", response_model=RequirementBulkUpdateResult)
+def bulk_update_requirements(
+    payload: RequirementBulkUpdate, session: Session = Depends(get_session)
+) -> RequirementBulkUpdateResult:
+    """Update many requirements by primary key in a single executemany UPDATE."""
+    requested_ids = {item.id for item in payload.items}
+    existing = {
+        row.id: row
+        for row in session.execute(
+            select(Requirement.id, Requirement.project_id, Requirement.type).where(Requirement.id.in_(requested_ids))
+        )
+    }
+
+    errors: list[BulkItemError] = []
+    params: list[dict[str, object]] = []
+    seen: set[UUID] = set()
+    deltas: ProjectStatsDeltas = defaultdict(Counter)
+    for index, item in enumerate(payload.items):
+        current = existing.get(item.id)
+        if current is None:
+            errors.append(BulkItemError(index=index, detail="Requirement not found"))
+            continue
+        if item.id in seen:
+            errors.append(BulkItemError(index=index, detail="Duplicate requirement id"))
+            continue
+        seen.add(item.id)
+
+        update_data = item.model_dump(exclude_unset=True)
+        params.append(update_data)
+        counter = deltas[current.project_id]
+        if "type" in update_data and update_data["type"] != current.type:
+            counter[requirement_type_column(current.type)] -= 1
+            counter[requirement_type_column(update_data["type"])] += 1
+
+    updated: list[RequirementResponse] = []
+    if params:
+        session.execute(update(Requirement), params)
+        apply_project_stats_deltas(session, deltas)
+        session.commit()
+
+        rows = {
+            row.id: row
+            for row in session.execute(select(*_RESPONSE_COLUMNS).where(Requirement.id.in_(seen)))
+        }
+        updated = [RequirementResponse.model_validate(rows[item["id"]]) for item in params]
+
+    return RequirementBulkUpdateResult(updated=updated, errors=errors)
+
+
+@router.delete("/bulk", response_model=RequirementBulkDeleteResult)
+def bulk_delete_requirements(
+    payload: RequirementBulkDelete, session: Session = Depends(get_session)
+) -> RequirementBulkDeleteResult:
+    """Delete many requirements with one DELETE ... RETURNING."""
+    result = session.execute(
+        delete(Requirement)
+        .where(Requirement.id.in_(set(payload.ids)))
+        .returning(Requirement.id, Requirement.project_id, Requirement.type)
+        .execution_options(synchronize_session=False)
+    )
+
+    deltas: ProjectStatsDeltas = defaultdict(Counter)
+    deleted_ids: set[UUID] = set()
+    for row in result:
+        deleted_ids.add(row.id)
+        deltas[row.project_id]["requirement_count"] -= 1
+        deltas[row.project_id][requirement_type_column(row.type)] -= 1
+    apply_project_stats_deltas(session, deltas)
+    session.commit()
+
+    errors: list[BulkItemError] = []
+    deleted: list[UUID] = []
+    for index, requirement_id in enumerate(payload.ids):
+        if requirement_id in deleted_ids:
+            deleted.append(requirement_id)
+            deleted_ids.discard(requirement_id)
+        else:
+            errors.append(BulkItemError(index=index, detail="Requirement not found"))
+
+    return RequirementBulkDeleteResult(deleted=deleted, errors=errors)
+
+
 @router.post("", response_model=RequirementResponse, status_code=status.HTTP_201_CREATED)
 def create_requirement(payload: RequirementCreate, session: Session = Depends(get_session)) -> Requirement:
     """Create a new requirement for a project persona pair."""
-    _ensure_project_exists(session, payload.project_id)
-    _ensure_persona_exists(session, payload.persona_id)
+    _ensure_references_exist(session, payload.project_id, payload.persona_id)
 
     requirement = Requirement(
         project_id=payload.project_id,
@@ -82,23 +279,30 @@ def create_requirement(payload: RequirementCreate, session: Session = Depends(ge
     )
     session.add(requirement)
     session.commit()
-    session.refresh(requirement)
     return requirement
 
 
-@router.get("", response_model=list[RequirementResponse])
+@router.get("", response_model=list[RequirementResponse], responses=NDJSON_RESPONSES)
 def list_requirements(
     project_id: int = Query(..., description="Project identifier to filter requirements."),
     persona_id: UUID | None = Query(default=None, description="Optional persona filter."),
-    session: Session = Depends(get_session),
-) -> list[Requirement]:
+    page: Pagination = Depends(get_pagination),
+    selection: FieldSelection = Depends(get_field_selection),
+    session: Session = Depends(get_read_session),
+) -> Response:
     """Return requirements for a project with optional persona filtering."""
-    stmt = select(Requirement).where(Requirement.project_id == project_id)
+    names = selection.resolve(RequirementResponse)
+    stmt = select(*columns_for(Requirement, names, "id", "created_at")).where(Requirement.project_id == project_id)
     if persona_id is not None:
         stmt = stmt.where(Requirement.persona_id == persona_id)
-    stmt = stmt.order_by(Requirement.created_at.asc())
+    stmt = page.apply(stmt, Requirement.created_at, Requirement.id)
+    if page.stream:
+        return stream_ndjson(
+            stmt, lambda row: serialize(RequirementResponse, row._mapping, names), bind=session.get_bind()
+        )
 
-    return list(session.execute(stmt).scalars().all())
+    rows = page.finalize(session.execute(stmt).all(), key=lambda row: (row.created_at, row.id))
+    return sparse_json([serialize(RequirementResponse, row._mapping, names) for row in rows], page.response)
 
 
 @router.patch("/{requirement_id}", response_model=RequirementResponse)
@@ -116,9 +320,7 @@ def update_requirement(
     for field, value in update_data.items():
         setattr(requirement, field, value)
 
-    session.add(requirement)
     session.commit()
-    session.refresh(requirement)
     return requirement
 
 
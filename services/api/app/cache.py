@@ -0,0 +1,219 @@
+"""Small key/value caches shared by request handlers.
+
+`MemoryCache` is a per-process LRU with per-entry expiry. `RedisCache` stores the
+same values in Redis so every API replica sees them; it is used when
+``REDIS_URL`` is configured and needs the optional ``redis`` extra. A Redis
+error is logged, counted in ``cache_errors_total`` and treated as a miss, so an
+unavailable Redis slows requests down instead of failing them.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping, Sequence
+from functools import cache
+from typing import Any, Protocol
+
+from prometheus_client import Counter
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_ERRORS = Counter(
+    "cache_errors_total",
+    "Shared cache operations that failed and were treated as misses.",
+    ["operation"],
+)
+
+
+class Cache(Protocol):
+    """Byte-valued cache with expiring entries."""
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under ``key``, if present and not expired."""
+        ...
+
+    def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        """Return the values stored under ``keys``, in order, in one round trip."""
+        ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store ``value`` for ``ttl`` seconds, replacing any existing entry."""
+        ...
+
+    def set_many(self, values: Mapping[str, bytes], ttl: float) -> None:
+        """Store every value for ``ttl`` seconds in one round trip."""
+        ...
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store ``value`` only if ``key`` is absent; return whether it was stored."""
+        ...
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+        ...
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache with per-entry expiry.
+
+    ``on_evict`` is called with the key of every entry dropped to stay within
+    ``max_entries`` (not for expired or deleted entries).
+    """
+
+    def __init__(self, max_entries: int, on_evict: Callable[[str], None] | None = None) -> None:
+        self._max_entries = max_entries
+        self._on_evict = on_evict
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _live(self, key: str, now: float) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value: bytes, ttl: float, now: float) -> None:
+        self._entries[key] = (now + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            if self._on_evict is not None:
+                self._on_evict(evicted)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._live(key, time.monotonic())
+
+    def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        with self._lock:
+            now = time.monotonic()
+            return [self._live(key, now) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._store(key, value, ttl, time.monotonic())
+
+    def set_many(self, values: Mapping[str, bytes], ttl: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            for key, value in values.items():
+                self._store(key, value, ttl, now)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._live(key, now) is not None:
+                return False
+            self._store(key, value, ttl, now)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+def _redis_errors() -> tuple[type[Exception], ...]:
+    try:
+        import redis
+    except ImportError:  # pragma: no cover - depends on installed extras
+        return ()
+    return (redis.RedisError,)
+
+
+class RedisCache:
+    """Cache backed by Redis, namespaced by a key prefix.
+
+    Failed operations behave like a miss: ``get`` returns ``None``, ``add``
+    reports the value as stored and writes are dropped.
+    """
+
+    def __init__(self, client: Any, prefix: str = "ai-pm:") -> None:
+        self._client = client
+        self._prefix = prefix
+        self._errors = _redis_errors()
+
+    @staticmethod
+    def _failed(operation: str, error: Exception) -> None:
+        CACHE_ERRORS.labels(operation=operation).inc()
+        logger.warning("Redis cache %s failed, treating it as a miss: %s", operation, error)
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "ai-pm:") -> RedisCache:
+        """Connect lazily to the Redis server at ``url``."""
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - depends on installed extras
+            raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed") from exc
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._client.get(self._prefix + key)
+        except self._errors as error:
+            self._failed("get", error)
+            return None
+
+    def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        try:
+            return list(self._client.mget([self._prefix + key for key in keys]))
+        except self._errors as error:
+            self._failed("get_many", error)
+            return [None] * len(keys)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            self._client.set(self._prefix + key, value, px=int(ttl * 1000))
+        except self._errors as error:
+            self._failed("set", error)
+
+    def set_many(self, values: Mapping[str, bytes], ttl: float) -> None:
+        if not values:
+            return
+        # Not a MULTI: the SETs are independent, they only share the round trip.
+        pipeline = self._client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipeline.set(self._prefix + key, value, px=int(ttl * 1000))
+        try:
+            pipeline.execute()
+        except self._errors as error:
+            self._failed("set_many", error)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        try:
+            return bool(self._client.set(self._prefix + key, value, px=int(ttl * 1000), nx=True))
+        except self._errors as error:
+            self._failed("add", error)
+            return True
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._prefix + key)
+        except self._errors as error:
+            self._failed("delete", error)
+
+
+@cache
+def get_cache() -> Cache:
+    """Process-wide cache: Redis when configured, otherwise in memory."""
+    settings = Settings()
+    if settings.redis_url:
+        return RedisCache.from_url(settings.redis_url)
+    return MemoryCache(max_entries=settings.cache_max_entries)
+
+
+__all__ = ["CACHE_ERRORS", "Cache", "MemoryCache", "RedisCache", "get_cache"]
@@ -1,5 +1,7 @@
 """Application configuration powered by Pydantic settings."""
 
+from functools import cache
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -12,6 +14,56 @@ class Settings(BaseSettings):
         alias="DATABASE_URL",
         description="Database connection string.",
     )
+    database_replica_urls: list[str] = Field(
+        default_factory=list,
+        alias="DATABASE_REPLICA_URLS",
+        description="JSON list of read replicas serving read-only endpoints round-robin; empty means none.",
+    )
+    replica_pin_seconds: float = Field(
+        default=5.0,
+        alias="REPLICA_PIN_SECONDS",
+        description="Reads carrying a consistency token younger than this go to the primary.",
+    )
+    replica_eject_seconds: float = Field(
+        default=30.0,
+        alias="REPLICA_EJECT_SECONDS",
+        description="How long a replica that failed a connection is skipped before it is tried again.",
+    )
+    database_mode: str = Field(
+        default="sync",
+        alias="DATABASE_MODE",
+        description="Route handler mode: sync (threadpool handlers) or async (AsyncSession handlers).",
+    )
+    async_database_url: str | None = Field(
+        default=None,
+        alias="ASYNC_DATABASE_URL",
+        description="Async driver connection string; derived from DATABASE_URL (asyncpg, aiosqlite) when unset.",
+    )
+    db_pool_size: int = Field(
+        default=5,
+        alias="DB_POOL_SIZE",
+        description="Persistent connections kept by each engine's pool.",
+    )
+    db_max_overflow: int = Field(
+        default=10,
+        alias="DB_MAX_OVERFLOW",
+        description="Extra connections a pool may open beyond its size under load.",
+    )
+    db_pool_timeout: float = Field(
+        default=30.0,
+        alias="DB_POOL_TIMEOUT",
+        description="Seconds a checkout waits for a free connection before failing.",
+    )
+    db_pool_recycle: int = Field(
+        default=1800,
+        alias="DB_POOL_RECYCLE",
+        description="Connections older than this many seconds are replaced on checkout; -1 disables recycling.",
+    )
+    db_pool_pre_ping: bool = Field(
+        default=True,
+        alias="DB_POOL_PRE_PING",
+        description="Test connections on checkout; when off, stale connections are only replaced after an error.",
+    )
     otel_exporter_otlp_endpoint: str | None = Field(
         default=None,
         alias="OTEL_EXPORTER_OTLP_ENDPOINT",
@@ -22,6 +74,131 @@ class Settings(BaseSettings):
         alias="ENVIRONMENT",
         description="Deployment environment name.",
     )
+    temporal_host: str = Field(
+        default="localhost:7233",
+        alias="TEMPORAL_HOST",
+        description="Temporal frontend address used to start background workflows.",
+    )
+    temporal_namespace: str = Field(
+        default="default",
+        alias="TEMPORAL_NAMESPACE",
+        description="Temporal namespace for background workflows.",
+    )
+    temporal_task_queue: str = Field(
+        default="ai-pm-default",
+        alias="TEMPORAL_TASK_QUEUE",
+        description="Task queue polled by the worker service.",
+    )
+    intake_classifier: str = Field(
+        default="hashed-linear",
+        alias="INTAKE_CLASSIFIER",
+        description="Requirement classifier: built-in name, .npz weights path or module:factory.",
+    )
+    embedding_provider: str = Field(
+        default="hashing",
+        alias="EMBEDDING_PROVIDER",
+        description="Embedding provider: built-in name or module:factory.",
+    )
+    embedding_mode: str = Field(
+        default="sync",
+        alias="EMBEDDING_MODE",
+        description="sync embeds turns before they are stored; deferred stores them first and embeds in batches.",
+    )
+    embedding_batch_size: int = Field(
+        default=64,
+        alias="EMBEDDING_BATCH_SIZE",
+        description="Turns embedded per batch in deferred mode.",
+    )
+    embedding_drain_interval_seconds: float = Field(
+        default=60.0,
+        alias="EMBEDDING_DRAIN_INTERVAL_SECONDS",
+        description="How often deferred mode re-checks for pending turns left by a crash or restart; 0 drains only at startup.",
+    )
+    embedding_use_worker: bool = Field(
+        default=False,
+        alias="EMBEDDING_USE_WORKER",
+        description="Embed deferred batches on the Temporal worker, falling back to the API process when unavailable.",
+    )
+    embedding_cache_max_entries: int = Field(
+        default=50_000,
+        alias="EMBEDDING_CACHE_MAX_ENTRIES",
+        description="Capacity of the in-process embedding cache; 0 disables caching embeddings.",
+    )
+    embedding_cache_ttl_seconds: float = Field(
+        default=7 * 24 * 3600.0,
+        alias="EMBEDDING_CACHE_TTL_SECONDS",
+        description="How long cached embeddings are kept, in memory and in Redis.",
+    )
+    vector_search_backend: str = Field(
+        default="auto",
+        alias="VECTOR_SEARCH_BACKEND",
+        description="Similarity search backend: auto, pgvector, local or exact.",
+    )
+    vector_index_dir: str = Field(
+        default="./vector-index",
+        alias="VECTOR_INDEX_DIR",
+        description="Directory holding the local per-project vector index files.",
+    )
+    vector_index_storage: str = Field(
+        default="float32",
+        alias="VECTOR_INDEX_STORAGE",
+        description="Precision of the similarity index: float32, half (halfvec on PostgreSQL) or int8 (local only).",
+    )
+    vector_rerank_factor: int = Field(
+        default=4,
+        alias="VECTOR_RERANK_FACTOR",
+        description="Reduced-precision searches re-rank k times this many candidates at full precision.",
+    )
+    snapshot_max_upload_bytes: int = Field(
+        default=512 * 1024 * 1024,
+        alias="SNAPSHOT_MAX_UPLOAD_BYTES",
+        description="Largest project snapshot the import endpoint accepts; larger uploads get a 413.",
+    )
+    intake_dedup_window_seconds: float = Field(
+        default=600.0,
+        alias="INTAKE_DEDUP_WINDOW_SECONDS",
+        description="How long identical intake submissions replay the first result; 0 disables deduplication.",
+    )
+    redis_url: str | None = Field(
+        default=None,
+        alias="REDIS_URL",
+        description="Redis connection string for shared caches; an in-process cache is used when unset.",
+    )
+    cache_max_entries: int = Field(
+        default=10_000,
+        alias="CACHE_MAX_ENTRIES",
+        description="Capacity of the in-process cache.",
+    )
+    sql_guard_mode: str = Field(
+        default="off",
+        alias="SQL_GUARD_MODE",
+        description="Per-request query checks for development and tests: off, warn or raise.",
+    )
+    sql_query_budget: int = Field(
+        default=25,
+        alias="SQL_QUERY_BUDGET",
+        description="Statements a request may run before the SQL guard reports it; 0 disables the budget.",
+    )
+    sql_repeat_threshold: int = Field(
+        default=5,
+        alias="SQL_REPEAT_THRESHOLD",
+        description="Times one statement may repeat within a request before the SQL guard flags an N+1 pattern.",
+    )
+    slow_request_seconds: float = Field(
+        default=1.0,
+        alias="SLOW_REQUEST_SECONDS",
+        description="Requests slower than this log their slowest statements; 0 disables the slow-query log.",
+    )
+    slow_query_explain_rate: float = Field(
+        default=0.0,
+        alias="SLOW_QUERY_EXPLAIN_RATE",
+        description="Fraction of slow PostgreSQL SELECTs re-run in the background with EXPLAIN (ANALYZE, BUFFERS).",
+    )
+    slow_query_log_size: int = Field(
+        default=200,
+        alias="SLOW_QUERY_LOG_SIZE",
+        description="Slow statements kept in memory for the admin slow-query endpoint.",
+    )
     cors_allow_origins: list[str] = Field(
         default_factory=lambda: ["http://localhost:3000", "http://localhost:3001", "http://127.0.0.1:3000"],
         alias="CORS_ALLOW_ORIGINS",
@@ -30,3 +207,8 @@ class Settings(BaseSettings):
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
+
+@cache
+def get_settings() -> Settings:
+    """Process-wide settings for hot paths, read from the environment once."""
+    return Settings()
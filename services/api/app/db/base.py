@@ -1,19 +1,51 @@
 """Database engine and session configuration."""
 
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
+from functools import cache
+from typing import Any
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.config import Settings
+from app.db.pool_metrics import instrument_engine, instrumented_pool_class
+from app.db.rollups import register_rollup_listeners
+
+DATABASE_MODES = ("sync", "async")
+
+# Async drivers used when ASYNC_DATABASE_URL is not set.
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
 
 _settings = Settings()
 
+
+def pool_options(settings: Settings, url: str, label: str, asynchronous: bool = False) -> dict[str, Any]:
+    """``create_engine`` pool arguments from the DB_POOL_* settings.
+
+    In-memory SQLite keeps SQLAlchemy's single-connection pool, since every
+    new connection would open an empty database.
+    """
+    options: dict[str, Any] = {"pool_pre_ping": settings.db_pool_pre_ping}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+    return options | {
+        "poolclass": instrumented_pool_class(label, asynchronous),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
 engine = create_engine(
     _settings.database_url,
     future=True,
-    pool_pre_ping=True,
+    **pool_options(_settings, _settings.database_url, "primary"),
 )
+instrument_engine(engine, "primary")
 SessionLocal = sessionmaker(
     bind=engine,
     autoflush=False,
@@ -21,6 +53,45 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,
     future=True,
 )
+register_rollup_listeners(SessionLocal)
+
+
+class AsyncBackedSession(Session):
+    """Sync session class behind `AsyncSession`, so rollup listeners apply to async writes too."""
+
+
+register_rollup_listeners(AsyncBackedSession)
+
+
+def async_database_url(settings: Settings) -> str:
+    """The configured async URL, or DATABASE_URL with its driver swapped for an async one."""
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend!r}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+@cache
+def get_async_engine() -> AsyncEngine:
+    """Async engine, created on first use so sync deployments never import the async drivers."""
+    settings = Settings()
+    url = async_database_url(settings)
+    async_engine = create_async_engine(url, **pool_options(settings, url, "primary_async", asynchronous=True))
+    instrument_engine(async_engine.sync_engine, "primary_async")
+    return async_engine
+
+
+@cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=AsyncBackedSession,
+    )
 
 
 def get_session() -> Iterator[Session]:
@@ -32,4 +103,21 @@ def get_session() -> Iterator[Session]:
         db.close()
 
 
-__all__ = ['engine', 'SessionLocal', 'get_session']
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """Async counterpart of `get_session` for handlers running on the event loop."""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+__all__ = [
+    'DATABASE_MODES',
+    'engine',
+    'pool_options',
+    'SessionLocal',
+    'AsyncBackedSession',
+    'async_database_url',
+    'get_async_engine',
+    'get_async_sessionmaker',
+    'get_async_session',
+    'get_session',
+]
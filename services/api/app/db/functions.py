@@ -0,0 +1,34 @@
+"""Portable SQL functions for statements that run entirely in the database."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class new_uuid(FunctionElement):
+    """A random UUID generated by the database, one per row.
+
+    Used where ``INSERT ... SELECT`` writes rows whose primary key the ORM
+    would otherwise fill in from Python.
+    """
+
+    type = UUID(as_uuid=True)
+    inherit_cache = True
+
+
+@compiles(new_uuid)
+def _compile_new_uuid(element: new_uuid, compiler: Any, **kw: Any) -> str:
+    return "gen_random_uuid()"
+
+
+@compiles(new_uuid, "sqlite")
+def _compile_new_uuid_sqlite(element: new_uuid, compiler: Any, **kw: Any) -> str:
+    # UUID columns are stored as 32 hex characters on SQLite.
+    return "lower(hex(randomblob(16)))"
+
+
+__all__ = ["new_uuid"]
@@ -20,6 +20,10 @@ if config.config_file_name is not None:
         pass
 
 
+# Migrations never import application settings; the values they need are handed over here.
+config.attributes.setdefault("embedding_provider", Settings().embedding_provider)
+
+
 def get_url() -> str:
     settings = Settings()
     return settings.database_url
@@ -0,0 +1,45 @@
+"""Rewrite enum columns stored by member name to the member values."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006a_enum_values"
+down_revision = "0006_remove_project_planning_fields"
+branch_labels = None
+depends_on = None
+
+# Member values per enum column; each member's name is its value upper-cased.
+ENUM_COLUMNS = {
+    ("projects", "status"): ("planned", "active", "paused", "completed", "archived"),
+    ("personas", "role"): ("client", "lead", "developer", "pm_agent"),
+    ("requirements", "type"): ("feature", "bug", "improvement", "constraint"),
+    ("intake_jobs", "status"): ("pending", "running", "completed", "failed"),
+}
+
+
+def _rewrite(by_value: bool) -> None:
+    bind = op.get_bind()
+    # PostgreSQL enum types only accept the values, so names were never stored there.
+    if bind.dialect.name == "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    for (table_name, column), values in ENUM_COLUMNS.items():
+        # intake_jobs is only present this early on databases created from the models.
+        if not inspector.has_table(table_name):
+            continue
+        table = sa.table(table_name, sa.column(column, sa.String))
+        for value in values:
+            old, new = (value.upper(), value) if by_value else (value, value.upper())
+            op.execute(table.update().where(table.c[column] == old).values({column: new}))
+
+
+def upgrade() -> None:
+    """Store enum columns by value, as the models now persist them."""
+    _rewrite(by_value=True)
+
+
+def downgrade() -> None:
+    """Store enum columns by member name again."""
+    _rewrite(by_value=False)
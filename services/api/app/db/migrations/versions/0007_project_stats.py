@@ -0,0 +1,84 @@
+"""Add the project_stats rollup table."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007_project_stats"
+down_revision = "0006a_enum_values"
+branch_labels = None
+depends_on = None
+
+
+def _child_count(table: str, extra: str = "") -> str:
+    return f"(SELECT count(*) FROM {table} WHERE {table}.project_id = projects.id{extra})"
+
+
+def upgrade() -> None:
+    """Create project_stats and backfill it from existing rows."""
+    op.create_table(
+        "project_stats",
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("persona_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("requirement_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("feature_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("bug_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("improvement_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("constraint_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("conversation_turn_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "last_activity_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+    )
+
+    op.execute(
+        f"""
+        INSERT INTO project_stats (
+            project_id,
+            persona_count,
+            requirement_count,
+            feature_count,
+            bug_count,
+            improvement_count,
+            constraint_count,
+            conversation_turn_count,
+            last_activity_at
+        )
+        SELECT
+            projects.id,
+            {_child_count("personas")},
+            {_child_count("requirements")},
+            {_child_count("requirements", " AND requirements.type = 'feature'")},
+            {_child_count("requirements", " AND requirements.type = 'bug'")},
+            {_child_count("requirements", " AND requirements.type = 'improvement'")},
+            {_child_count("requirements", " AND requirements.type = 'constraint'")},
+            {_child_count("conversation_turns")},
+            COALESCE(
+                (
+                    SELECT max(activity.occurred_at) FROM (
+                        SELECT updated_at AS occurred_at FROM personas WHERE personas.project_id = projects.id
+                        UNION ALL
+                        SELECT updated_at FROM requirements WHERE requirements.project_id = projects.id
+                        UNION ALL
+                        SELECT created_at FROM conversation_turns WHERE conversation_turns.project_id = projects.id
+                    ) AS activity
+                ),
+                projects.created_at
+            )
+        FROM projects
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the project_stats table."""
+    op.drop_table("project_stats")
@@ -0,0 +1,44 @@
+"""Add composite indexes for foreign-key filtered, created_at ordered queries."""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0008_hot_path_indexes"
+down_revision = "0007_project_stats"
+branch_labels = None
+depends_on = None
+
+
+INDEXES: tuple[tuple[str, str, tuple[str, ...]], ...] = (
+    ("ix_requirements_project_id_created_at_id", "requirements", ("project_id", "created_at", "id")),
+    ("ix_requirements_persona_id_created_at_id", "requirements", ("persona_id", "created_at", "id")),
+    ("ix_conversation_turns_project_id_created_at_id", "conversation_turns", ("project_id", "created_at", "id")),
+    ("ix_conversation_turns_persona_id_created_at_id", "conversation_turns", ("persona_id", "created_at", "id")),
+    ("ix_personas_project_id_created_at_id", "personas", ("project_id", "created_at", "id")),
+    ("ix_personas_user_id_project_id", "personas", ("user_id", "project_id")),
+    ("ix_projects_organization_id_created_at_id", "projects", ("organization_id", "created_at", "id")),
+    ("ix_projects_client_id_created_at_id", "projects", ("client_id", "created_at", "id")),
+)
+
+
+def upgrade() -> None:
+    """Create the indexes, without blocking writes on PostgreSQL."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                list(columns),
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Drop the indexes."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
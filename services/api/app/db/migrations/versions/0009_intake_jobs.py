@@ -0,0 +1,44 @@
+"""Add the intake_jobs table for asynchronous extraction."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0009_intake_jobs"
+down_revision = "0008_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the intake_jobs table."""
+    intake_job_status = sa.Enum("pending", "running", "completed", "failed", name="intake_job_status")
+
+    op.create_table(
+        "intake_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("persona_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("status", intake_job_status, nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("requirement_ids", sa.JSON(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["persona_id"], ["personas.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_intake_jobs_project_id", "intake_jobs", ["project_id"])
+
+
+def downgrade() -> None:
+    """Drop the intake_jobs table."""
+    op.drop_index("ix_intake_jobs_project_id", table_name="intake_jobs")
+    op.drop_table("intake_jobs")
+    sa.Enum(name="intake_job_status").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,100 @@
+"""Fix conversation_turns.embedding to 384 dimensions and re-embed existing turns."""
+
+from __future__ import annotations
+
+import importlib
+import re
+import zlib
+from collections.abc import Callable, Sequence
+from itertools import pairwise
+
+import numpy as np
+import sqlalchemy as sa
+from alembic import context, op
+from pgvector.sqlalchemy import Vector
+
+revision = "0010_turn_embedding_dim"
+down_revision = "0009_intake_jobs"
+branch_labels = None
+depends_on = None
+
+DIMENSION = 384
+BATCH_SIZE = 1_000
+
+# The built-in hashing provider as it embedded turns at this revision, kept here
+# so later changes to the application's embedders do not change this migration.
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def _hashing_embed(texts: Sequence[str]) -> np.ndarray:
+    vectors = np.zeros((len(texts), DIMENSION), dtype=np.float64)
+    for row, text in enumerate(texts):
+        words = _TOKEN.findall(text.lower())
+        for token in words + [f"{first} {second}" for first, second in pairwise(words)]:
+            hashed = zlib.crc32(token.encode())
+            vectors[row, hashed % DIMENSION] += -1.0 if hashed >> 31 else 1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors.astype(np.float32)
+
+
+def _embedder() -> Callable[[Sequence[str]], np.ndarray]:
+    """The hashing provider, or the ``module:factory`` provider env.py passes in from EMBEDDING_PROVIDER."""
+    spec = context.config.attributes.get("embedding_provider", "hashing")
+    if spec == "hashing":
+        return _hashing_embed
+    module_name, _, attribute = spec.partition(":")
+    provider = getattr(importlib.import_module(module_name), attribute)()
+    if provider.dimension != DIMENSION:
+        raise ValueError(f"{spec!r} produces {provider.dimension}-dimensional embeddings, expected {DIMENSION}")
+    return provider.embed
+
+
+def _reembed(dimension: int) -> None:
+    """Replace every stored embedding, a keyset-ordered batch at a time."""
+    embed = _embedder()
+    bind = op.get_bind()
+    turns = sa.table("conversation_turns", sa.column("id"), sa.column("text"), sa.column("embedding", Vector(dimension)))
+
+    last_id = None
+    while True:
+        query = sa.select(turns.c.id, turns.c.text).order_by(turns.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(turns.c.id > last_id)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+        vectors = embed([row.text for row in rows])
+        bind.execute(
+            turns.update().where(turns.c.id == sa.bindparam("turn_id")),
+            [{"turn_id": row.id, "embedding": vector} for row, vector in zip(rows, vectors)],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Constrain the embedding column to the provider dimension."""
+    # Batch mode recreates the table on SQLite, which cannot ALTER a column in place.
+    # Placeholder embeddings have the wrong length, so clear them before the type change.
+    with op.batch_alter_table("conversation_turns") as batch_op:
+        batch_op.alter_column("embedding", nullable=True)
+    op.execute("UPDATE conversation_turns SET embedding = NULL")
+    with op.batch_alter_table("conversation_turns") as batch_op:
+        batch_op.alter_column(
+            "embedding",
+            type_=Vector(DIMENSION),
+            postgresql_using=f"embedding::vector({DIMENSION})",
+        )
+    _reembed(DIMENSION)
+    with op.batch_alter_table("conversation_turns") as batch_op:
+        batch_op.alter_column("embedding", nullable=False)
+
+
+def downgrade() -> None:
+    """Relax the embedding column back to an unconstrained vector."""
+    with op.batch_alter_table("conversation_turns") as batch_op:
+        batch_op.alter_column(
+            "embedding",
+            type_=Vector(),
+            postgresql_using="embedding::vector",
+        )
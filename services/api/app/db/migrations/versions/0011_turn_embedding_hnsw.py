@@ -0,0 +1,39 @@
+"""Add an HNSW index for cosine similarity search over conversation turn embeddings."""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0011_turn_embedding_hnsw"
+down_revision = "0010_turn_embedding_dim"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_conversation_turns_embedding_hnsw"
+
+
+def upgrade() -> None:
+    """Build the index without blocking writes; pgvector indexes exist only on PostgreSQL."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            "conversation_turns",
+            ["embedding"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Drop the index."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name="conversation_turns", if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,48 @@
+"""Allow conversation turns to be stored before their embedding is computed."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0012_turn_embedding_pending"
+down_revision = "0011_turn_embedding_hnsw"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_conversation_turns_pending_embedding"
+
+
+def upgrade() -> None:
+    """Make the embedding nullable and index the pending turns."""
+    # Batch mode recreates the table on SQLite, which cannot ALTER a column in place.
+    with op.batch_alter_table("conversation_turns") as batch_op:
+        batch_op.alter_column("embedding", nullable=True)
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            "conversation_turns",
+            ["created_at", "id"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("embedding IS NULL"),
+            sqlite_where=sa.text("embedding IS NULL"),
+        )
+
+
+def downgrade() -> None:
+    """Require embeddings again once no turn is pending."""
+    turns = sa.table("conversation_turns", sa.column("embedding"))
+    pending = op.get_bind().execute(sa.select(sa.func.count()).where(turns.c.embedding.is_(None))).scalar_one()
+    if pending:
+        # Embedding them here would tie the migration to the application's embedders.
+        raise RuntimeError(
+            f"{pending} conversation turns are still waiting for their embedding; "
+            "let the deferred embedder finish before downgrading"
+        )
+
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name="conversation_turns", if_exists=True, postgresql_concurrently=True)
+    with op.batch_alter_table("conversation_turns") as batch_op:
+        batch_op.alter_column("embedding", nullable=False)
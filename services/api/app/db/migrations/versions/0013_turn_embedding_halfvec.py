@@ -0,0 +1,44 @@
+"""Add a half-precision HNSW index searched with VECTOR_INDEX_STORAGE=half."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0013_turn_embedding_halfvec"
+down_revision = "0012_turn_embedding_pending"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_conversation_turns_embedding_halfvec_hnsw"
+DIMENSION = 384
+
+
+def upgrade() -> None:
+    """Index ``embedding::halfvec``, half the size of the float32 HNSW index.
+
+    The index is always built, so ``VECTOR_INDEX_STORAGE`` can be switched to
+    ``half`` without migrating again; it stays unused with float32 storage.
+    Needs pgvector 0.7+.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            "conversation_turns",
+            [sa.text(f"(embedding::halfvec({DIMENSION})) halfvec_cosine_ops")],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+        )
+
+
+def downgrade() -> None:
+    """Drop the index."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name="conversation_turns", if_exists=True, postgresql_concurrently=True)
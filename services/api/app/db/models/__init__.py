@@ -3,10 +3,12 @@
 from .base import Base
 from .client import Client
 from .conversation_turn import ConversationTurn
-from .enums import PersonaRole, ProjectStatus, RequirementType
+from .enums import IntakeJobStatus, PersonaRole, ProjectStatus, RequirementType
+from .intake_job import IntakeJob
 from .organization import Organization
 from .persona import Persona
 from .project import Project
+from .project_stats import ProjectStats
 from .requirement import Requirement
 from .user import User
 
@@ -15,11 +17,14 @@ __all__ = [
     "RequirementType",
     "PersonaRole",
     "ProjectStatus",
+    "IntakeJobStatus",
     "Organization",
     "User",
     "Client",
     "Project",
+    "ProjectStats",
     "Persona",
     "Requirement",
     "ConversationTurn",
+    "IntakeJob",
 ]
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+from typing import Any, ClassVar
+
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     """Base declarative class for ORM models."""
 
+    # Server-generated columns (created_at, updated_at) come back through
+    # INSERT/UPDATE ... RETURNING in the flush, so handlers never refresh.
+    # DeclarativeBase declares it as a plain attribute, hence the override ignore.
+    __mapper_args__: ClassVar[dict[str, Any]] = {"eager_defaults": True}  # type: ignore[misc]
+
 
 __all__ = ["Base"]
@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
+from typing import Optional
 
+from common.embeddings import EMBEDDING_DIMENSION
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import DateTime, ForeignKey, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +19,25 @@ class ConversationTurn(Base):
     """A conversation turn captured for analysis."""
 
     __tablename__ = "conversation_turns"
+    __table_args__ = (
+        Index("ix_conversation_turns_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_conversation_turns_persona_id_created_at_id", "persona_id", "created_at", "id"),
+        Index(
+            "ix_conversation_turns_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Turns still waiting for the deferred embedder, oldest first.
+        Index(
+            "ix_conversation_turns_pending_embedding",
+            "created_at",
+            "id",
+            postgresql_where=text("embedding IS NULL"),
+            sqlite_where=text("embedding IS NULL"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -26,7 +47,8 @@ class ConversationTurn(Base):
         nullable=False,
     )
     text: Mapped[str] = mapped_column(Text, nullable=False)
-    embedding: Mapped[list[float]] = mapped_column(Vector(), nullable=False)
+    # NULL while the embedding is pending (EMBEDDING_MODE=deferred).
+    embedding: Mapped[Optional[list[float]]] = mapped_column(Vector(EMBEDDING_DIMENSION), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     project: Mapped["Project"] = relationship(back_populates="conversation_turns")
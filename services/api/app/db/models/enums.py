@@ -5,6 +5,11 @@ from __future__ import annotations
 from enum import Enum
 
 
+def enum_values(enum: type[Enum]) -> list[str]:
+    """Persist members by value, matching the enum types the migrations create."""
+    return [member.value for member in enum]
+
+
 class RequirementType(str, Enum):
     """Requirement classification categories."""
 
@@ -33,4 +38,13 @@ class ProjectStatus(str, Enum):
     ARCHIVED = "archived"
 
 
-__all__ = ["RequirementType", "PersonaRole", "ProjectStatus"]
+class IntakeJobStatus(str, Enum):
+    """Lifecycle statuses for asynchronous intake extraction jobs."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+__all__ = ["RequirementType", "PersonaRole", "ProjectStatus", "IntakeJobStatus", "enum_values"]
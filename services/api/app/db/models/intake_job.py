@@ -0,0 +1,50 @@
+"""Asynchronous intake job model definition."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Text, func
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .enums import IntakeJobStatus, enum_values
+
+
+class IntakeJob(Base):
+    """Tracks an intake extraction handed off to the Temporal worker."""
+
+    __tablename__ = "intake_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    persona_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("personas.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    status: Mapped[IntakeJobStatus] = mapped_column(
+        SAEnum(IntakeJobStatus, name="intake_job_status", values_callable=enum_values),
+        nullable=False,
+        default=IntakeJobStatus.PENDING,
+    )
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    requirement_ids: Mapped[Optional[list[str]]] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def workflow_id(self) -> str:
+        """Temporal workflow id, derived from the job id so starts are idempotent."""
+        return f"intake-{self.id}"
+
+
+__all__ = ["IntakeJob"]
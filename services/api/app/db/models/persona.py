@@ -6,23 +6,29 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, String, func
+from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
-from .enums import PersonaRole
+from .enums import PersonaRole, enum_values
 
 
 class Persona(Base):
     """A persona participating in a project's lifecycle."""
 
     __tablename__ = "personas"
+    __table_args__ = (
+        Index("ix_personas_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_personas_user_id_project_id", "user_id", "project_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
-    role: Mapped[PersonaRole] = mapped_column(SAEnum(PersonaRole, name="persona_role"), nullable=False)
+    role: Mapped[PersonaRole] = mapped_column(
+        SAEnum(PersonaRole, name="persona_role", values_callable=enum_values), nullable=False
+    )
     display_name: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
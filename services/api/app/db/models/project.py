@@ -3,19 +3,32 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
-from .enums import ProjectStatus
+from .enums import ProjectStatus, enum_values
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .conversation_turn import ConversationTurn
+    from .organization import Organization
+    from .persona import Persona
+    from .project_stats import ProjectStats
+    from .requirement import Requirement
 
 
 class Project(Base):
     """A project represents a deliverable for a client."""
 
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_organization_id_created_at_id", "organization_id", "created_at", "id"),
+        Index("ix_projects_client_id_created_at_id", "client_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -26,23 +39,28 @@ class Project(Base):
     )
     client_id: Mapped[Optional[int]] = mapped_column(ForeignKey("clients.id", ondelete="SET NULL"))
     status: Mapped[ProjectStatus] = mapped_column(
-        SAEnum(ProjectStatus, name="project_status"),
+        SAEnum(ProjectStatus, name="project_status", values_callable=enum_values),
         nullable=False,
         default=ProjectStatus.ACTIVE,
         server_default=ProjectStatus.ACTIVE.value,
     )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
-    organization: Mapped["Organization"] = relationship(back_populates="projects")
-    client: Mapped[Optional["Client"]] = relationship(back_populates="projects")
-    personas: Mapped[list["Persona"]] = relationship(back_populates="project", cascade="all, delete-orphan")
-    requirements: Mapped[list["Requirement"]] = relationship(
+    organization: Mapped[Organization] = relationship(back_populates="projects")
+    client: Mapped[Optional[Client]] = relationship(back_populates="projects")
+    personas: Mapped[list[Persona]] = relationship(back_populates="project", cascade="all, delete-orphan")
+    requirements: Mapped[list[Requirement]] = relationship(
+        back_populates="project",
+        cascade="all, delete-orphan",
+    )
+    conversation_turns: Mapped[list[ConversationTurn]] = relationship(
         back_populates="project",
         cascade="all, delete-orphan",
     )
-    conversation_turns: Mapped[list["ConversationTurn"]] = relationship(
+    stats: Mapped[Optional[ProjectStats]] = relationship(
         back_populates="project",
         cascade="all, delete-orphan",
+        uselist=False,
     )
 
 
@@ -0,0 +1,39 @@
+"""Project statistics rollup model definition."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+
+if TYPE_CHECKING:
+    from .project import Project
+
+
+class ProjectStats(Base):
+    """Denormalized per-project counters maintained as child rows are written."""
+
+    __tablename__ = "project_stats"
+
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    persona_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    requirement_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    feature_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    bug_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    improvement_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    constraint_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    conversation_turn_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_activity_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    project: Mapped[Project] = relationship(back_populates="stats")
+
+
+__all__ = ["ProjectStats"]
@@ -6,18 +6,22 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Enum as SAEnum, Float, ForeignKey, Text, func
+from sqlalchemy import DateTime, Enum as SAEnum, Float, ForeignKey, Index, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
-from .enums import RequirementType
+from .enums import RequirementType, enum_values
 
 
 class Requirement(Base):
     """A requirement captured for a project and persona."""
 
     __tablename__ = "requirements"
+    __table_args__ = (
+        Index("ix_requirements_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_requirements_persona_id_created_at_id", "persona_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -27,7 +31,9 @@ class Requirement(Base):
         nullable=False,
     )
     text: Mapped[str] = mapped_column(Text, nullable=False)
-    type: Mapped[RequirementType] = mapped_column(SAEnum(RequirementType, name="requirement_type"), nullable=False)
+    type: Mapped[RequirementType] = mapped_column(
+        SAEnum(RequirementType, name="requirement_type", values_callable=enum_values), nullable=False
+    )
     confidence: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     cluster_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,101 @@
+"""Prometheus metrics for the database connection pools.
+
+Gauges report each pool's size, checked-out connections and overflow when
+Prometheus scrapes them. Histograms record how long callers waited to check a
+connection out, and how long each connection lived before it was closed by
+recycling, invalidation or pool disposal. Waits that ran into the pool
+timeout are counted too. The ``pool`` label tells the engines apart.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, cast
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured number of persistent connections.", ["pool"])
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out of the pool.", ["pool"])
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond the pool size.", ["pool"])
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out, including opening a new one.",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after waiting the pool timeout.",
+    ["pool"],
+)
+DB_POOL_CONNECTION_LIFETIME = Histogram(
+    "db_pool_connection_lifetime_seconds",
+    "Age of database connections when they are closed.",
+    ["pool"],
+    buckets=(1.0, 10.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 7200.0, 21600.0, 86400.0),
+)
+
+_OPENED_AT = "pool_metrics_opened_at"
+
+
+class _CheckoutTimer:
+    """Times `_do_get`, the pool's checkout path that may block on the queue."""
+
+    metrics_label = "default"
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(pool=self.metrics_label).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(pool=self.metrics_label).observe(time.perf_counter() - started)
+
+
+def instrumented_pool_class(label: str, asynchronous: bool = False) -> type[QueuePool]:
+    """Queue pool class recording checkout waits under ``label``.
+
+    The label lives on the class so pools recreated by ``Engine.dispose`` keep it.
+    """
+    base = AsyncAdaptedQueuePool if asynchronous else QueuePool
+    return type(f"Instrumented{base.__name__}", (_CheckoutTimer, base), {"metrics_label": label})
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """Export gauges and connection lifetimes for the pool behind ``engine``."""
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        # Read through the engine: dispose() swaps in a new pool, recreated from the same class.
+        def current() -> QueuePool:
+            return cast(QueuePool, engine.pool)
+
+        DB_POOL_SIZE.labels(pool=label).set_function(lambda: current().size())
+        DB_POOL_CHECKED_OUT.labels(pool=label).set_function(lambda: current().checkedout())
+        DB_POOL_OVERFLOW.labels(pool=label).set_function(lambda: max(current().overflow(), 0))
+
+    @event.listens_for(engine, "connect")
+    def _opened(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        record.info[_OPENED_AT] = time.monotonic()
+
+    @event.listens_for(engine, "close")
+    def _closed(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        opened_at = record.info.pop(_OPENED_AT, None)
+        if opened_at is not None:
+            DB_POOL_CONNECTION_LIFETIME.labels(pool=label).observe(time.monotonic() - opened_at)
+
+
+__all__ = [
+    "DB_POOL_CHECKED_OUT",
+    "DB_POOL_CHECKOUT_TIMEOUTS",
+    "DB_POOL_CHECKOUT_WAIT",
+    "DB_POOL_CONNECTION_LIFETIME",
+    "DB_POOL_OVERFLOW",
+    "DB_POOL_SIZE",
+    "instrument_engine",
+    "instrumented_pool_class",
+]
@@ -0,0 +1,151 @@
+"""Routing of read-only handlers to PostgreSQL streaming replicas.
+
+Handlers that only read take their session from `get_read_session`. With
+``DATABASE_REPLICA_URLS`` set, each request goes to the next healthy replica
+in round-robin order. A replica whose connection fails is ejected for
+``REPLICA_EJECT_SECONDS`` and the request moves on to the next one, falling
+back to the primary when none is left.
+
+Replicas lag the primary, so a client reading right after its own write could
+miss it. Successful writes therefore return a consistency token (the write
+time) in `CONSISTENCY_TOKEN_HEADER`. Reads that send it back within
+``REPLICA_PIN_SECONDS`` are pinned to the primary.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from functools import cache
+
+from fastapi import Request
+from prometheus_client import Counter
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import Settings
+from app.db.base import get_session, pool_options
+from app.db.pool_metrics import instrument_engine
+
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+
+DB_REPLICA_EJECTIONS = Counter(
+    "db_replica_ejections_total",
+    "Times a replica was taken out of rotation after a connection failure.",
+    ["replica"],
+)
+DB_READ_ROUTES = Counter(
+    "db_read_routes_total",
+    "Read-only requests by the database that served them.",
+    ["target"],
+)
+
+
+@dataclass(slots=True)
+class Replica:
+    """One replica's engine and the time until which it is out of rotation."""
+
+    label: str
+    engine: Engine
+    sessions: sessionmaker[Session]
+    ejected_until: float = field(default=0.0)
+
+
+class ReplicaRouter:
+    """Round-robin choice among the replicas that are not ejected."""
+
+    def __init__(self, replicas: list[Replica], eject_seconds: float, pin_seconds: float) -> None:
+        self._replicas = replicas
+        self._eject_seconds = eject_seconds
+        # Read once with the replicas, so routing a request does not load the settings.
+        self.pin_seconds = pin_seconds
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def candidates(self) -> list[Replica]:
+        """Healthy replicas, starting with the one whose turn it is."""
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._turn) % len(self._replicas)
+        ordered = self._replicas[start:] + self._replicas[:start]
+        return [replica for replica in ordered if replica.ejected_until <= now]
+
+    def eject(self, replica: Replica) -> None:
+        replica.ejected_until = time.monotonic() + self._eject_seconds
+        DB_REPLICA_EJECTIONS.labels(replica=replica.label).inc()
+
+
+@cache
+def get_replica_router() -> ReplicaRouter | None:
+    """Router over the configured replicas, or ``None`` when there are none."""
+    settings = Settings()
+    if not settings.database_replica_urls:
+        return None
+    replicas = []
+    for position, url in enumerate(settings.database_replica_urls):
+        label = f"replica{position}"
+        engine = create_engine(url, future=True, **pool_options(settings, url, label))
+        instrument_engine(engine, label)
+        sessions = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, future=True)
+        replicas.append(Replica(label, engine, sessions))
+    return ReplicaRouter(replicas, settings.replica_eject_seconds, settings.replica_pin_seconds)
+
+
+def consistency_token() -> str:
+    """Token a client sends back to read its own writes."""
+    return f"{time.time():.3f}"
+
+
+def _pinned_to_primary(request: Request, pin_seconds: float) -> bool:
+    token = request.headers.get(CONSISTENCY_TOKEN_HEADER)
+    if token is None:
+        return False
+    try:
+        written_at = float(token)
+    except ValueError:
+        return False
+    return time.time() - written_at < pin_seconds
+
+
+def get_read_session(request: Request) -> Iterator[Session]:
+    """Session for read-only handlers, on a replica unless the request is pinned to the primary."""
+    router = get_replica_router()
+    if router is not None and not _pinned_to_primary(request, router.pin_seconds):
+        for replica in router.candidates():
+            session = replica.sessions()
+            try:
+                # Check out (and pre-ping) now so a dead replica is skipped before the handler runs.
+                session.connection()
+            except exc.DBAPIError:
+                session.close()
+                router.eject(replica)
+                continue
+            DB_READ_ROUTES.labels(target=replica.label).inc()
+            try:
+                yield session
+            except exc.DBAPIError as error:
+                if error.connection_invalidated:
+                    router.eject(replica)
+                raise
+            finally:
+                session.close()
+            return
+
+    DB_READ_ROUTES.labels(target="primary").inc()
+    yield from get_session()
+
+
+__all__ = [
+    "CONSISTENCY_TOKEN_HEADER",
+    "DB_READ_ROUTES",
+    "DB_REPLICA_EJECTIONS",
+    "Replica",
+    "ReplicaRouter",
+    "consistency_token",
+    "get_read_session",
+    "get_replica_router",
+]
@@ -0,0 +1,210 @@
+"""Incremental maintenance of the per-project statistics rollup.
+
+Counters in `project_stats` are adjusted from the ORM flush that writes the
+underlying rows, so they stay consistent with every router that goes through a
+session. Writers that bypass the unit of work (Core bulk statements) call
+`apply_project_stats_deltas` themselves, and `rebuild_project_stats` recomputes
+the rollup from scratch to repair drift.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, cast
+
+from sqlalchemy import delete, event, func, insert, inspect, select, union_all, update
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models import (
+    ConversationTurn,
+    Persona,
+    Project,
+    ProjectStats,
+    Requirement,
+    RequirementType,
+)
+
+ProjectStatsDeltas = dict[int, Counter[str]]
+
+REQUIREMENT_TYPE_COLUMNS: dict[RequirementType, str] = {
+    requirement_type: f"{requirement_type.value}_count" for requirement_type in RequirementType
+}
+
+
+def requirement_type_column(value: RequirementType | str) -> str:
+    """Return the rollup column that counts requirements of the given type."""
+    return REQUIREMENT_TYPE_COLUMNS[RequirementType(value)]
+
+
+def _project_id_of(instance: Any) -> int | None:
+    project_id = instance.project_id
+    if project_id is None and instance.project is not None:
+        project_id = instance.project.id
+    return project_id
+
+
+def _track_row(deltas: ProjectStatsDeltas, instance: Any, sign: int) -> None:
+    if isinstance(instance, Persona):
+        columns = ["persona_count"]
+    elif isinstance(instance, Requirement):
+        columns = ["requirement_count", requirement_type_column(instance.type)]
+    elif isinstance(instance, ConversationTurn):
+        columns = ["conversation_turn_count"]
+    else:
+        return
+
+    project_id = _project_id_of(instance)
+    if project_id is None:
+        return
+    counter = deltas[project_id]
+    for column in columns:
+        counter[column] += sign
+
+
+def _track_update(session: Session, deltas: ProjectStatsDeltas, instance: Any) -> None:
+    if not isinstance(instance, (Persona, Requirement, ConversationTurn)):
+        return
+    if not session.is_modified(instance):
+        return
+
+    project_id = _project_id_of(instance)
+    if project_id is None:
+        return
+    counter = deltas[project_id]
+
+    if isinstance(instance, Requirement):
+        history = inspect(instance).attrs.type.history
+        for removed in history.deleted:
+            counter[requirement_type_column(removed)] -= 1
+        for added in history.added:
+            counter[requirement_type_column(added)] += 1
+
+
+def collect_flush_deltas(session: Session) -> ProjectStatsDeltas:
+    """Summarize pending inserts, updates and deletes as per-project counter deltas."""
+    deltas: ProjectStatsDeltas = defaultdict(Counter)
+    for instance in session.new:
+        _track_row(deltas, instance, 1)
+    for instance in session.deleted:
+        _track_row(deltas, instance, -1)
+    for instance in session.dirty:
+        _track_update(session, deltas, instance)
+
+    for instance in session.deleted:
+        if isinstance(instance, Project):
+            deltas.pop(instance.id, None)
+    return deltas
+
+
+def apply_project_stats_deltas(session: Session, deltas: Mapping[int, Mapping[str, int]]) -> None:
+    """Apply counter deltas and bump `last_activity_at` for every touched project."""
+    for project_id, counter in deltas.items():
+        values: dict[str, Any] = {
+            column: getattr(ProjectStats, column) + amount for column, amount in counter.items() if amount
+        }
+        values["last_activity_at"] = func.now()
+        session.execute(update(ProjectStats).where(ProjectStats.project_id == project_id).values(values))
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    new_project_ids = [instance.id for instance in session.new if isinstance(instance, Project)]
+    if new_project_ids:
+        session.execute(insert(ProjectStats), [{"project_id": project_id} for project_id in new_project_ids])
+
+    deltas = collect_flush_deltas(session)
+    if deltas:
+        apply_project_stats_deltas(session, deltas)
+
+
+def register_rollup_listeners(factory: sessionmaker[Session] | type[Session]) -> None:
+    """Keep `project_stats` current for every session produced by the factory or of the class."""
+    if not event.contains(factory, "after_flush", _after_flush):
+        event.listen(factory, "after_flush", _after_flush)
+
+
+def _child_count(model: Any, *criteria: Any) -> Any:
+    return (
+        select(func.count())
+        .select_from(model)
+        .where(model.project_id == Project.id, *criteria)
+        .scalar_subquery()
+    )
+
+
+def rebuild_project_stats(session: Session, project_ids: Sequence[int] | None = None) -> int:
+    """Recompute rollup rows from the source tables and return how many were written."""
+    activity = union_all(
+        select(Persona.project_id.label("project_id"), Persona.updated_at.label("occurred_at")),
+        select(Requirement.project_id, Requirement.updated_at),
+        select(ConversationTurn.project_id, ConversationTurn.created_at),
+    ).subquery()
+    last_activity = (
+        select(func.max(activity.c.occurred_at)).where(activity.c.project_id == Project.id).scalar_subquery()
+    )
+
+    columns = [
+        "project_id",
+        "persona_count",
+        "requirement_count",
+        *REQUIREMENT_TYPE_COLUMNS.values(),
+        "conversation_turn_count",
+        "last_activity_at",
+    ]
+    source = select(
+        Project.id,
+        _child_count(Persona),
+        _child_count(Requirement),
+        *(
+            _child_count(Requirement, Requirement.type == requirement_type)
+            for requirement_type in REQUIREMENT_TYPE_COLUMNS
+        ),
+        _child_count(ConversationTurn),
+        func.coalesce(last_activity, Project.created_at),
+    )
+
+    clear = delete(ProjectStats)
+    if project_ids is not None:
+        clear = clear.where(ProjectStats.project_id.in_(project_ids))
+        source = source.where(Project.id.in_(project_ids))
+
+    session.execute(clear)
+    result = cast(CursorResult[Any], session.execute(insert(ProjectStats).from_select(columns, source)))
+    return result.rowcount
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    """Command line entrypoint used to repair rollup drift."""
+    parser = argparse.ArgumentParser(description="Rebuild the project_stats rollup table.")
+    parser.add_argument(
+        "--project-id",
+        dest="project_ids",
+        type=int,
+        action="append",
+        help="Restrict the rebuild to a project (repeatable). Defaults to every project.",
+    )
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from app.db.base import SessionLocal
+
+    with SessionLocal() as session:
+        rebuilt = rebuild_project_stats(session, args.project_ids)
+        session.commit()
+    print(f"Rebuilt {rebuilt} project_stats rows")
+
+
+__all__ = [
+    "REQUIREMENT_TYPE_COLUMNS",
+    "ProjectStatsDeltas",
+    "apply_project_stats_deltas",
+    "collect_flush_deltas",
+    "rebuild_project_stats",
+    "register_rollup_listeners",
+    "requirement_type_column",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""Project snapshots for moving projects between environments and backups.
+
+A snapshot is gzip-compressed NDJSON: a ``project`` header line followed by
+one line per persona, requirement and conversation turn, in that order and
+each in ``(created_at, id)`` order. Embeddings are base64-encoded little-endian
+float32 bytes. Environment-specific references (organization, client, user)
+are not exported; the importer supplies them.
+
+`export_snapshot` reads the children from a server-side cursor inside one
+repeatable-read transaction and compresses them batch by batch, so memory stays
+bounded and the snapshot is consistent. `import_snapshot` creates a new
+project with fresh ids and loads the children in batches, through ``COPY`` on
+PostgreSQL with psycopg2, all in the caller's transaction; the `project_stats`
+rollup is rebuilt for the new project at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import csv
+import gzip
+import io
+import json
+import sys
+import uuid
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import IO, Any
+
+import numpy as np
+from common.embeddings import EMBEDDING_DIMENSION
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    ConversationTurn,
+    Persona,
+    PersonaRole,
+    Project,
+    ProjectStatus,
+    Requirement,
+    RequirementType,
+)
+from app.db.rollups import rebuild_project_stats
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_MEDIA_TYPE = "application/gzip"
+EXPORT_BATCH_ROWS = 2_000
+IMPORT_BATCH_ROWS = 5_000
+
+_PROJECT_COLUMNS = ("name", "description", "status", "created_at")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot cannot be read or does not match the format."""
+
+
+@dataclass(slots=True, frozen=True)
+class _Section:
+    """One child table of a snapshot and the columns it carries."""
+
+    kind: str
+    model: Any
+    columns: tuple[str, ...]
+    # Text columns that must load as '' rather than NULL through COPY's CSV format.
+    not_null_text: tuple[str, ...] = ()
+
+
+_SECTIONS = (
+    _Section("persona", Persona, ("id", "role", "display_name", "created_at", "updated_at"), ("display_name",)),
+    _Section(
+        "requirement",
+        Requirement,
+        ("id", "persona_id", "text", "type", "confidence", "cluster_id", "created_at", "updated_at"),
+        ("text",),
+    ),
+    _Section("conversation_turn", ConversationTurn, ("id", "persona_id", "text", "embedding", "created_at"), ("text",)),
+)
+
+
+def _encode_embedding(value: Any) -> str | None:
+    if value is None:
+        return None
+    return base64.b64encode(np.asarray(value, dtype="<f4").tobytes()).decode()
+
+
+def _decode_embedding(value: str | None) -> np.ndarray | None:
+    if value is None:
+        return None
+    vector = np.frombuffer(base64.b64decode(value), dtype="<f4")
+    if vector.shape != (EMBEDDING_DIMENSION,):
+        raise SnapshotError(f"Embedding has {vector.size} dimensions; expected {EMBEDDING_DIMENSION}")
+    return vector
+
+
+def _encode_value(name: str, value: Any) -> Any:
+    if name == "embedding":
+        return _encode_embedding(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _line(kind: str, values: Iterable[tuple[str, Any]]) -> str:
+    record = {"kind": kind, **{name: _encode_value(name, value) for name, value in values}}
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def _snapshot_lines(session: Session, project_id: int) -> Iterator[str]:
+    project = session.execute(
+        select(*(getattr(Project, name) for name in _PROJECT_COLUMNS)).where(Project.id == project_id)
+    ).first()
+    if project is None:
+        raise LookupError(f"Project {project_id} not found")
+    yield _line("project", [("format_version", SNAPSHOT_FORMAT_VERSION), *project._mapping.items()])
+
+    for section in _SECTIONS:
+        model = section.model
+        stmt = (
+            select(*(getattr(model, name) for name in section.columns))
+            .where(model.project_id == project_id)
+            .order_by(model.created_at, model.id)
+            .execution_options(yield_per=EXPORT_BATCH_ROWS)
+        )
+        for batch in session.execute(stmt).partitions():
+            yield "".join(_line(section.kind, zip(section.columns, row, strict=True)) for row in batch)
+
+
+def export_snapshot(session: Session, project_id: int) -> Iterator[bytes]:
+    """Yield the gzip-compressed snapshot of a project.
+
+    The project is looked up before the first chunk is yielded, so a missing
+    project raises `LookupError` on the first ``next()``.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        # Every section reads the same snapshot even while writers keep going.
+        session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for text in _snapshot_lines(session, project_id):
+        chunk = compressor.compress(text.encode())
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+def _read_records(stream: IO[bytes]) -> Iterator[dict[str, Any]]:
+    try:
+        with io.TextIOWrapper(gzip.GzipFile(fileobj=stream, mode="rb"), encoding="utf-8") as lines:
+            for number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise SnapshotError(f"Line {number} is not a JSON object")
+                yield record
+    except (OSError, EOFError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise SnapshotError(f"Unreadable snapshot: {exc}") from exc
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _decoders(persona_ids: dict[str, uuid.UUID]) -> dict[str, Callable[[Any], Any]]:
+    def persona(value: Any) -> uuid.UUID:
+        try:
+            return persona_ids[value]
+        except KeyError:
+            raise SnapshotError(f"Unknown persona {value!r}") from None
+
+    def optional_uuid(value: Any) -> uuid.UUID | None:
+        return None if value is None else uuid.UUID(value)
+
+    return {
+        "persona_id": persona,
+        "role": PersonaRole,
+        "type": RequirementType,
+        "cluster_id": optional_uuid,
+        "embedding": _decode_embedding,
+        "created_at": datetime.fromisoformat,
+        "updated_at": datetime.fromisoformat,
+    }
+
+
+def _copy_value(name: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if name == "embedding":
+        return "[" + ",".join(map(str, value.tolist())) + "]"
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _copy_rows(session: Session, section: _Section, rows: list[dict[str, Any]]) -> None:
+    columns = ("project_id", *section.columns)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(name, row[name]) for name in columns])
+    buffer.seek(0)
+    force_not_null = f", FORCE_NOT_NULL ({', '.join(section.not_null_text)})" if section.not_null_text else ""
+    statement = (
+        f"COPY {section.model.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv{force_not_null})"
+    )
+    dbapi_connection = session.connection().connection.dbapi_connection
+    if dbapi_connection is None:
+        raise RuntimeError("The session's connection was invalidated before COPY")
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
+
+
+def _write_rows(session: Session, section: _Section, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    dialect = session.get_bind().dialect
+    # COPY goes through psycopg2's cursor.copy_expert; other drivers load with an executemany INSERT.
+    if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+        _copy_rows(session, section, rows)
+    else:
+        session.execute(insert(section.model.__table__), rows)
+
+
+def import_snapshot(
+    session: Session,
+    stream: IO[bytes],
+    organization_id: int,
+    client_id: int | None = None,
+    name: str | None = None,
+) -> Project:
+    """Load a snapshot into a new project; the caller commits.
+
+    Raises `SnapshotError` when the stream is not a readable snapshot.
+    """
+    records = _read_records(stream)
+    header = next(records, None)
+    if header is None or header.get("kind") != "project":
+        raise SnapshotError("Snapshot must start with a project record")
+    if header.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format version {header.get('format_version')!r}")
+
+    try:
+        project = Project(
+            name=name or header["name"],
+            description=header.get("description"),
+            status=ProjectStatus(header["status"]),
+            organization_id=organization_id,
+            client_id=client_id,
+            created_at=datetime.fromisoformat(header["created_at"]),
+        )
+    except (KeyError, ValueError) as exc:
+        raise SnapshotError(f"Invalid project record: {exc}") from exc
+    session.add(project)
+    session.flush()
+
+    persona_ids: dict[str, uuid.UUID] = {}
+    decoders = _decoders(persona_ids)
+    sections = {section.kind: section for section in _SECTIONS}
+    order = {section.kind: position for position, section in enumerate(_SECTIONS)}
+    current: _Section | None = None
+    pending: list[dict[str, Any]] = []
+    for record in records:
+        kind = record.get("kind")
+        section = sections.get(kind) if isinstance(kind, str) else None
+        if section is None:
+            raise SnapshotError(f"Unknown record kind {record.get('kind')!r}")
+        if section is not current:
+            if current is not None and order[section.kind] < order[current.kind]:
+                raise SnapshotError(f"{section.kind} records must come before {current.kind} records")
+            # Personas are written before the rows that reference them.
+            if current is not None:
+                _write_rows(session, current, pending)
+            current, pending = section, []
+
+        try:
+            row = {column: decoders.get(column, _identity)(record.get(column)) for column in section.columns}
+        except SnapshotError:
+            raise
+        except (TypeError, ValueError) as exc:
+            raise SnapshotError(f"Invalid {section.kind} record: {exc}") from exc
+        if section.kind == "persona":
+            persona_ids[str(row["id"])] = row["id"] = uuid.uuid4()
+        else:
+            row["id"] = uuid.uuid4()
+        row["project_id"] = project.id
+        pending.append(row)
+        if len(pending) >= IMPORT_BATCH_ROWS:
+            _write_rows(session, section, pending)
+            pending = []
+    if current is not None:
+        _write_rows(session, current, pending)
+
+    rebuild_project_stats(session, [project.id])
+    return project
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    """Command line entrypoint for exporting and importing project snapshots."""
+    parser = argparse.ArgumentParser(description="Export or import project snapshots.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="Write a project's snapshot to a file or stdout.")
+    export_parser.add_argument("project_id", type=int)
+    export_parser.add_argument("--output", "-o", help="Snapshot path; defaults to stdout.")
+    import_parser = commands.add_parser("import", help="Load a snapshot into a new project.")
+    import_parser.add_argument("path", help="Snapshot path, or - for stdin.")
+    import_parser.add_argument("--organization-id", type=int, required=True)
+    import_parser.add_argument("--client-id", type=int)
+    import_parser.add_argument("--name", help="Name for the new project; defaults to the exported name.")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from app.db.base import SessionLocal
+
+    with SessionLocal() as session:
+        if args.command == "export":
+            with open(args.output, "wb") if args.output else open(sys.stdout.fileno(), "wb", closefd=False) as out:
+                for chunk in export_snapshot(session, args.project_id):
+                    out.write(chunk)
+            return
+
+        with open(args.path, "rb") if args.path != "-" else open(sys.stdin.fileno(), "rb", closefd=False) as source:
+            project = import_snapshot(session, source, args.organization_id, args.client_id, args.name)
+            session.commit()
+        print(f"Imported project {project.id}")
+
+
+__all__ = [
+    "EXPORT_BATCH_ROWS",
+    "IMPORT_BATCH_ROWS",
+    "SNAPSHOT_FORMAT_VERSION",
+    "SNAPSHOT_MEDIA_TYPE",
+    "SnapshotError",
+    "export_snapshot",
+    "import_snapshot",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""File-backed vector index for deployments without pgvector.
+
+Each project gets a directory holding one *generation* of the index: a raw
+matrix of L2-normalized embeddings (``<generation>.vectors``) and the matching
+16-byte turn ids (``<generation>.ids``), plus a ``HEAD`` file naming the
+current generation. Searches memory-map the matrix and score it in blocks of
+NumPy matrix-vector products, so only the pages actually touched are read and
+the OS page cache is shared between worker processes.
+
+The matrix is float32 by default. ``half`` storage keeps float16 rows and
+``int8`` storage keeps symmetric per-row int8 codes with their float32 scale
+factors in ``<generation>.scales``, cutting the index to a half or a quarter
+of the memory at the cost of approximate scores; callers that need exact
+distances re-rank the top candidates against the full-precision embeddings.
+
+New turns are appended to the current generation. A rebuild writes a fresh
+generation next to the old one and swaps ``HEAD`` atomically, so readers never
+see a half-written index. Ids are written last and rows are counted as the
+shortest of the files, which ignores a row whose id was not written yet.
+
+Every generation also records a caller-supplied *watermark* of the source data
+it reflects (``<generation>.mark``), replaced after each append, so callers can
+tell a stale index from a current one without comparing its rows. Writers hold
+`LocalVectorIndex.lock`, an exclusive ``flock`` on the project's ``LOCK`` file,
+so appends and rebuilds from different processes never interleave.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import threading
+import uuid
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+_ID_BYTES = 16
+_HEAD = "HEAD"
+_LOCK = "LOCK"
+_SCORE_BLOCK_ROWS = 65_536
+_INT8_MAX = 127
+
+STORAGE_DTYPES: dict[str, np.dtype] = {
+    "float32": np.dtype(np.float32),
+    "half": np.dtype(np.float16),
+    "int8": np.dtype(np.int8),
+}
+
+
+@dataclass(slots=True, frozen=True)
+class _Generation:
+    """Memory-mapped view of one generation's files."""
+
+    name: str
+    vectors: NDArray[np.generic]
+    ids: NDArray[np.void]
+    scales: NDArray[np.float32] | None = None
+
+    def __len__(self) -> int:
+        rows = min(len(self.vectors), len(self.ids))
+        return rows if self.scales is None else min(rows, len(self.scales))
+
+
+def _normalized(vectors: NDArray[np.floating]) -> NDArray[np.float32]:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def quantize_int8(vectors: NDArray[np.float32]) -> tuple[NDArray[np.int8], NDArray[np.float32]]:
+    """Symmetric per-row int8 quantization: ``vectors ≈ codes * scales[:, None]``."""
+    peaks = np.abs(vectors).max(axis=-1, initial=0.0)
+    scales = np.where(peaks > 0, peaks / _INT8_MAX, 1.0).astype(np.float32)
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales
+
+
+class LocalVectorIndex:
+    """Per-project cosine-similarity index stored under ``directory``."""
+
+    def __init__(self, directory: str | os.PathLike[str], dimension: int, storage: str = "float32") -> None:
+        if storage not in STORAGE_DTYPES:
+            raise ValueError(f"Unknown vector index storage {storage!r}; expected one of {tuple(STORAGE_DTYPES)}")
+        self._directory = Path(directory)
+        self._dimension = dimension
+        self._storage = storage
+        self._dtype = STORAGE_DTYPES[storage]
+        self._row_bytes = dimension * self._dtype.itemsize
+        self._lock = threading.Lock()
+        self._project_locks: dict[int, threading.Lock] = {}
+        self._mapped: dict[int, tuple[str, int, _Generation]] = {}
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    @property
+    def storage(self) -> str:
+        return self._storage
+
+    @property
+    def exact(self) -> bool:
+        """Whether search distances are exact rather than approximate."""
+        return self._storage == "float32"
+
+    @contextmanager
+    def lock(self, project_id: int) -> Iterator[None]:
+        """Serialize writers to one project's index across threads and processes."""
+        with self._lock:
+            thread_lock = self._project_locks.setdefault(project_id, threading.Lock())
+        with thread_lock:
+            project_dir = self._project_dir(project_id)
+            project_dir.mkdir(parents=True, exist_ok=True)
+            # flock is held per open file, so threads take the in-process lock first.
+            with open(project_dir / _LOCK, "ab") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                yield
+
+    def _project_dir(self, project_id: int) -> Path:
+        # Each storage mode keeps its own files, so switching modes rebuilds rather than misreads.
+        suffix = "" if self._storage == "float32" else f".{self._storage}"
+        return self._directory / f"project-{project_id}{suffix}"
+
+    def _head(self, project_id: int) -> str | None:
+        try:
+            return (self._project_dir(project_id) / _HEAD).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _open(self, project_id: int) -> _Generation | None:
+        name = self._head(project_id)
+        if name is None:
+            return None
+        base = self._project_dir(project_id) / name
+        quantized = self._storage == "int8"
+        try:
+            size = os.path.getsize(f"{base}.vectors")
+            id_size = os.path.getsize(f"{base}.ids")
+            scale_size = os.path.getsize(f"{base}.scales") if quantized else 0
+        except FileNotFoundError:
+            return None
+        total_size = size + id_size + scale_size
+        cached = self._mapped.get(project_id)
+        if cached is not None and cached[:2] == (name, total_size):
+            return cached[2]
+
+        rows = size // self._row_bytes
+        id_rows = id_size // _ID_BYTES
+        scale_rows = scale_size // np.dtype(np.float32).itemsize
+        # memmap and the empty fallbacks are both ndarrays; annotate so the branches agree.
+        vectors: NDArray[np.generic]
+        ids: NDArray[np.void]
+        scales: NDArray[np.float32] | None = None
+        if rows and id_rows and (scale_rows or not quantized):
+            vectors = np.memmap(f"{base}.vectors", dtype=self._dtype, mode="r", shape=(rows, self._dimension))
+            ids = np.memmap(f"{base}.ids", dtype=f"V{_ID_BYTES}", mode="r", shape=(id_rows,))
+            if quantized:
+                scales = np.memmap(f"{base}.scales", dtype=np.float32, mode="r", shape=(scale_rows,))
+        else:
+            vectors = np.empty((0, self._dimension), dtype=self._dtype)
+            ids = np.empty(0, dtype=f"V{_ID_BYTES}")
+            if quantized:
+                scales = np.empty(0, dtype=np.float32)
+        generation = _Generation(name, vectors, ids, scales)
+        self._mapped[project_id] = (name, total_size, generation)
+        return generation
+
+    def watermark(self, project_id: int) -> str | None:
+        """Watermark recorded with the current generation, or ``None`` if the index was never built."""
+        name = self._head(project_id)
+        if name is None:
+            return None
+        try:
+            return (self._project_dir(project_id) / f"{name}.mark").read_text()
+        except FileNotFoundError:
+            return None
+
+    def count(self, project_id: int) -> int | None:
+        """Rows indexed for the project, or ``None`` if it has never been built."""
+        generation = self._open(project_id)
+        return None if generation is None else len(generation)
+
+    @staticmethod
+    def _similarities(generation: _Generation, query: NDArray[np.float32]) -> NDArray[np.float32]:
+        # Reduced-precision rows are widened a block at a time, so scoring never holds a float32 copy of the matrix.
+        rows = len(generation)
+        similarities = np.empty(rows, dtype=np.float32)
+        for start in range(0, rows, _SCORE_BLOCK_ROWS):
+            stop = min(start + _SCORE_BLOCK_ROWS, rows)
+            similarities[start:stop] = generation.vectors[start:stop].astype(np.float32, copy=False) @ query
+        if generation.scales is not None:
+            similarities *= generation.scales[:rows]
+        return similarities
+
+    def search(self, project_id: int, query: NDArray[np.floating], k: int) -> list[tuple[uuid.UUID, float]]:
+        """Ids and cosine distances of the ``k`` indexed rows nearest to ``query``."""
+        generation = self._open(project_id)
+        if generation is None or not len(generation) or k < 1:
+            return []
+        similarities = self._similarities(generation, _normalized(query))
+        k = min(k, len(similarities))
+        nearest = np.argpartition(-similarities, k - 1)[:k]
+        nearest = nearest[np.argsort(-similarities[nearest], kind="stable")]
+        ids = generation.ids[nearest]
+        return [
+            (uuid.UUID(bytes=ids[position].tobytes()), float(1.0 - similarities[row]))
+            for position, row in enumerate(nearest.tolist())
+        ]
+
+    def _encode(self, vectors: NDArray[np.floating]) -> tuple[bytes, bytes | None]:
+        """Row bytes for the ``.vectors`` file and, for int8 storage, the ``.scales`` file."""
+        normalized = _normalized(vectors).reshape(-1, self._dimension)
+        if self._storage == "int8":
+            codes, scales = quantize_int8(normalized)
+            return codes.tobytes(), scales.tobytes()
+        return normalized.astype(self._dtype, copy=False).tobytes(), None
+
+    @staticmethod
+    def _write_mark(base: str, watermark: str) -> None:
+        staged = f"{base}.mark.tmp"
+        with open(staged, "w") as handle:
+            handle.write(watermark)
+        os.replace(staged, f"{base}.mark")
+
+    def _suffixes(self) -> tuple[str, ...]:
+        return (".vectors", ".scales", ".ids") if self._storage == "int8" else (".vectors", ".ids")
+
+    def _write_rows(
+        self,
+        base: str,
+        ids: Sequence[uuid.UUID],
+        vectors: NDArray[np.floating],
+        staging: str = "",
+    ) -> None:
+        encoded, scales = self._encode(vectors)
+        contents = {".vectors": encoded, ".ids": b"".join(turn_id.bytes for turn_id in ids)}
+        if scales is not None:
+            contents[".scales"] = scales
+        for suffix in self._suffixes():
+            with open(f"{base}{suffix}{staging}", "ab") as handle:
+                handle.write(contents[suffix])
+
+    def append(
+        self,
+        project_id: int,
+        ids: Sequence[uuid.UUID],
+        vectors: NDArray[np.floating],
+        watermark: str = "",
+    ) -> None:
+        """Add rows to the project's current generation and record its new watermark; callers hold `lock`."""
+        name = self._head(project_id)
+        if name is None:
+            raise FileNotFoundError(f"No vector index for project {project_id}")
+        base = str(self._project_dir(project_id) / name)
+        self._write_rows(base, ids, vectors)
+        self._write_mark(base, watermark)
+
+    def rebuild(
+        self,
+        project_id: int,
+        batches: Iterable[tuple[Sequence[uuid.UUID], NDArray[np.floating]]],
+        watermark: str = "",
+    ) -> int:
+        """Write a new generation from ``(ids, vectors)`` batches and make it current; callers hold `lock`."""
+        project_dir = self._project_dir(project_id)
+        project_dir.mkdir(parents=True, exist_ok=True)
+        name = uuid.uuid4().hex
+        base = project_dir / name
+        for suffix in self._suffixes():
+            open(f"{base}{suffix}.tmp", "wb").close()
+        rows = 0
+        for ids, vectors in batches:
+            self._write_rows(str(base), ids, vectors, staging=".tmp")
+            rows += len(ids)
+        for suffix in self._suffixes():
+            os.replace(f"{base}{suffix}.tmp", f"{base}{suffix}")
+        self._write_mark(str(base), watermark)
+        head_tmp = project_dir / f"{_HEAD}.{name}.tmp"
+        head_tmp.write_text(name)
+        os.replace(head_tmp, project_dir / _HEAD)
+
+        for path in project_dir.iterdir():
+            if path.suffix in (".vectors", ".ids", ".scales", ".mark") and path.stem != name:
+                # Processes still mapping an old generation keep it readable on POSIX;
+                # where removal fails, the next rebuild tries again.
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        return rows
+
+
+__all__ = ["STORAGE_DTYPES", "LocalVectorIndex", "quantize_int8"]
@@ -0,0 +1,292 @@
+"""Nearest-neighbour search over conversation turn embeddings.
+
+Backends share one interface so the similarity endpoint does not care where
+vectors are indexed. On PostgreSQL the pgvector HNSW/IVFFlat index answers the
+query; other databases use a memory-mapped `LocalVectorIndex` per project
+(``VECTOR_SEARCH_BACKEND`` overrides the choice). Distances are cosine
+distances (``1 - cosine similarity``); turns whose embedding is still pending
+are not searchable yet.
+
+``VECTOR_INDEX_STORAGE`` opts into a reduced-precision index (``half`` or
+``int8``). The index then only nominates ``k * VECTOR_RERANK_FACTOR``
+candidates, which are re-ranked against the full-precision embeddings kept in
+``conversation_turns.embedding``, so returned distances are always exact.
+"""
+
+from __future__ import annotations
+
+import typing
+from collections import defaultdict
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from functools import cache
+from typing import Protocol
+from uuid import UUID
+
+import numpy as np
+from numpy.typing import NDArray
+from pgvector.sqlalchemy import HALFVEC, Vector
+from sqlalchemy import cast, func, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.models import ConversationTurn
+from app.db.vector_index import STORAGE_DTYPES, LocalVectorIndex
+
+VECTOR_SEARCH_BACKENDS = ("auto", "pgvector", "local", "exact")
+
+
+def _embedding_dimension() -> int:
+    # typing.cast: this module's `cast` is SQLAlchemy's SQL CAST.
+    return typing.cast(Vector, ConversationTurn.__table__.c.embedding.type).dim
+
+
+@dataclass(slots=True, frozen=True)
+class SearchTuning:
+    """Per-query accuracy/speed knobs; ``None`` keeps the server default.
+
+    ``ef_search`` is the HNSW candidate list size and ``probes`` the number of
+    IVFFlat lists visited. Both trade latency for recall, and both bound the
+    candidates examined *before* the project filter is applied.
+    """
+
+    ef_search: int | None = None
+    probes: int | None = None
+
+
+class VectorSearchBackend(Protocol):
+    """Finds the turns of a project closest to a query embedding."""
+
+    def search(
+        self,
+        session: Session,
+        project_id: int,
+        query: NDArray[np.float32],
+        k: int,
+        tuning: SearchTuning,
+    ) -> list[tuple[ConversationTurn, float]]:
+        """Return up to ``k`` turns with their distances, nearest first."""
+        ...
+
+    def add(self, session: Session, turns: Sequence[ConversationTurn]) -> None:
+        """Make newly committed turns searchable."""
+        ...
+
+
+class PgvectorBackend:
+    """Approximate search served by the pgvector index on ``conversation_turns.embedding``.
+
+    With ``half_precision`` the candidates come from the halfvec expression
+    index (migration 0013) and are re-ranked by their full-precision distance.
+    """
+
+    def __init__(self, half_precision: bool = False, rerank_factor: int = 4) -> None:
+        self._half_precision = half_precision
+        self._rerank_factor = rerank_factor
+
+    def search(
+        self,
+        session: Session,
+        project_id: int,
+        query: NDArray[np.float32],
+        k: int,
+        tuning: SearchTuning,
+    ) -> list[tuple[ConversationTurn, float]]:
+        # set_config(..., true) is scoped to the current transaction, like SET LOCAL.
+        settings = {"hnsw.ef_search": tuning.ef_search, "ivfflat.probes": tuning.probes}
+        for name, value in settings.items():
+            if value is not None:
+                session.execute(select(func.set_config(name, str(value), True)))
+
+        distance = ConversationTurn.embedding.cosine_distance(query).label("distance")
+        stmt = (
+            select(ConversationTurn, distance)
+            .where(ConversationTurn.project_id == project_id, ConversationTurn.embedding.is_not(None))
+            .order_by(distance)
+            .limit(k)
+        )
+        if self._half_precision:
+            # Must match the indexed expression exactly for the planner to use the halfvec index.
+            half = cast(ConversationTurn.embedding, HALFVEC(_embedding_dimension()))
+            candidates = (
+                select(ConversationTurn.id)
+                .where(ConversationTurn.project_id == project_id, ConversationTurn.embedding.is_not(None))
+                .order_by(half.cosine_distance(query))
+                .limit(k * self._rerank_factor)
+            )
+            stmt = stmt.where(ConversationTurn.id.in_(candidates))
+        return [(turn, float(turn_distance)) for turn, turn_distance in session.execute(stmt)]
+
+    def add(self, session: Session, turns: Sequence[ConversationTurn]) -> None:
+        """Nothing to do: PostgreSQL maintains the index on insert."""
+
+
+def cosine_top_k(
+    matrix: NDArray[np.float32],
+    query: NDArray[np.float32],
+    k: int,
+) -> tuple[NDArray[np.intp], NDArray[np.float32]]:
+    """Row indices and cosine distances of the ``k`` rows of ``matrix`` nearest to ``query``."""
+    if not len(matrix):
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    similarities = np.divide(matrix @ query, norms, out=np.zeros(len(matrix), dtype=np.float32), where=norms > 0)
+    distances = 1.0 - similarities
+    k = min(k, len(distances))
+    nearest = np.argpartition(distances, k - 1)[:k]
+    nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+    return nearest, distances[nearest]
+
+
+def _turns_by_id(session: Session, ids: Sequence[UUID]) -> dict[UUID, ConversationTurn]:
+    return {turn.id: turn for turn in session.scalars(select(ConversationTurn).where(ConversationTurn.id.in_(ids)))}
+
+
+class ExactScanBackend:
+    """Exact search that loads the project's embeddings and scores them with NumPy."""
+
+    def search(
+        self,
+        session: Session,
+        project_id: int,
+        query: NDArray[np.float32],
+        k: int,
+        tuning: SearchTuning,
+    ) -> list[tuple[ConversationTurn, float]]:
+        rows = session.execute(
+            select(ConversationTurn.id, ConversationTurn.embedding).where(
+                ConversationTurn.project_id == project_id, ConversationTurn.embedding.is_not(None)
+            )
+        ).all()
+        if not rows:
+            return []
+        matrix = np.stack([np.asarray(embedding, dtype=np.float32) for _, embedding in rows])
+        nearest, distances = cosine_top_k(matrix, query, k)
+        ids = [rows[index].id for index in nearest.tolist()]
+        turns = _turns_by_id(session, ids)
+        return [(turns[turn_id], distance) for turn_id, distance in zip(ids, distances.tolist())]
+
+    def add(self, session: Session, turns: Sequence[ConversationTurn]) -> None:
+        """Nothing to do: every search reads the embeddings afresh."""
+
+
+class LocalIndexBackend:
+    """Search served by a file-backed `LocalVectorIndex`.
+
+    Each index generation records a watermark of the project's embedded turns:
+    their count, newest ``created_at`` and total text length. The last catches
+    one turn swapped for another within the same second, which SQLite's
+    second-resolution timestamps would hide. Committed turns are appended, with
+    a new watermark, when the index matched the table before them. Turns written
+    any other way (imports, deletions, deferred embeddings) change the table's
+    watermark, and the next search rebuilds the project's index from the
+    database. A reduced-precision index nominates ``rerank_factor`` times as
+    many candidates, which are re-ranked by their stored embeddings.
+    """
+
+    def __init__(self, index: LocalVectorIndex, rebuild_batch_size: int = 1000, rerank_factor: int = 4) -> None:
+        self._index = index
+        self._rebuild_batch_size = rebuild_batch_size
+        self._rerank_factor = rerank_factor
+
+    @staticmethod
+    def _watermark(session: Session, project_id: int, exclude: Sequence[UUID] = ()) -> str:
+        stmt = select(
+            func.count(),
+            func.max(ConversationTurn.created_at),
+            func.coalesce(func.sum(func.length(ConversationTurn.text)), 0),
+        ).where(ConversationTurn.project_id == project_id, ConversationTurn.embedding.is_not(None))
+        if exclude:
+            stmt = stmt.where(ConversationTurn.id.not_in(exclude))
+        count, newest, text_length = session.execute(stmt).one()
+        return f"{count}:{newest.isoformat() if newest is not None else ''}:{text_length}"
+
+    def _batches(self, session: Session, project_id: int) -> Iterator[tuple[list[UUID], NDArray[np.float32]]]:
+        stmt = (
+            select(ConversationTurn.id, ConversationTurn.embedding)
+            .where(ConversationTurn.project_id == project_id, ConversationTurn.embedding.is_not(None))
+            .order_by(ConversationTurn.created_at, ConversationTurn.id)
+            .execution_options(yield_per=self._rebuild_batch_size)
+        )
+        for partition in session.execute(stmt).partitions():
+            ids = [turn_id for turn_id, _ in partition]
+            yield ids, np.stack([np.asarray(embedding, dtype=np.float32) for _, embedding in partition])
+
+    def _ensure_current(self, session: Session, project_id: int) -> None:
+        if self._index.watermark(project_id) == self._watermark(session, project_id):
+            return
+        with self._index.lock(project_id):
+            # Another request or process may have caught the index up while this one waited.
+            watermark = self._watermark(session, project_id)
+            if self._index.watermark(project_id) != watermark:
+                self._index.rebuild(project_id, self._batches(session, project_id), watermark)
+
+    def search(
+        self,
+        session: Session,
+        project_id: int,
+        query: NDArray[np.float32],
+        k: int,
+        tuning: SearchTuning,
+    ) -> list[tuple[ConversationTurn, float]]:
+        self._ensure_current(session, project_id)
+        candidates = k if self._index.exact else k * self._rerank_factor
+        matches = self._index.search(project_id, query, candidates)
+        turns = _turns_by_id(session, [turn_id for turn_id, _ in matches])
+        # A turn deleted since the index was read is simply left out.
+        found = [(turns[turn_id], distance) for turn_id, distance in matches if turn_id in turns]
+        if self._index.exact or not found:
+            return found
+        matrix = np.stack([np.asarray(turn.embedding, dtype=np.float32) for turn, _ in found])
+        nearest, distances = cosine_top_k(matrix, query, k)
+        return [(found[index][0], distance) for index, distance in zip(nearest.tolist(), distances.tolist())]
+
+    def add(self, session: Session, turns: Sequence[ConversationTurn]) -> None:
+        """Append the turns if the index was in step with the table before they were committed."""
+        by_project: defaultdict[int, list[ConversationTurn]] = defaultdict(list)
+        for turn in turns:
+            by_project[turn.project_id].append(turn)
+        for project_id, project_turns in by_project.items():
+            ids = [turn.id for turn in project_turns]
+            with self._index.lock(project_id):
+                if self._index.watermark(project_id) != self._watermark(session, project_id, exclude=ids):
+                    continue  # rebuilt on the next search
+                vectors = np.stack([np.asarray(turn.embedding, dtype=np.float32) for turn in project_turns])
+                self._index.append(project_id, ids, vectors, self._watermark(session, project_id))
+
+
+@cache
+def _local_backend(directory: str, dimension: int, storage: str, rerank_factor: int) -> LocalIndexBackend:
+    return LocalIndexBackend(LocalVectorIndex(directory, dimension, storage), rerank_factor=rerank_factor)
+
+
+def get_vector_backend(session: Session) -> VectorSearchBackend:
+    """Pick the configured search backend; ``auto`` follows the session's database."""
+    settings = get_settings()
+    name = settings.vector_search_backend
+    if name not in VECTOR_SEARCH_BACKENDS:
+        raise ValueError(f"Unknown vector search backend {name!r}; expected one of {VECTOR_SEARCH_BACKENDS}")
+    if name == "auto":
+        name = "pgvector" if session.get_bind().dialect.name == "postgresql" else "local"
+    storage = settings.vector_index_storage
+    if storage not in STORAGE_DTYPES:
+        raise ValueError(f"Unknown vector index storage {storage!r}; expected one of {tuple(STORAGE_DTYPES)}")
+    if name == "pgvector":
+        if storage == "int8":
+            raise ValueError("int8 vector index storage needs the local backend; use half with pgvector")
+        return PgvectorBackend(half_precision=storage == "half", rerank_factor=settings.vector_rerank_factor)
+    if name == "exact":
+        return ExactScanBackend()
+    return _local_backend(settings.vector_index_dir, _embedding_dimension(), storage, settings.vector_rerank_factor)
+
+
+__all__ = [
+    "VECTOR_SEARCH_BACKENDS",
+    "ExactScanBackend",
+    "LocalIndexBackend",
+    "PgvectorBackend",
+    "SearchTuning",
+    "VectorSearchBackend",
+    "cosine_top_k",
+    "get_vector_backend",
+]
@@ -0,0 +1,170 @@
+"""Deferred, batched embedding of conversation turns.
+
+With ``EMBEDDING_MODE=deferred`` a turn is stored with a NULL (pending)
+embedding and the POST returns straight away. Each write then schedules
+`EmbeddingBatcher.run` as a background task, which embeds the oldest pending
+turns ``EMBEDDING_BATCH_SIZE`` at a time until none are left. Only one drain
+runs per process; writes that arrive while it is running make it take another
+pass instead of starting a second one, so bursts of writes share batches.
+The app also drains at startup and every ``EMBEDDING_DRAIN_INTERVAL_SECONDS``,
+so turns left pending by a crash or restart are still embedded. On PostgreSQL a
+batch is claimed with ``FOR UPDATE SKIP LOCKED``, so processes draining at the
+same time embed different turns.
+
+Batches are embedded in the API process by default. With
+``EMBEDDING_USE_WORKER`` they are sent to the worker's `EmbedBatchWorkflow`,
+falling back to the API process when Temporal or the worker is unavailable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Sequence
+from datetime import timedelta
+from functools import cache
+
+from common.embeddings import (
+    EMBED_BATCH_WORKFLOW_NAME,
+    EmbedBatchRequest,
+    EmbedBatchResult,
+)
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session, sessionmaker
+from temporalio.client import WorkflowFailureError
+from temporalio.service import RPCError
+
+from app.config import Settings, get_settings
+from app.db.base import SessionLocal
+from app.db.models import ConversationTurn
+from app.db.vector_search import get_vector_backend
+from app.embedding_cache import get_cached_embedder
+from app.temporal import get_temporal_client
+
+EMBEDDING_MODES = ("sync", "deferred")
+# A worker that is not polling the task queue leaves the workflow waiting; give up and embed locally.
+WORKER_EMBED_TIMEOUT = timedelta(seconds=30)
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_is_deferred(settings: Settings) -> bool:
+    """Whether new turns are stored before they are embedded."""
+    if settings.embedding_mode not in EMBEDDING_MODES:
+        raise ValueError(f"Unknown embedding mode {settings.embedding_mode!r}; expected one of {EMBEDDING_MODES}")
+    return settings.embedding_mode == "deferred"
+
+
+def _pending_turns(session: Session, limit: int) -> list[tuple[uuid.UUID, str]]:
+    stmt = (
+        select(ConversationTurn.id, ConversationTurn.text)
+        .where(ConversationTurn.embedding.is_(None))
+        .order_by(ConversationTurn.created_at, ConversationTurn.id)
+        .limit(limit)
+    )
+    if session.get_bind().dialect.name == "postgresql":
+        # The row locks are held until the batch's UPDATE commits.
+        stmt = stmt.with_for_update(skip_locked=True)
+    return [(turn_id, text) for turn_id, text in session.execute(stmt)]
+
+
+def _store_embeddings(session: Session, ids: Sequence[uuid.UUID], vectors: Sequence[Sequence[float]]) -> None:
+    """Write a batch of embeddings with one executemany UPDATE and index the turns."""
+    # On the connection, the parameter list runs as an executemany rather than an ORM bulk update by id.
+    session.connection().execute(
+        # Skip turns another drain embedded in the meantime.
+        update(ConversationTurn).where(
+            ConversationTurn.id == bindparam("turn_id"), ConversationTurn.embedding.is_(None)
+        ),
+        [{"turn_id": turn_id, "embedding": list(vector)} for turn_id, vector in zip(ids, vectors)],
+    )
+    session.commit()
+    turns = session.scalars(select(ConversationTurn).where(ConversationTurn.id.in_(ids))).all()
+    get_vector_backend(session).add(session, turns)
+
+
+class EmbeddingBatcher:
+    """Embeds pending conversation turns in batches of ``batch_size``."""
+
+    def __init__(self, session_factory: sessionmaker[Session], batch_size: int) -> None:
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._running = False
+        self._requested = False
+
+    async def _embed_on_worker(self, texts: list[str], provider: str) -> list[list[float]] | None:
+        settings = get_settings()
+        try:
+            client = await get_temporal_client()
+            result = await client.execute_workflow(
+                EMBED_BATCH_WORKFLOW_NAME,
+                EmbedBatchRequest(texts=texts, provider=provider),
+                id=f"embed-batch-{uuid.uuid4()}",
+                task_queue=settings.temporal_task_queue,
+                execution_timeout=WORKER_EMBED_TIMEOUT,
+                result_type=EmbedBatchResult,
+            )
+        except (HTTPException, RPCError, WorkflowFailureError):
+            logger.warning("Worker embedding unavailable; embedding %d turns in process", len(texts), exc_info=True)
+            return None
+        return result.vectors
+
+    async def _embed(self, texts: list[str]) -> list[list[float]]:
+        settings = get_settings()
+        if settings.embedding_use_worker:
+            vectors = await self._embed_on_worker(texts, settings.embedding_provider)
+            if vectors is not None:
+                return vectors
+        embedder = get_cached_embedder(settings.embedding_provider)
+        return (await run_in_threadpool(embedder.embed, texts)).tolist()
+
+    async def embed_pending(self) -> int:
+        """Embed the oldest batch of pending turns; return how many were in it."""
+        with self._session_factory() as session:
+            pending = await run_in_threadpool(_pending_turns, session, self._batch_size)
+            if pending:
+                vectors = await self._embed([text for _, text in pending])
+                await run_in_threadpool(_store_embeddings, session, [turn_id for turn_id, _ in pending], vectors)
+        return len(pending)
+
+    async def run(self) -> None:
+        """Embed pending turns until none are left, unless a drain is already running."""
+        self._requested = True
+        if self._running:
+            return
+        self._running = True
+        try:
+            while self._requested:
+                self._requested = False
+                while await self.embed_pending() == self._batch_size:
+                    pass
+        except Exception:
+            # The turns stay pending and are picked up by the next drain.
+            logger.exception("Deferred embedding failed")
+        finally:
+            self._running = False
+
+    async def run_periodically(self, interval: float) -> None:
+        """Drain now, then again every ``interval`` seconds; with ``interval`` 0, drain once."""
+        while True:
+            await self.run()
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+
+@cache
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Process-wide batcher for deferred embeddings."""
+    return EmbeddingBatcher(SessionLocal, get_settings().embedding_batch_size)
+
+
+__all__ = [
+    "EMBEDDING_MODES",
+    "EmbeddingBatcher",
+    "embedding_is_deferred",
+    "get_embedding_batcher",
+]
@@ -0,0 +1,148 @@
+"""Embedding cache in front of the configured embedding provider.
+
+Repeated conversation text (greetings, boilerplate, re-sent messages) is
+embedded once. Entries are keyed by the provider's ``model_version`` and a
+SHA-256 of the normalized text, and stored as little-endian float32 bytes in
+two tiers: a bounded in-process `MemoryCache`, then Redis when ``REDIS_URL`` is
+configured so replicas share what any of them computed. A batch reads the
+shared tier with one ``MGET`` and writes back what it computed with one
+pipeline. Hits, misses and LRU evictions are exported as Prometheus counters on
+the ``/metrics`` endpoint.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import unicodedata
+from collections.abc import Sequence
+from functools import cache
+
+import numpy as np
+from common.embeddings import EmbeddingProvider, get_embedder
+from numpy.typing import NDArray
+from prometheus_client import Counter
+
+from app.cache import Cache, MemoryCache, RedisCache
+from app.config import Settings
+
+_VECTOR_DTYPE = np.dtype("<f4")
+
+EMBEDDING_CACHE_HITS = Counter(
+    "embedding_cache_hits_total",
+    "Embeddings served from the cache, by tier.",
+    ["tier"],
+)
+EMBEDDING_CACHE_MISSES = Counter(
+    "embedding_cache_misses_total",
+    "Texts that had to be embedded because no tier held them.",
+)
+EMBEDDING_CACHE_EVICTIONS = Counter(
+    "embedding_cache_evictions_total",
+    "Embeddings dropped from the in-process cache to stay within capacity.",
+)
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of ``text`` for cache keys: NFC with whitespace runs collapsed."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class CachedEmbedder:
+    """`EmbeddingProvider` that consults the cache tiers before embedding.
+
+    Texts are embedded in their normalized form, so a cached vector is exactly
+    what the provider would return for any text that maps to the same key.
+    Within a batch each distinct text is embedded at most once.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        memory: MemoryCache,
+        shared: Cache | None = None,
+        ttl: float = 7 * 24 * 3600.0,
+    ) -> None:
+        self._provider = provider
+        self._memory = memory
+        self._shared = shared
+        self._ttl = ttl
+
+    @property
+    def dimension(self) -> int:
+        return self._provider.dimension
+
+    @property
+    def model_version(self) -> str:
+        return self._provider.model_version
+
+    def _key(self, normalized: str) -> str:
+        digest = hashlib.sha256(normalized.encode()).hexdigest()
+        return f"embedding:{self._provider.model_version}:{digest}"
+
+    def _decode(self, value: bytes | None) -> NDArray[np.float32] | None:
+        # A value of the wrong size was written for another dimension; treat it as a miss.
+        if value is None or len(value) != self.dimension * _VECTOR_DTYPE.itemsize:
+            return None
+        return np.frombuffer(value, dtype=_VECTOR_DTYPE).astype(np.float32)
+
+    def embed(self, texts: Sequence[str]) -> NDArray[np.float32]:
+        vectors = np.empty((len(texts), self.dimension), dtype=np.float32)
+        # Each distinct key with its normalized text and the rows it fills.
+        pending: dict[str, tuple[str, list[int]]] = {}
+        for index, text in enumerate(texts):
+            normalized = normalize_text(text)
+            pending.setdefault(self._key(normalized), (normalized, []))[1].append(index)
+
+        for (key, (_, indices)), value in zip(list(pending.items()), self._memory.get_many(list(pending))):
+            vector = self._decode(value)
+            if vector is not None:
+                EMBEDDING_CACHE_HITS.labels(tier="memory").inc()
+                vectors[indices] = vector
+                del pending[key]
+
+        if pending and self._shared is not None:
+            for (key, (_, indices)), value in zip(list(pending.items()), self._shared.get_many(list(pending))):
+                vector = self._decode(value)
+                if vector is not None and value is not None:
+                    EMBEDDING_CACHE_HITS.labels(tier="redis").inc()
+                    self._memory.set(key, value, self._ttl)
+                    vectors[indices] = vector
+                    del pending[key]
+
+        if pending:
+            EMBEDDING_CACHE_MISSES.inc(len(pending))
+            computed = self._provider.embed([normalized for normalized, _ in pending.values()])
+            encoded: dict[str, bytes] = {}
+            for (key, (_, indices)), vector in zip(pending.items(), computed):
+                vectors[indices] = vector
+                encoded[key] = np.asarray(vector, dtype=_VECTOR_DTYPE).tobytes()
+                self._memory.set(key, encoded[key], self._ttl)
+            if self._shared is not None:
+                self._shared.set_many(encoded, self._ttl)
+        return vectors
+
+
+def _count_eviction(key: str) -> None:
+    EMBEDDING_CACHE_EVICTIONS.inc()
+
+
+@cache
+def get_cached_embedder(spec: str) -> EmbeddingProvider:
+    """Process-wide embedder for a spec, wrapped in the configured cache tiers."""
+    settings = Settings()
+    provider = get_embedder(spec)
+    if settings.embedding_cache_max_entries <= 0:
+        return provider
+    memory = MemoryCache(max_entries=settings.embedding_cache_max_entries, on_evict=_count_eviction)
+    shared = RedisCache.from_url(settings.redis_url) if settings.redis_url else None
+    return CachedEmbedder(provider, memory, shared, ttl=settings.embedding_cache_ttl_seconds)
+
+
+__all__ = [
+    "EMBEDDING_CACHE_EVICTIONS",
+    "EMBEDDING_CACHE_HITS",
+    "EMBEDDING_CACHE_MISSES",
+    "CachedEmbedder",
+    "get_cached_embedder",
+    "normalize_text",
+]
@@ -1,26 +1,64 @@
 """Application entrypoint for the ai-pm API service."""
 
-from fastapi import FastAPI
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_fastapi_instrumentator import PrometheusFastApiInstrumentator
 
 from app.api import api_router
-from app.config import Settings
+from app.api.dependencies.pagination import NEXT_CURSOR_HEADER
+from app.api.v1.intake import IDEMPOTENT_REPLAY_HEADER
+from app.config import Settings, get_settings
+from app.db.replicas import CONSISTENCY_TOKEN_HEADER, consistency_token
+from app.embedding_batcher import embedding_is_deferred, get_embedding_batcher
 from app.telemetry.otel import configure_telemetry
-from prometheus_fastapi_instrumentator import PrometheusFastApiInstrumentator
+from app.telemetry.sql import SQLStatsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    """In deferred embedding mode, drain pending turns in the background while the app runs."""
+    settings = get_settings()
+    if not embedding_is_deferred(settings):
+        yield
+        return
+    drain = asyncio.create_task(get_embedding_batcher().run_periodically(settings.embedding_drain_interval_seconds))
+    try:
+        yield
+    finally:
+        drain.cancel()
+        with suppress(asyncio.CancelledError):
+            await drain
 
 
 def create_app() -> FastAPI:
     """Create and configure a FastAPI application instance."""
     settings = Settings()
-    application = FastAPI(title="ai-pm API", version="0.1.0")
+    application = FastAPI(title="ai-pm API", version="0.1.0", lifespan=lifespan)
 
     application.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_allow_origins,
         allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
         allow_headers=["*"],
+        expose_headers=["Link", NEXT_CURSOR_HEADER, IDEMPOTENT_REPLAY_HEADER, CONSISTENCY_TOKEN_HEADER],
     )
 
+    if settings.database_replica_urls:
+
+        @application.middleware("http")
+        async def issue_consistency_token(request: Request, call_next) -> Response:
+            """Let clients pin their next reads to the primary after a successful write."""
+            response = await call_next(request)
+            if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+                response.headers[CONSISTENCY_TOKEN_HEADER] = consistency_token()
+            return response
+
+    # Added before telemetry so the request span is current when query totals are attached to it.
+    application.add_middleware(SQLStatsMiddleware)
     configure_telemetry(application, settings)
     PrometheusFastApiInstrumentator().instrument(application).expose(application)
 
@@ -1,5 +1,6 @@
 """Telemetry helpers."""
 
 from app.telemetry.otel import configure_telemetry
+from app.telemetry.sql import SQLStatsMiddleware, track_queries
 
-__all__ = ["configure_telemetry"]
+__all__ = ["SQLStatsMiddleware", "configure_telemetry", "track_queries"]
@@ -0,0 +1,200 @@
+"""Slow-query log with sampled EXPLAIN capture.
+
+When a request takes longer than ``SLOW_REQUEST_SECONDS``, `SQLStatsMiddleware`
+hands its slowest statements to `record_slow_request`. They are logged with
+the shape of their bound parameters (types and lengths, never values) and kept
+in a bounded in-memory log served by the admin slow-query endpoint.
+
+A ``SLOW_QUERY_EXPLAIN_RATE`` fraction of slow PostgreSQL SELECTs is re-run
+with ``EXPLAIN (ANALYZE, BUFFERS)`` on a single background thread, against the
+engine that ran the statement (a replica for routed reads; the primary's sync
+engine for statements of the async engine, whose sync facade only runs inside
+greenlets), inside a
+transaction that is rolled back and bounded by `EXPLAIN_TIMEOUT_MS`. The plan
+is attached to the log entry once it is ready. Only the statements being
+explained keep their parameter values, and only until the plan is captured.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import cache
+from typing import Any
+
+from sqlalchemy.engine import Engine
+
+from app.config import Settings, get_settings
+from app.db.base import engine as primary_engine
+
+logger = logging.getLogger(__name__)
+
+SLOW_STATEMENTS_PER_REQUEST = 5
+EXPLAIN_TIMEOUT_MS = 10_000
+# Plans waiting for the background thread; further samples are dropped so a
+# database that is already slow is not loaded with EXPLAIN ANALYZE runs.
+MAX_PENDING_EXPLAINS = 4
+
+
+@dataclass(slots=True)
+class StatementTiming:
+    """One executed statement with what is needed to explain it later."""
+
+    statement: str
+    seconds: float
+    parameters: Any
+    executemany: bool
+    engine: Engine
+
+
+@dataclass(slots=True)
+class SlowQuery:
+    """Entry of the slow-query log."""
+
+    recorded_at: datetime
+    route: str
+    request_seconds: float
+    statement: str
+    seconds: float
+    parameters: Any
+    plan: Any | None = None
+    explain_error: str | None = None
+
+
+@dataclass(slots=True)
+class SlowQueryLog:
+    """Most recent slow statements, oldest dropped first."""
+
+    size: int
+    entries: deque[SlowQuery] = field(init=False)
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        self.entries = deque(maxlen=max(self.size, 0))
+
+    def append(self, entry: SlowQuery) -> None:
+        with self._lock:
+            self.entries.append(entry)
+
+    def recent(self, limit: int) -> list[SlowQuery]:
+        """Up to ``limit`` entries, newest first."""
+        with self._lock:
+            return list(reversed(self.entries))[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+
+@cache
+def get_slow_query_log() -> SlowQueryLog:
+    return SlowQueryLog(Settings().slow_query_log_size)
+
+
+_explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+_pending = threading.BoundedSemaphore(MAX_PENDING_EXPLAINS)
+
+
+def _value_shape(value: Any) -> str:
+    if value is None:
+        return "null"
+    name = type(value).__name__
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"{name}[{len(value)}]"
+    shape = getattr(value, "shape", None)
+    if shape is not None:
+        return f"{name}{list(shape)}"
+    return name
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Types and lengths of bound parameters, without their values."""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "first": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: _value_shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_value_shape(value) for value in parameters]
+    return _value_shape(parameters)
+
+
+def _explainable(timing: StatementTiming) -> bool:
+    if timing.executemany or timing.engine.dialect.name != "postgresql":
+        return False
+    # ANALYZE executes the statement, so anything that could write is never explained.
+    text = timing.statement.lstrip().upper()
+    if text.startswith("SELECT"):
+        return True
+    return text.startswith("WITH") and not any(verb in text for verb in ("INSERT ", "UPDATE ", "DELETE "))
+
+
+def _explain_engine(engine: Engine) -> Engine:
+    # The async engine only has a primary, which the sync engine also points at.
+    return primary_engine if engine.dialect.is_async else engine
+
+
+def _explain(entry: SlowQuery, timing: StatementTiming) -> None:
+    try:
+        with _explain_engine(timing.engine).connect() as connection, connection.begin() as transaction:
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+            entry.plan = connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {timing.statement}", timing.parameters
+            ).scalar()
+            transaction.rollback()
+    except Exception as error:  # noqa: BLE001 - a failed EXPLAIN must not surface anywhere else
+        entry.explain_error = f"{type(error).__name__}: {error}"
+        logger.info("EXPLAIN of slow statement failed: %s", entry.explain_error)
+    finally:
+        _pending.release()
+
+
+def _schedule_explain(entry: SlowQuery, timing: StatementTiming) -> None:
+    if not _pending.acquire(blocking=False):
+        return
+    try:
+        _explain_executor.submit(_explain, entry, timing)
+    except RuntimeError:
+        # The executor is shut down at interpreter exit.
+        _pending.release()
+
+
+def record_slow_request(
+    route: str, request_seconds: float, db_seconds: float, statements: list[StatementTiming]
+) -> None:
+    """Log the slowest statements of a slow request and sample some for EXPLAIN."""
+    settings = get_settings()
+    log = get_slow_query_log()
+    now = datetime.now(UTC)
+    lines = []
+    for timing in statements:
+        shape = parameter_shape(timing.parameters, timing.executemany)
+        lines.append(f"  {timing.seconds * 1000:.1f} ms params={shape}: {timing.statement}")
+        entry = SlowQuery(now, route, request_seconds, timing.statement, timing.seconds, shape)
+        log.append(entry)
+        if _explainable(timing) and random.random() < settings.slow_query_explain_rate:
+            _schedule_explain(entry, timing)
+    logger.warning(
+        "Slow request %s took %.3fs (%.3fs in the database); slowest statements:\n%s",
+        route,
+        request_seconds,
+        db_seconds,
+        "\n".join(lines),
+    )
+
+
+__all__ = [
+    "EXPLAIN_TIMEOUT_MS",
+    "SLOW_STATEMENTS_PER_REQUEST",
+    "SlowQuery",
+    "SlowQueryLog",
+    "StatementTiming",
+    "get_slow_query_log",
+    "parameter_shape",
+    "record_slow_request",
+]
@@ -0,0 +1,242 @@
+"""Per-request SQL statistics and query guards.
+
+Engine events count every statement executed while a request is in flight,
+with the time spent in the database and the rows the driver reported
+(``cursor.rowcount``; drivers report -1 for streamed results, counted as 0).
+`SQLStatsMiddleware` attaches the totals to the request's OpenTelemetry span
+and records them in Prometheus histograms labeled by route template.
+
+``SQL_GUARD_MODE`` turns on checks meant for development and tests. A request
+running more than ``SQL_QUERY_BUDGET`` statements, or the same statement text
+more than ``SQL_REPEAT_THRESHOLD`` times (the shape of an N+1 loop), is logged
+in ``warn`` mode and fails with `QueryGuardError` in ``raise`` mode. The error
+is raised from the offending statement, so the test that triggered it fails
+with a traceback into the handler.
+
+Requests slower than ``SLOW_REQUEST_SECONDS`` pass their slowest statements to
+the slow-query log in `app.telemetry.slow_queries`.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+from collections import Counter as StatementCounter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from opentelemetry import trace
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import Settings
+from app.telemetry.slow_queries import (
+    SLOW_STATEMENTS_PER_REQUEST,
+    StatementTiming,
+    record_slow_request,
+)
+
+logger = logging.getLogger(__name__)
+
+SQL_GUARD_MODES = ("off", "warn", "raise")
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL statements per request.",
+    ["route"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_ROWS_PER_REQUEST = Histogram(
+    "db_rows_per_request",
+    "Rows returned or affected by SQL statements per request, as reported by the driver.",
+    ["route"],
+    buckets=(0, 1, 10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000),
+)
+
+_STARTED = "sql_stats_started"
+
+
+class QueryGuardError(RuntimeError):
+    """Raised in ``SQL_GUARD_MODE=raise`` when a request breaks its query budget."""
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Statements run on behalf of one request and the guard limits applied to them."""
+
+    guard_mode: str = "off"
+    budget: int = 0
+    repeat_threshold: int = 0
+    keep_slowest: int = 0
+    count: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    statements: StatementCounter[str] = field(default_factory=StatementCounter)
+    flagged: set[str] = field(default_factory=set)
+    # Min-heap of (seconds, sequence, timing) holding the ``keep_slowest`` slowest statements.
+    _slowest: list[tuple[float, int, StatementTiming]] = field(default_factory=list)
+
+    def record(self, statement: str, seconds: float, rows: int) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.rows += max(rows, 0)
+        self.statements[statement] += 1
+        if self.guard_mode != "off":
+            self._check(statement)
+
+    def is_among_slowest(self, seconds: float) -> bool:
+        if len(self._slowest) < self.keep_slowest:
+            return True
+        return bool(self._slowest) and seconds > self._slowest[0][0]
+
+    def keep_slow(self, timing: StatementTiming) -> None:
+        item = (timing.seconds, self.count, timing)
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, item)
+        else:
+            heapq.heapreplace(self._slowest, item)
+
+    def slowest(self) -> list[StatementTiming]:
+        """The kept statements, slowest first."""
+        return [timing for _, _, timing in sorted(self._slowest, reverse=True)]
+
+    def _check(self, statement: str) -> None:
+        problems = []
+        if self.budget and self.count > self.budget and "budget" not in self.flagged:
+            self.flagged.add("budget")
+            problems.append(f"{self.count} statements exceed the budget of {self.budget}")
+        repeats = self.statements[statement]
+        if self.repeat_threshold and repeats > self.repeat_threshold and statement not in self.flagged:
+            self.flagged.add(statement)
+            problems.append(f"statement repeated {repeats} times (possible N+1): {statement}")
+        for problem in problems:
+            if self.guard_mode == "raise":
+                raise QueryGuardError(problem)
+            logger.warning("SQL guard: %s", problem)
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("sql_query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    """Statistics of the request being handled, if any."""
+    return _current.get()
+
+
+def _new_stats(settings: Settings) -> QueryStats:
+    if settings.sql_guard_mode not in SQL_GUARD_MODES:
+        raise ValueError(f"Unknown SQL guard mode {settings.sql_guard_mode!r}; expected one of {SQL_GUARD_MODES}")
+    return QueryStats(
+        guard_mode=settings.sql_guard_mode,
+        budget=settings.sql_query_budget,
+        repeat_threshold=settings.sql_repeat_threshold,
+        keep_slowest=SLOW_STATEMENTS_PER_REQUEST if settings.slow_request_seconds > 0 else 0,
+    )
+
+
+@contextmanager
+def track_queries(budget: int = 0, repeat_threshold: int = 0) -> Iterator[QueryStats]:
+    """Collect statement statistics for a block, raising `QueryGuardError` past the limits.
+
+    Requests served in-process inside the block (through an ASGI test client)
+    count towards it, so tests can give a route a query budget.
+    """
+    stats = QueryStats(guard_mode="raise", budget=budget, repeat_threshold=repeat_threshold)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault(_STARTED, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    stats = _current.get()
+    started = conn.info.get(_STARTED)
+    if stats is None or not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+    stats.record(statement, seconds, cursor.rowcount)
+    if stats.keep_slowest and stats.is_among_slowest(seconds):
+        stats.keep_slow(StatementTiming(statement, seconds, parameters, executemany, conn.engine))
+
+
+class SQLStatsMiddleware:
+    """Collects `QueryStats` per HTTP request and reports them per route."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._settings = Settings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if _current.get() is not None:
+            # Inside `track_queries` (tests calling the app in-process): count into the caller's stats.
+            await self.app(scope, receive, send)
+            return
+
+        stats = _new_stats(self._settings)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            self._report(scope, stats, time.perf_counter() - started)
+
+    def _report(self, scope: Scope, stats: QueryStats, elapsed: float) -> None:
+        route = scope.get("route")
+        # Unmatched paths share one label so arbitrary URLs cannot grow the label set.
+        label = getattr(route, "path", None) or "unmatched"
+        threshold = self._settings.slow_request_seconds
+        if threshold > 0 and elapsed >= threshold and stats.count:
+            record_slow_request(label, elapsed, stats.seconds, stats.slowest())
+        DB_QUERIES_PER_REQUEST.labels(route=label).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(route=label).observe(stats.seconds)
+        DB_ROWS_PER_REQUEST.labels(route=label).observe(stats.rows)
+
+        span = trace.get_current_span()
+        if span.is_recording():
+            span.set_attribute("db.query_count", stats.count)
+            span.set_attribute("db.time_ms", round(stats.seconds * 1000, 3))
+            span.set_attribute("db.rows", stats.rows)
+            repeated = max(stats.statements.values(), default=0)
+            span.set_attribute("db.max_statement_repeats", repeated)
+
+
+__all__ = [
+    "DB_QUERIES_PER_REQUEST",
+    "DB_ROWS_PER_REQUEST",
+    "DB_TIME_PER_REQUEST",
+    "SQL_GUARD_MODES",
+    "QueryGuardError",
+    "QueryStats",
+    "SQLStatsMiddleware",
+    "current_query_stats",
+    "track_queries",
+]
@@ -0,0 +1,35 @@
+"""Temporal client used to hand long-running work to the worker service."""
+
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import HTTPException, status
+from temporalio.client import Client
+
+from app.config import Settings
+
+_client: Client | None = None
+_client_lock = asyncio.Lock()
+
+
+async def get_temporal_client() -> Client:
+    """Return a process-wide Temporal client, connecting on first use."""
+    global _client
+    if _client is not None:
+        return _client
+
+    async with _client_lock:
+        if _client is None:
+            settings = Settings()
+            try:
+                _client = await Client.connect(settings.temporal_host, namespace=settings.temporal_namespace)
+            except RuntimeError as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Background processing is unavailable",
+                ) from exc
+    return _client
+
+
+__all__ = ["get_temporal_client"]
@@ -0,0 +1,5 @@
+"""Performance benchmarks for the API service.
+
+Each module is runnable with ``python -m benchmarks.<name>`` from the service
+root and targets the database configured through ``DATABASE_URL``.
+"""
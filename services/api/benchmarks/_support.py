@@ -0,0 +1,74 @@
+"""Shared helpers for benchmark scripts."""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
+from common.embeddings import EMBEDDING_DIMENSION
+from numpy.typing import NDArray
+
+from app.db.base import SessionLocal, engine
+from app.db.models import Base, Organization, Persona, PersonaRole, Project
+
+
+@dataclass(slots=True)
+class SeededProject:
+    """Identifiers of the project and persona a benchmark writes into."""
+
+    organization_id: int
+    project_id: int
+    persona_id: uuid.UUID
+
+
+class ClusteredCorpus:
+    """Clustered unit vectors; turns and queries are drawn from the same centres."""
+
+    def __init__(self, clusters: int = 2_000, spread: float = 0.35, seed: int = 13) -> None:
+        self._rng = np.random.default_rng(seed)
+        self._centres = self._normalized(self._rng.standard_normal((clusters, EMBEDDING_DIMENSION)))
+        self._spread = spread
+
+    @staticmethod
+    def _normalized(vectors: NDArray[np.float64]) -> NDArray[np.float32]:
+        return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+    def sample(self, count: int) -> NDArray[np.float32]:
+        centres = self._centres[self._rng.integers(len(self._centres), size=count)]
+        noise = self._rng.standard_normal((count, EMBEDDING_DIMENSION)) * self._spread / np.sqrt(EMBEDDING_DIMENSION)
+        return self._normalized(centres + noise)
+
+
+def ensure_schema() -> None:
+    """Create tables on throwaway SQLite databases; other backends must be migrated."""
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(bind=engine)
+
+
+def seed_project(label: str) -> SeededProject:
+    """Create an organization, project and persona dedicated to one benchmark run."""
+    with SessionLocal() as session:
+        organization = Organization(name=f"bench-{label}-{uuid.uuid4().hex[:8]}")
+        session.add(organization)
+        session.flush()
+        project = Project(name=f"bench {label}", organization_id=organization.id)
+        session.add(project)
+        session.flush()
+        persona = Persona(project_id=project.id, role=PersonaRole.CLIENT, display_name="Benchmark")
+        session.add(persona)
+        session.commit()
+        return SeededProject(organization.id, project.id, persona.id)
+
+
+@contextmanager
+def timed(results: dict[str, float], key: str) -> Iterator[None]:
+    """Record the wall-clock duration of the block in seconds."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        results[key] = time.perf_counter() - started
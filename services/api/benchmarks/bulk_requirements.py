@@ -0,0 +1,63 @@
+"""Compare per-row requirement creation with the bulk endpoint.
+
+Usage: ``python -m benchmarks.bulk_requirements [--rows 10000] [--single-rows 500]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from httpx import ASGITransport, AsyncClient
+
+from app.db.models import RequirementType
+from app.main import app
+from benchmarks._support import SeededProject, ensure_schema, seed_project, timed
+
+
+def _items(seeded: SeededProject, count: int) -> list[dict[str, object]]:
+    return [
+        {
+            "project_id": seeded.project_id,
+            "persona_id": str(seeded.persona_id),
+            "text": f"Imported requirement {index}",
+            "type": RequirementType.FEATURE.value,
+        }
+        for index in range(count)
+    ]
+
+
+async def _run(rows: int, single_rows: int) -> None:
+    ensure_schema()
+    results: dict[str, float] = {}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        seeded = seed_project("single")
+        with timed(results, "single"):
+            for item in _items(seeded, single_rows):
+                response = await client.post("/v1/requirements", json=item)
+                response.raise_for_status()
+
+        seeded = seed_project("bulk")
+        with timed(results, "bulk"):
+            response = await client.post("/v1/requirements/bulk", json={"items": _items(seeded, rows)})
+            response.raise_for_status()
+        assert len(response.json()["created"]) == rows
+
+    single_rate = single_rows / results["single"]
+    bulk_rate = rows / results["bulk"]
+    print(f"single POST : {single_rows:>6} rows in {results['single']:.3f}s ({single_rate:,.0f} rows/s)")
+    print(f"bulk POST   : {rows:>6} rows in {results['bulk']:.3f}s ({bulk_rate:,.0f} rows/s)")
+    print(f"speedup     : {bulk_rate / single_rate:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--single-rows", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(_run(args.rows, args.single_rows))
+
+
+if __name__ == "__main__":
+    main()
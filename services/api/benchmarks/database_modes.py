@@ -0,0 +1,129 @@
+"""Latency and throughput of sync versus async route handlers under load.
+
+Usage: ``python -m benchmarks.database_modes [--connections 500] [--duration 30]
+[--requirements 200] [--port 8765]``
+
+Starts ``uvicorn app.main:app`` once per ``DATABASE_MODE`` and keeps
+``--connections`` clients busy reading a requirements page and a project's
+detail view for ``--duration`` seconds. Reports p50/p99 latency and requests
+per second; with every connection busy the request rate is the server's
+maximum for that mode. Point ``DATABASE_URL`` at PostgreSQL for meaningful
+numbers: SQLite serializes writers and has no async driver worth comparing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.db.base import SessionLocal
+from app.db.models import Requirement, RequirementType
+from benchmarks._support import SeededProject, ensure_schema, seed_project
+
+_MODES = ("sync", "async")
+
+
+def _seed(requirements: int) -> SeededProject:
+    ensure_schema()
+    seeded = seed_project("modes")
+    with SessionLocal() as session:
+        session.add_all(
+            Requirement(
+                project_id=seeded.project_id,
+                persona_id=seeded.persona_id,
+                text=f"Requirement {index}",
+                type=RequirementType.FEATURE,
+            )
+            for index in range(requirements)
+        )
+        session.commit()
+    return seeded
+
+
+def _start_server(mode: str, port: int) -> subprocess.Popen[bytes]:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "DATABASE_MODE": mode},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/healthz").raise_for_status()
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"uvicorn did not start in {mode} mode")
+
+
+async def _load(port: int, seeded: SeededProject, connections: int, duration: float) -> tuple[list[float], int]:
+    paths = [
+        f"/v1/requirements?project_id={seeded.project_id}&limit=50",
+        f"/v1/projects/{seeded.project_id}",
+    ]
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+
+        async def worker(offset: int) -> None:
+            nonlocal errors
+            request = offset
+            while time.monotonic() < stop_at:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[request % len(paths)])
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+                request += 1
+
+        await asyncio.gather(*(worker(offset) for offset in range(connections)))
+    return latencies, errors
+
+
+def _percentile(values: list[float], percentile: int) -> float:
+    return statistics.quantiles(values, n=100)[percentile - 1] if len(values) > 1 else values[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--requirements", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    seeded = _seed(args.requirements)
+    print(f"{args.connections} connections for {args.duration:.0f}s per mode")
+    for mode in _MODES:
+        server = _start_server(mode, args.port)
+        try:
+            latencies, errors = asyncio.run(_load(args.port, seeded, args.connections, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+        if not latencies:
+            print(f"  {mode:<6} every request failed ({errors} errors)")
+            continue
+        print(
+            f"  {mode:<6} p50 {_percentile(latencies, 50) * 1000:8.1f} ms"
+            f"  p99 {_percentile(latencies, 99) * 1000:8.1f} ms"
+            f"  {len(latencies) / args.duration:9,.0f} req/s"
+            f"  {errors} errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
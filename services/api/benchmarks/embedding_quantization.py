@@ -0,0 +1,103 @@
+"""Index memory and recall@k of float32, half and int8 embedding storage.
+
+Usage: ``python -m benchmarks.embedding_quantization [--sizes 100000 1000000]
+[--queries 200] [--k 10] [--rerank-factors 1 2 4 8]``
+
+Builds a `LocalVectorIndex` in each storage mode from the same clustered unit
+vectors and reports the index size scaled to a million turns, the p50 search
+latency, and recall@k against an exact float32 scan. A re-rank factor of 1
+is the reduced-precision ranking on its own; larger factors re-rank that many
+times ``k`` candidates at full precision, as `LocalIndexBackend` does with
+``VECTOR_RERANK_FACTOR``. Needs no database.
+
+For PostgreSQL, a ``vector(384)`` value takes 4 * 384 + 8 bytes and a
+``halfvec(384)`` 2 * 384 + 8, so the halfvec HNSW index is roughly half the
+size of the float32 one; its recall matches the ``half`` rows below.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+from common.embeddings import EMBEDDING_DIMENSION
+from numpy.typing import NDArray
+
+from app.db.vector_index import STORAGE_DTYPES, LocalVectorIndex
+from app.db.vector_search import cosine_top_k
+from benchmarks._support import ClusteredCorpus
+
+_BUILD_CHUNK_ROWS = 50_000
+_PROJECT_ID = 1
+
+
+def _build(directory: Path, storage: str, ids: list[uuid.UUID], vectors: NDArray[np.float32]) -> LocalVectorIndex:
+    index = LocalVectorIndex(directory, EMBEDDING_DIMENSION, storage)
+    index.rebuild(
+        _PROJECT_ID,
+        (
+            (ids[start : start + _BUILD_CHUNK_ROWS], vectors[start : start + _BUILD_CHUNK_ROWS])
+            for start in range(0, len(ids), _BUILD_CHUNK_ROWS)
+        ),
+    )
+    return index
+
+
+def _index_bytes(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.rglob("*") if path.suffix in (".vectors", ".scales", ".ids"))
+
+
+def _run(size: int, query_count: int, k: int, rerank_factors: list[int]) -> None:
+    corpus = ClusteredCorpus()
+    vectors = corpus.sample(size)
+    queries = corpus.sample(query_count)
+    ids = [uuid.uuid4() for _ in range(size)]
+    row_of = {turn_id: row for row, turn_id in enumerate(ids)}
+    truth = [set(cosine_top_k(vectors, query, k)[0].tolist()) for query in queries]
+
+    print(f"{size:,} turns, {query_count} queries, k={k}")
+    for storage in STORAGE_DTYPES:
+        with tempfile.TemporaryDirectory() as directory:
+            index = _build(Path(directory), storage, ids, vectors)
+            mib_per_million = _index_bytes(Path(directory)) / size * 1_000_000 / 2**20
+            for factor in rerank_factors:
+                if index.exact and factor > 1:
+                    continue
+                latencies: list[float] = []
+                recalls: list[float] = []
+                for query, expected in zip(queries, truth):
+                    started = time.perf_counter()
+                    candidates = [row_of[turn_id] for turn_id, _ in index.search(_PROJECT_ID, query, k * factor)]
+                    if factor > 1:
+                        # Full-precision re-rank, standing in for the embeddings loaded from the database.
+                        nearest, _ = cosine_top_k(vectors[candidates], query, k)
+                        candidates = [candidates[position] for position in nearest.tolist()]
+                    latencies.append(time.perf_counter() - started)
+                    recalls.append(len(expected.intersection(candidates[:k])) / k)
+                label = storage if factor == 1 else f"{storage} x{factor}"
+                print(
+                    f"  {label:<12} {mib_per_million:>8.1f} MiB/1M turns"
+                    f"  p50 {statistics.median(latencies) * 1000:>7.2f} ms"
+                    f"  recall@k {statistics.fmean(recalls):.3f}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rerank-factors", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        _run(size, args.queries, args.k, args.rerank_factors)
+
+
+if __name__ == "__main__":
+    main()
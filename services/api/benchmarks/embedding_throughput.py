@@ -0,0 +1,46 @@
+"""Throughput of the configured embedding provider at several batch sizes.
+
+Usage: ``python -m benchmarks.embedding_throughput [--texts 50000] [--batch-sizes 1 32 256 2048]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from common.embeddings import get_embedder
+
+from app.config import Settings
+
+
+def _texts(count: int, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(20_000)]
+    # Conversation turns are a sentence or two: 8-40 words.
+    return [" ".join(rng.choices(vocabulary, k=rng.randint(8, 40))) for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=50_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256, 2048])
+    args = parser.parse_args()
+
+    spec = Settings().embedding_provider
+    embedder = get_embedder(spec)
+    texts = _texts(args.texts)
+    embedder.embed(texts[:256])  # warm-up
+
+    print(f"provider {spec!r} ({embedder.model_version}), {len(texts):,} texts")
+    for batch_size in args.batch_sizes:
+        started = time.perf_counter()
+        for start in range(0, len(texts), batch_size):
+            embedder.embed(texts[start : start + batch_size])
+        elapsed = time.perf_counter() - started
+        print(f"batch {batch_size:>6} : {len(texts) / elapsed:>10,.0f} embeddings/s ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Throughput of the configured requirement classifier at several batch sizes.
+
+Usage: ``python -m benchmarks.extractor_throughput [--segments 100000] [--batch-sizes 1 64 1024 8192]``
+
+Segments are synthetic sentences mixing classifier keywords with a large random
+vocabulary, so token hashing is not served entirely from cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from common.extraction import get_classifier
+
+from app.config import Settings
+
+_TEMPLATES = (
+    "Add {a} support to the {b} {c} screen",
+    "The {a} page crashes when {b} exports {c} reports",
+    "Make the {a} {b} workflow faster for {c} users",
+    "Customer {a} data must stay within the {b} region for {c}",
+    "Quarterly {a} review with {b} and {c}",
+)
+
+
+def _segments(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(20_000)]
+    return [
+        rng.choice(_TEMPLATES).format(a=rng.choice(vocabulary), b=rng.choice(vocabulary), c=rng.choice(vocabulary))
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=100_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1024, 8192])
+    args = parser.parse_args()
+
+    spec = Settings().intake_classifier
+    classifier = get_classifier(spec)
+    segments = _segments(args.segments)
+    classifier.classify(segments[:1_000])  # warm-up: model construction, NumPy imports
+
+    print(f"classifier {spec!r}, {len(segments):,} segments")
+    for batch_size in args.batch_sizes:
+        started = time.perf_counter()
+        for start in range(0, len(segments), batch_size):
+            classifier.classify(segments[start : start + batch_size])
+        elapsed = time.perf_counter() - started
+        print(f"batch {batch_size:>6} : {len(segments) / elapsed:>10,.0f} segments/s ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Peak resident memory of streamed intake uploads of increasing size.
+
+Usage: ``python -m benchmarks.intake_stream [--sizes 1 10 100]``
+
+Every size runs in a fresh interpreter so ``ru_maxrss`` reflects that upload
+alone. The body is generated lazily and sent chunked, so the numbers measure the
+endpoint rather than the client.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+from collections.abc import AsyncIterator
+
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from benchmarks._support import ensure_schema, seed_project, timed
+
+CHUNK_BYTES = 64 * 1024
+_LINE = "- The dashboard should let client personas export requirement {index} as CSV\n"
+
+
+def _peak_rss_mib() -> float:
+    # Linux reports kilobytes, macOS bytes.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+async def _transcript(total_bytes: int) -> AsyncIterator[bytes]:
+    sent = 0
+    index = 0
+    buffer: list[str] = []
+    size = 0
+    while sent < total_bytes:
+        line = _LINE.format(index=index)
+        index += 1
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            chunk = "".join(buffer).encode()
+            sent += len(chunk)
+            buffer, size = [], 0
+            yield chunk
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+async def _upload(megabytes: int) -> None:
+    ensure_schema()
+    seeded = seed_project(f"stream-{megabytes}mb")
+    baseline = _peak_rss_mib()
+    results: dict[str, float] = {}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        with timed(results, "upload"):
+            response = await client.post(
+                "/v1/intake/stream",
+                params={"project_id": seeded.project_id, "persona_id": str(seeded.persona_id)},
+                content=_transcript(megabytes * 2**20),
+                headers={"content-type": "text/plain; charset=utf-8"},
+            )
+            response.raise_for_status()
+
+    created = response.json()["created"]
+    print(
+        f"{megabytes:>5} MB : {created:>9,} requirements in {results['upload']:7.2f}s, "
+        f"peak RSS {_peak_rss_mib():7.1f} MiB (baseline {baseline:.1f} MiB)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="Upload sizes in MB.")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single is not None:
+        asyncio.run(_upload(args.single))
+        return
+
+    for megabytes in args.sizes:
+        subprocess.run([sys.executable, "-m", "benchmarks.intake_stream", "--single", str(megabytes)], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Exact versus HNSW similarity search latency and recall on PostgreSQL.
+
+Usage: ``DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.vector_search
+[--sizes 100000 1000000] [--queries 100] [--k 10] [--ef-search 16 40 100 200]``
+
+Run it against a throwaway, migrated database: the HNSW index on
+``conversation_turns.embedding`` is dropped while turns are bulk loaded and
+rebuilt afterwards (its build time is reported). Turns are synthetic unit
+vectors drawn around a few thousand cluster centres, which is closer to real
+embeddings than uniform noise. Recall@k is measured against an exact
+sequential scan of the same table with index scans disabled.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import statistics
+import sys
+import time
+
+import numpy as np
+from common.embeddings import EMBEDDING_DIMENSION
+from numpy.typing import NDArray
+from sqlalchemy import delete, text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+from app.db.base import SessionLocal, engine
+from app.db.models import ConversationTurn, Organization
+from app.db.vector_search import PgvectorBackend, SearchTuning
+from benchmarks._support import ClusteredCorpus, SeededProject, seed_project, timed
+
+_INDEX_NAME = "ix_conversation_turns_embedding_hnsw"
+_LOAD_CHUNK_ROWS = 50_000
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + np.zeros(2, dtype=">i4").tobytes()
+_PGCOPY_TRAILER = np.array([-1], dtype=">i2").tobytes()
+# One binary COPY tuple of (n integer, embedding vector): field count, then
+# length-prefixed fields; pgvector's binary form is dim, unused, float4[dim].
+_ROW_DTYPE = np.dtype(
+    [
+        ("fields", ">i2"),
+        ("n_length", ">i4"),
+        ("n", ">i4"),
+        ("vector_length", ">i4"),
+        ("dimension", ">i2"),
+        ("unused", ">i2"),
+        ("values", ">f4", (EMBEDDING_DIMENSION,)),
+    ]
+)
+
+
+def _copy_payload(start: int, vectors: NDArray[np.float32]) -> bytes:
+    rows = np.zeros(len(vectors), dtype=_ROW_DTYPE)
+    rows["fields"] = 2
+    rows["n_length"] = 4
+    rows["n"] = np.arange(start, start + len(vectors))
+    rows["vector_length"] = 4 + 4 * EMBEDDING_DIMENSION
+    rows["dimension"] = EMBEDDING_DIMENSION
+    rows["values"] = vectors
+    return _PGCOPY_HEADER + rows.tobytes() + _PGCOPY_TRAILER
+
+
+def _load_turns(seeded: SeededProject, corpus: ClusteredCorpus, count: int) -> None:
+    """COPY vectors into a staging table, then insert the turns in one statement."""
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"CREATE TEMPORARY TABLE bench_vectors (n integer, embedding vector({EMBEDDING_DIMENSION}))")
+        for start in range(0, count, _LOAD_CHUNK_ROWS):
+            payload = _copy_payload(start, corpus.sample(min(_LOAD_CHUNK_ROWS, count - start)))
+            cursor.copy_expert("COPY bench_vectors (n, embedding) FROM STDIN WITH (FORMAT binary)", io.BytesIO(payload))
+        cursor.execute(
+            "INSERT INTO conversation_turns (id, project_id, persona_id, text, embedding) "
+            "SELECT gen_random_uuid(), %s, %s, 'benchmark turn ' || n, embedding FROM bench_vectors",
+            (seeded.project_id, str(seeded.persona_id)),
+        )
+        cursor.execute("DROP TABLE bench_vectors")
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def _rebuild_index(maintenance_work_mem: str) -> None:
+    index = next(index for index in ConversationTurn.__table__.indexes if index.name == _INDEX_NAME)
+    with engine.begin() as connection:
+        connection.execute(text("SELECT set_config('maintenance_work_mem', :value, true)"), {"value": maintenance_work_mem})
+        connection.execute(CreateIndex(index))
+        connection.execute(text("ANALYZE conversation_turns"))
+
+
+def _drop_index() -> None:
+    index = next(index for index in ConversationTurn.__table__.indexes if index.name == _INDEX_NAME)
+    with engine.begin() as connection:
+        connection.execute(DropIndex(index, if_exists=True))
+
+
+def _exact_ids(session: Session, seeded: SeededProject, query: NDArray[np.float32], k: int) -> list[object]:
+    session.execute(text("SET LOCAL enable_indexscan = off"))
+    turns = PgvectorBackend().search(session, seeded.project_id, query, k, SearchTuning())
+    return [turn.id for turn, _ in turns]
+
+
+def _measure(
+    seeded: SeededProject,
+    queries: NDArray[np.float32],
+    k: int,
+    tuning: SearchTuning | None,
+) -> tuple[list[float], list[list[object]]]:
+    latencies: list[float] = []
+    found: list[list[object]] = []
+    for query in queries:
+        with SessionLocal() as session:
+            started = time.perf_counter()
+            if tuning is None:
+                ids = _exact_ids(session, seeded, query, k)
+            else:
+                ids = [turn.id for turn, _ in PgvectorBackend().search(session, seeded.project_id, query, k, tuning)]
+            latencies.append(time.perf_counter() - started)
+            session.rollback()
+        found.append(ids)
+    return latencies, found
+
+
+def _report(label: str, latencies: list[float], recall: float | None = None) -> None:
+    p50 = statistics.median(latencies) * 1000
+    p95 = statistics.quantiles(latencies, n=20)[-1] * 1000
+    recall_text = "" if recall is None else f"  recall@k {recall:.3f}"
+    print(f"  {label:<14} p50 {p50:>8.2f} ms  p95 {p95:>8.2f} ms{recall_text}")
+
+
+def _run(size: int, query_count: int, k: int, ef_values: list[int], maintenance_work_mem: str) -> None:
+    corpus = ClusteredCorpus()
+    seeded = seed_project(f"vector-{size}")
+    timings: dict[str, float] = {}
+    try:
+        _drop_index()
+        with timed(timings, "load"):
+            _load_turns(seeded, corpus, size)
+        with timed(timings, "index"):
+            _rebuild_index(maintenance_work_mem)
+        print(f"{size:,} turns: load {timings['load']:.1f}s, HNSW build {timings['index']:.1f}s")
+
+        queries = corpus.sample(query_count)
+        _measure(seeded, queries[:5], k, SearchTuning())  # warm the buffer cache
+        exact_latencies, truth = _measure(seeded, queries, k, None)
+        _report("exact", exact_latencies)
+        for ef_search in ef_values:
+            latencies, found = _measure(seeded, queries, k, SearchTuning(ef_search=ef_search))
+            recall = statistics.fmean(len(set(ids) & set(expected)) / k for ids, expected in zip(found, truth))
+            _report(f"ef_search={ef_search}", latencies, recall)
+    finally:
+        with SessionLocal() as session:
+            session.execute(delete(Organization).where(Organization.id == seeded.organization_id))
+            session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 40, 100, 200])
+    parser.add_argument("--maintenance-work-mem", default="1GB")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        sys.exit("vector_search needs a migrated PostgreSQL database with pgvector (set DATABASE_URL)")
+    for size in args.sizes:
+        _run(size, args.queries, args.k, args.ef_search, args.maintenance_work_mem)
+
+
+if __name__ == "__main__":
+    main()
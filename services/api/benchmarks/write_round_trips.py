@@ -0,0 +1,99 @@
+"""Database round trips and latency of the single-row write endpoints.
+
+Usage: ``python -m benchmarks.write_round_trips [--requests 200]``
+
+Sends ``--requests`` requests to each write endpoint in-process and reports
+the statements plus commits each one sends to the database (its round trips)
+and its p50/p99 latency. Run it on two revisions to compare them; point
+``DATABASE_URL`` at PostgreSQL for latencies that include network hops.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.main import app
+from app.telemetry.sql import track_queries
+from benchmarks._support import SeededProject, ensure_schema, seed_project
+
+_commits = 0
+
+
+@event.listens_for(Engine, "commit")
+def _count_commit(connection: Any) -> None:
+    global _commits
+    _commits += 1
+
+
+def _endpoints(seeded: SeededProject) -> list[tuple[str, str, Callable[[], dict[str, Any]]]]:
+    """Method, path and a body factory per endpoint; bodies vary so intake deduplication never replays."""
+    owner = {"project_id": seeded.project_id, "persona_id": str(seeded.persona_id)}
+    return [
+        ("POST", "/v1/projects", lambda: {"name": "Benchmark", "organization_id": seeded.organization_id}),
+        ("PATCH", "/v1/projects/{project_id}", lambda: {"description": uuid.uuid4().hex}),
+        ("POST", "/v1/personas", lambda: {"project_id": seeded.project_id, "role": "client", "display_name": "P"}),
+        ("PATCH", "/v1/personas/{persona_id}", lambda: {"display_name": uuid.uuid4().hex}),
+        ("POST", "/v1/requirements", lambda: {**owner, "text": "Export reports as CSV", "type": "feature"}),
+        ("PATCH", "/v1/requirements/{requirement_id}", lambda: {"confidence": 0.5}),
+        ("POST", "/v1/conversations", lambda: {**owner, "text": "We need to export reports every Monday."}),
+        ("POST", "/v1/intake/extract", lambda: {**owner, "text": f"Users must export reports. Ref {uuid.uuid4()}."}),
+    ]
+
+
+async def _run(count: int) -> None:
+    global _commits
+    ensure_schema()
+    seeded = seed_project("round-trips")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        requirement = await client.post(
+            "/v1/requirements",
+            json={"project_id": seeded.project_id, "persona_id": str(seeded.persona_id), "text": "Seed", "type": "bug"},
+        )
+        requirement.raise_for_status()
+        ids = {
+            "project_id": seeded.project_id,
+            "persona_id": seeded.persona_id,
+            "requirement_id": requirement.json()["id"],
+        }
+
+        print(f"{'endpoint':<36} {'statements':>10} {'commits':>8} {'round trips':>12} {'p50 ms':>8} {'p99 ms':>8}")
+        for method, path, body in _endpoints(seeded):
+            latencies: list[float] = []
+            statements = commits = 0
+            for _ in range(count):
+                _commits = 0
+                started = time.perf_counter()
+                with track_queries() as stats:
+                    response = await client.request(method, path.format(**ids), json=body())
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+                statements += stats.count
+                commits += _commits
+            p50 = statistics.median(latencies) * 1000
+            p99 = statistics.quantiles(latencies, n=100)[98] * 1000 if count > 1 else p50
+            print(
+                f"{method + ' ' + path:<36} {statements / count:>10.1f} {commits / count:>8.1f} "
+                f"{(statements + commits) / count:>12.1f} {p50:>8.2f} {p99:>8.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(_run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from collections.abc import Iterator
 
 import pytest
 
+from app.config import get_settings
 from app.db.base import SessionLocal, engine
 from app.db.models import Base, Organization, Persona, PersonaRole, Project, ProjectStatus
 
@@ -20,6 +21,20 @@ def prepare_database() -> Iterator[None]:
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def vector_index_dir(tmp_path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """Keep each test's local vector index files in its own directory.
+
+    Settings are re-read around every test; tests that change the environment
+    clear `get_settings` after doing so.
+    """
+    directory = str(tmp_path / "vector-index")
+    monkeypatch.setenv("VECTOR_INDEX_DIR", directory)
+    get_settings.cache_clear()
+    yield directory
+    get_settings.cache_clear()
+
+
 @pytest.fixture
 def project() -> Project:
     with SessionLocal() as session:
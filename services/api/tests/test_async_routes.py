@@ -0,0 +1,55 @@
+"""Tests for the async (DATABASE_MODE=async) variants of the v1 routes."""
+
+from __future__ import annotations
+
+import inspect
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.async_routes import async_router
+from app.api.v1 import router as v1_router
+from app.api.v1.conversations import create_conversation_turn
+from app.db.base import get_async_engine
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest_asyncio.fixture
+async def async_app():
+    application = FastAPI()
+    application.include_router(async_router(v1_router), prefix="/v1")
+    yield application
+    await get_async_engine().dispose()
+
+
+def _endpoint(application: FastAPI, path: str, method: str):
+    return next(
+        route.endpoint
+        for route in application.routes
+        if getattr(route, "path", None) == path and method in getattr(route, "methods", ())
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_routes_serve_the_same_api(async_app: FastAPI, project, persona_id) -> None:
+    assert inspect.iscoroutinefunction(_endpoint(async_app, "/v1/personas", "GET"))
+    assert _endpoint(async_app, "/v1/conversations", "POST") is create_conversation_turn
+
+    transport = ASGITransport(app=async_app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        created = await client.post(
+            "/v1/requirements",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "Export data", "type": "feature"},
+        )
+        listed = await client.get("/v1/requirements", params={"project_id": project.id, "limit": 1})
+        detail = await client.get(f"/v1/projects/{project.id}")
+        missing = await client.get("/v1/projects/999999")
+
+    assert created.status_code == 201
+    assert [item["id"] for item in listed.json()] == [created.json()["id"]]
+    assert detail.json()["requirement_counts"]["total"] == 1
+    assert [persona["id"] for persona in detail.json()["personas"]] == [str(persona_id)]
+    assert missing.status_code == 404
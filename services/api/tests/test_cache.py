@@ -0,0 +1,33 @@
+"""Tests for the shared key/value caches."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from app.cache import CACHE_ERRORS, RedisCache
+
+redis = pytest.importorskip("redis")
+
+
+class _UnavailableRedis:
+    """Client whose every command fails as if the server were down."""
+
+    def __getattr__(self, name: str) -> Any:
+        def command(*args: Any, **kwargs: Any) -> Any:
+            raise redis.ConnectionError("Connection refused")
+
+        return command
+
+
+def test_redis_errors_are_counted_and_treated_as_misses() -> None:
+    cache = RedisCache(_UnavailableRedis())
+    failed_gets = CACHE_ERRORS.labels(operation="get")._value.get()
+
+    assert cache.get("key") is None
+    cache.set("key", b"value", ttl=1.0)
+    assert cache.add("key", b"value", ttl=1.0)
+    cache.delete("key")
+
+    assert CACHE_ERRORS.labels(operation="get")._value.get() - failed_gets == 1
@@ -0,0 +1,175 @@
+"""Tests for conversation turn endpoints."""
+
+from __future__ import annotations
+
+import math
+import uuid
+
+import numpy as np
+import pytest
+from common.embeddings import EMBEDDING_DIMENSION, get_embedder
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.db.base import SessionLocal
+from app.db.models import ConversationTurn
+from app.embedding_batcher import EmbeddingBatcher
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_create_conversation_turn_stores_normalized_embedding(project, persona_id: uuid.UUID) -> None:
+    texts = ["Clients want to export reports as CSV", "Can we export the reports to CSV?", "Schedule the kickoff call"]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        created = [
+            await client.post(
+                "/v1/conversations",
+                json={"project_id": project.id, "persona_id": str(persona_id), "text": text},
+            )
+            for text in texts
+        ]
+        listed = await client.get(f"/v1/conversations?project_id={project.id}&include=embedding")
+
+    assert [response.status_code for response in created] == [201, 201, 201]
+    embeddings = [response.json()["embedding"] for response in created]
+    assert all(len(embedding) == EMBEDDING_DIMENSION for embedding in embeddings)
+    assert all(math.isclose(math.hypot(*embedding), 1.0, rel_tol=1e-5) for embedding in embeddings)
+
+    def cosine(first: list[float], second: list[float]) -> float:
+        return sum(a * b for a, b in zip(first, second))
+
+    assert cosine(embeddings[0], embeddings[1]) > cosine(embeddings[0], embeddings[2])
+    stored = {turn["id"]: turn["embedding"] for turn in listed.json()}
+    assert stored == {response.json()["id"]: response.json()["embedding"] for response in created}
+
+
+@pytest.mark.asyncio
+async def test_similar_returns_nearest_turns_first(project, persona_id: uuid.UUID) -> None:
+    texts = [
+        "Clients want to export reports as CSV",
+        "Schedule the kickoff call for Monday",
+        "The mobile app needs dark mode",
+        "Exporting reports to CSV would save the finance team hours",
+    ]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for text in texts:
+            response = await client.post(
+                "/v1/conversations",
+                json={"project_id": project.id, "persona_id": str(persona_id), "text": text},
+            )
+            assert response.status_code == 201
+
+        similar = await client.get(
+            "/v1/conversations/similar",
+            params={"project_id": project.id, "text": "export reports to CSV", "k": 2, "ef_search": 64},
+        )
+        missing = await client.get("/v1/conversations/similar", params={"project_id": 999_999, "text": "csv"})
+
+    assert similar.status_code == 200
+    results = similar.json()
+    assert {result["text"] for result in results} == {texts[0], texts[3]}
+    distances = [result["distance"] for result in results]
+    assert distances == sorted(distances)
+    assert all(0 <= distance < 1 for distance in distances)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_deferred_mode_stores_turn_before_embedding_it(
+    project, persona_id: uuid.UUID, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("EMBEDDING_MODE", "deferred")
+    get_settings.cache_clear()
+    texts = ["Clients want to export reports as CSV", "Schedule the kickoff call"]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        created = [
+            await client.post(
+                "/v1/conversations",
+                json={"project_id": project.id, "persona_id": str(persona_id), "text": text},
+            )
+            for text in texts
+        ]
+        # The in-process batcher runs as a background task once each response is sent.
+        listed = await client.get(f"/v1/conversations?project_id={project.id}&include=embedding")
+        similar = await client.get(
+            "/v1/conversations/similar", params={"project_id": project.id, "text": "export CSV", "k": 1}
+        )
+
+    assert [response.status_code for response in created] == [201, 201]
+    assert [response.json()["embedding"] for response in created] == [None, None]
+    stored = {turn["text"]: turn["embedding"] for turn in listed.json()}
+    np.testing.assert_allclose([stored[text] for text in texts], get_embedder().embed(texts), atol=1e-6)
+    assert [turn["text"] for turn in similar.json()] == [texts[0]]
+
+
+@pytest.mark.asyncio
+async def test_list_turns_supports_sparse_fieldsets(project, persona_id: uuid.UUID) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        created = await client.post(
+            "/v1/conversations",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "Export reports as CSV"},
+        )
+        default = await client.get("/v1/conversations", params={"project_id": project.id})
+        sparse = await client.get("/v1/conversations", params={"project_id": project.id, "fields": "id,text"})
+        similar = await client.get(
+            "/v1/conversations/similar",
+            params={"project_id": project.id, "text": "CSV", "fields": "text,distance", "include": "embedding"},
+        )
+        unknown = await client.get("/v1/conversations", params={"project_id": project.id, "fields": "id,secret"})
+
+    assert created.status_code == 201
+    assert default.status_code == 200
+    assert "embedding" not in default.json()[0]
+    assert default.json()[0]["text"] == "Export reports as CSV"
+    assert sparse.json() == [{"id": created.json()["id"], "text": "Export reports as CSV"}]
+    assert set(similar.json()[0]) == {"text", "distance", "embedding"}
+    assert len(similar.json()[0]["embedding"]) == EMBEDDING_DIMENSION
+    assert unknown.status_code == 400
+    assert unknown.json()["detail"] == "Unknown fields: secret"
+
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_embeds_pending_turns_in_batches(
+    project, persona_id: uuid.UUID, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    texts = [f"Requirement number {index}" for index in range(5)]
+    with SessionLocal() as session:
+        session.add_all(ConversationTurn(project_id=project.id, persona_id=persona_id, text=text) for text in texts)
+        session.commit()
+
+    batches: list[int] = []
+    batcher = EmbeddingBatcher(SessionLocal, batch_size=2)
+    embed = batcher._embed
+
+    async def record_batch(batch: list[str]) -> list[list[float]]:
+        batches.append(len(batch))
+        return await embed(batch)
+
+    monkeypatch.setattr(batcher, "_embed", record_batch)
+    await batcher.run()
+
+    assert batches == [2, 2, 1]
+    with SessionLocal() as session:
+        turns = session.scalars(select(ConversationTurn).order_by(ConversationTurn.created_at)).all()
+    assert all(turn.embedding is not None for turn in turns)
+    by_text = {turn.text: turn.embedding for turn in turns}
+    np.testing.assert_allclose([by_text[text] for text in texts], get_embedder().embed(texts), atol=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_startup_drain_embeds_turns_left_pending(project, persona_id: uuid.UUID) -> None:
+    # Turns stored before a crash or restart have no write left to schedule their embedding.
+    with SessionLocal() as session:
+        session.add(ConversationTurn(project_id=project.id, persona_id=persona_id, text="Left pending by a restart"))
+        session.commit()
+
+    await EmbeddingBatcher(SessionLocal, batch_size=2).run_periodically(0)
+
+    with SessionLocal() as session:
+        turn = session.scalars(select(ConversationTurn)).one()
+    assert turn.embedding is not None
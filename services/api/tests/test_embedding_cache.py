@@ -0,0 +1,123 @@
+"""Tests for the two-tier embedding cache."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import pytest
+from common.embeddings import HashingEmbedder
+
+from app.cache import MemoryCache, RedisCache
+from app.embedding_cache import (
+    EMBEDDING_CACHE_HITS,
+    EMBEDDING_CACHE_MISSES,
+    CachedEmbedder,
+)
+
+
+class CountingEmbedder(HashingEmbedder):
+    """Hashing embedder that records every text it is asked to embed."""
+
+    def __init__(self) -> None:
+        super().__init__(dimension=16)
+        self.calls: list[list[str]] = []
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return super().embed(texts)
+
+
+class _RecordingRedis:
+    """Dict-backed stand-in for a Redis client that records each round trip."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.values: dict[str, bytes] = {}
+        self.round_trips: list[str] = []
+        self._fail = fail
+
+    def _call(self, command: str) -> None:
+        self.round_trips.append(command)
+        if self._fail:
+            import redis
+
+            raise redis.ConnectionError("Connection refused")
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        self._call("MGET")
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> Any:
+        assert not transaction
+        client, queued = self, {}
+
+        class _Pipeline:
+            def set(self, key: str, value: bytes, px: int) -> None:
+                queued[key] = value
+
+            def execute(self) -> None:
+                client._call(f"PIPELINE SET x{len(queued)}")
+                client.values.update(queued)
+
+        return _Pipeline()
+
+
+def _value(counter, **labels) -> float:
+    return (counter.labels(**labels) if labels else counter)._value.get()
+
+
+def test_repeated_and_reformatted_text_is_embedded_once() -> None:
+    provider = CountingEmbedder()
+    embedder = CachedEmbedder(provider, MemoryCache(max_entries=10))
+    misses, memory_hits = _value(EMBEDDING_CACHE_MISSES), _value(EMBEDDING_CACHE_HITS, tier="memory")
+
+    first = embedder.embed(["Hello there", "Export reports", "hello  there\n"])
+    second = embedder.embed(["Hello   there", "Export reports"])
+
+    assert provider.calls == [["Hello there", "Export reports", "hello there"]]
+    assert first.dtype == np.float32 and first.shape == (3, 16)
+    np.testing.assert_array_equal(second, first[:2])
+    np.testing.assert_array_equal(first[0], provider.embed(["Hello there"])[0])
+    assert _value(EMBEDDING_CACHE_MISSES) - misses == 3
+    assert _value(EMBEDDING_CACHE_HITS, tier="memory") - memory_hits == 2
+
+
+def test_shared_tier_fills_memory_and_counts_evictions() -> None:
+    shared = MemoryCache(max_entries=10)
+    warm = CountingEmbedder()
+    CachedEmbedder(warm, MemoryCache(max_entries=10), shared).embed(["a b", "c d", "e f"])
+
+    provider = CountingEmbedder()
+    evicted: list[str] = []
+    embedder = CachedEmbedder(provider, MemoryCache(max_entries=2, on_evict=evicted.append), shared)
+    shared_hits = _value(EMBEDDING_CACHE_HITS, tier="redis")
+    embedder.embed(["a b", "c d", "e f", "g h"])
+
+    assert provider.calls == [["g h"]]
+    assert _value(EMBEDDING_CACHE_HITS, tier="redis") - shared_hits == 3
+    assert len(evicted) == 2
+    assert len(shared) == 4
+
+
+def test_shared_tier_is_read_and_written_once_per_batch() -> None:
+    pytest.importorskip("redis")
+    client = _RecordingRedis()
+    CachedEmbedder(CountingEmbedder(), MemoryCache(max_entries=10), RedisCache(client)).embed(["a", "b", "c"])
+
+    provider = CountingEmbedder()
+    CachedEmbedder(provider, MemoryCache(max_entries=10), RedisCache(client)).embed(["a", "b", "d"])
+
+    assert client.round_trips == ["MGET", "PIPELINE SET x3", "MGET", "PIPELINE SET x1"]
+    assert provider.calls == [["d"]]
+
+
+def test_unavailable_shared_tier_falls_back_to_the_provider() -> None:
+    pytest.importorskip("redis")
+    provider = CountingEmbedder()
+    embedder = CachedEmbedder(provider, MemoryCache(max_entries=10), RedisCache(_RecordingRedis(fail=True)))
+
+    vectors = embedder.embed(["a", "b"])
+
+    assert provider.calls == [["a", "b"]]
+    np.testing.assert_array_equal(vectors, provider.embed(["a", "b"]))
@@ -3,11 +3,21 @@
 from __future__ import annotations
 
 import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
 
 import pytest
+from common.intake import (
+    INTAKE_WORKFLOW_NAME,
+    IntakeRequest,
+    extract_requirements,
+)
 from httpx import ASGITransport, AsyncClient
+from temporalio.client import WorkflowExecutionStatus
 
-from app.db.models import RequirementType
+from app.api.v1 import intake
+from app.db.base import SessionLocal
+from app.db.models import IntakeJob, IntakeJobStatus, Requirement, RequirementType
 from app.main import app
 
 
@@ -47,4 +57,231 @@ async def test_extract_persists_requirements(project, persona_id: uuid.UUID) ->
     assert list_response.status_code == 200
     items = list_response.json()
     assert len(items) == 2
-    assert {item["persona_id"] for item in items} == {str(persona_id)}
\ No newline at end of file
+    assert {item["persona_id"] for item in items} == {str(persona_id)}
+
+class _FakeWorkflowHandle:
+    def __init__(self, client: _FakeTemporalClient, workflow_id: str) -> None:
+        self._client = client
+        self._workflow_id = workflow_id
+
+    async def describe(self) -> SimpleNamespace:
+        return SimpleNamespace(status=self._client.status)
+
+
+class _FakeTemporalClient:
+    def __init__(self) -> None:
+        self.started: dict[str, IntakeRequest] = {}
+        self.status = WorkflowExecutionStatus.RUNNING
+
+    async def start_workflow(self, workflow: str, arg: IntakeRequest, *, id: str, task_queue: str) -> None:
+        assert workflow == INTAKE_WORKFLOW_NAME
+        self.started[id] = arg
+
+    def get_workflow_handle(self, workflow_id: str) -> _FakeWorkflowHandle:
+        return _FakeWorkflowHandle(self, workflow_id)
+
+    def finish(self, workflow_id: str) -> None:
+        """Record the outcome on the job row the way the worker's final activity does."""
+        request = self.started[workflow_id]
+        assert request.job_id is not None
+        with SessionLocal() as session:
+            saved = [
+                Requirement(
+                    id=uuid.uuid4(),
+                    project_id=request.project_id,
+                    persona_id=uuid.UUID(request.persona_id),
+                    text=requirement.text,
+                    type=RequirementType(requirement.type),
+                    confidence=requirement.confidence,
+                )
+                for requirement in extract_requirements(request.text)
+            ]
+            session.add_all(saved)
+            job = session.get(IntakeJob, uuid.UUID(request.job_id))
+            assert job is not None
+            job.status = IntakeJobStatus.COMPLETED
+            job.requirement_ids = [str(requirement.id) for requirement in saved]
+            job.completed_at = datetime.now(UTC)
+            session.commit()
+        self.status = WorkflowExecutionStatus.COMPLETED
+
+
+def _stored_job_status(job_id: str) -> IntakeJobStatus:
+    with SessionLocal() as session:
+        job = session.get(IntakeJob, uuid.UUID(job_id))
+        assert job is not None
+        return job.status
+
+
+@pytest.mark.asyncio
+async def test_async_extract_queues_job_and_polls_without_writing(
+    monkeypatch: pytest.MonkeyPatch,
+    project,
+    persona_id: uuid.UUID,
+) -> None:
+    temporal = _FakeTemporalClient()
+
+    async def _get_fake_client() -> _FakeTemporalClient:
+        return temporal
+
+    monkeypatch.setattr(intake, "get_temporal_client", _get_fake_client)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post(
+            "/v1/intake/extract?mode=async",
+            json={
+                "project_id": project.id,
+                "persona_id": str(persona_id),
+                "text": "Enable offline access\nSupport automatic backups",
+            },
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "pending"
+        assert job["requirements"] == []
+        assert list(temporal.started) == [f"intake-{job['id']}"]
+        assert temporal.started[f"intake-{job['id']}"].job_id == job["id"]
+
+        resubmitted = await client.post(
+            "/v1/intake/extract?mode=async",
+            json={
+                "project_id": project.id,
+                "persona_id": str(persona_id),
+                "text": "- Enable offline access\n- Support automatic backups",
+            },
+        )
+        assert resubmitted.status_code == 202
+        assert resubmitted.headers["idempotent-replayed"] == "true"
+        assert resubmitted.json()["id"] == job["id"]
+        assert len(temporal.started) == 1
+
+        running = await client.get(f"/v1/intake/jobs/{job['id']}")
+        assert running.status_code == 200
+        assert running.json()["status"] == "pending"
+        assert _stored_job_status(job["id"]) is IntakeJobStatus.PENDING
+
+        temporal.finish(f"intake-{job['id']}")
+        completed = await client.get(f"/v1/intake/jobs/{job['id']}")
+        listed = await client.get(f"/v1/requirements?project_id={project.id}")
+        missing = await client.get(f"/v1/intake/jobs/{uuid.uuid4()}")
+
+    assert completed.status_code == 200
+    body = completed.json()
+    assert body["status"] == "completed"
+    assert body["completed_at"] is not None
+    assert {item["text"] for item in body["requirements"]} == {
+        "Enable offline access",
+        "Support automatic backups",
+    }
+    assert len(listed.json()) == 2
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_intake_job_reports_a_workflow_that_ended_without_an_outcome(
+    monkeypatch: pytest.MonkeyPatch,
+    project,
+    persona_id: uuid.UUID,
+) -> None:
+    temporal = _FakeTemporalClient()
+
+    async def _get_fake_client() -> _FakeTemporalClient:
+        return temporal
+
+    monkeypatch.setattr(intake, "get_temporal_client", _get_fake_client)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post(
+            "/v1/intake/extract?mode=async",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "Enable offline access"},
+        )
+        job = response.json()
+        temporal.status = WorkflowExecutionStatus.TERMINATED
+        polled = await client.get(f"/v1/intake/jobs/{job['id']}")
+
+    assert polled.status_code == 200
+    assert (polled.json()["status"], polled.json()["error"]) == ("failed", "Workflow terminated")
+    assert _stored_job_status(job["id"]) is IntakeJobStatus.PENDING
+
+
+@pytest.mark.asyncio
+async def test_extract_replays_duplicate_submissions(project, persona_id: uuid.UUID) -> None:
+    body = {"project_id": project.id, "persona_id": str(persona_id), "text": "Enable offline access\nSSO login"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        first = await client.post("/v1/intake/extract", json=body)
+        retried = await client.post("/v1/intake/extract", json=body)
+        repasted = await client.post(
+            "/v1/intake/extract",
+            json={**body, "text": "  - Enable   offline access\r\n\n• SSO login  "},
+        )
+        listed = await client.get(f"/v1/requirements?project_id={project.id}")
+
+    assert first.status_code == 201
+    assert "idempotent-replayed" not in first.headers
+    for replay in (retried, repasted):
+        assert replay.status_code == 201
+        assert replay.headers["idempotent-replayed"] == "true"
+        assert replay.json() == first.json()
+    assert len(listed.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_upload_segments_across_chunks_and_batches(
+    monkeypatch: pytest.MonkeyPatch,
+    project,
+    persona_id: uuid.UUID,
+) -> None:
+    monkeypatch.setattr(intake, "STREAM_BATCH_SIZE", 2)
+
+    async def _body():
+        for chunk in ["- Export to C", "SV\r\n\n• Dark m", "ode\nSSO login\nAudit ", "trail"]:
+            yield chunk.encode()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post(
+            f"/v1/intake/stream?project_id={project.id}&persona_id={persona_id}",
+            content=_body(),
+            headers={"content-type": "text/plain; charset=utf-8"},
+        )
+        listed = await client.get(f"/v1/requirements?project_id={project.id}")
+        stats = await client.get(f"/v1/projects/{project.id}")
+        rejected = await client.post(
+            f"/v1/intake/stream?project_id={project.id}&persona_id={persona_id}",
+            json={"text": "not plain text"},
+        )
+
+    assert response.status_code == 201
+    assert response.json() == {"created": 4}
+    assert {item["text"] for item in listed.json()} == {"Export to CSV", "Dark mode", "SSO login", "Audit trail"}
+    assert stats.json()["requirement_counts"] == {"total": 4, "by_type": {"feature": 4}}
+    assert rejected.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_extract_classifies_type_and_confidence(project, persona_id: uuid.UUID) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post(
+            "/v1/intake/extract",
+            json={
+                "project_id": project.id,
+                "persona_id": str(persona_id),
+                "text": (
+                    "Exporting reports fails with an error. Search should be faster\n"
+                    "- Data must stay within the EU\n"
+                ),
+            },
+        )
+
+    assert response.status_code == 201
+    payload = response.json()
+    assert [(item["text"], item["type"]) for item in payload] == [
+        ("Exporting reports fails with an error.", RequirementType.BUG.value),
+        ("Search should be faster", RequirementType.IMPROVEMENT.value),
+        ("Data must stay within the EU", RequirementType.CONSTRAINT.value),
+    ]
+    assert all(0 < item["confidence"] <= 1 for item in payload)
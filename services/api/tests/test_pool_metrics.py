@@ -0,0 +1,65 @@
+"""Tests for connection pool settings and metrics."""
+
+from __future__ import annotations
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc, text
+
+from app.config import Settings
+from app.db.base import pool_options
+from app.db.pool_metrics import instrument_engine
+
+
+def _sample(name: str, label: str) -> float:
+    return REGISTRY.get_sample_value(name, {"pool": label}) or 0.0
+
+
+def _engine(tmp_path, monkeypatch: pytest.MonkeyPatch, label: str, **settings: str):
+    for key, value in settings.items():
+        monkeypatch.setenv(key, value)
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **pool_options(Settings(), url, label))
+    instrument_engine(engine, label)
+    return engine
+
+
+def test_pool_gauges_track_checkouts_and_overflow(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = _engine(tmp_path, monkeypatch, "test-gauges", DB_POOL_SIZE="1", DB_MAX_OVERFLOW="2")
+    waits = _sample("db_pool_checkout_wait_seconds_count", "test-gauges")
+
+    first, second = engine.connect(), engine.connect()
+    first.execute(text("SELECT 1"))
+    assert _sample("db_pool_size", "test-gauges") == 1
+    assert _sample("db_pool_checked_out", "test-gauges") == 2
+    assert _sample("db_pool_overflow", "test-gauges") == 1
+    assert _sample("db_pool_checkout_wait_seconds_count", "test-gauges") - waits == 2
+
+    first.close()
+    second.close()
+    assert _sample("db_pool_checked_out", "test-gauges") == 0
+    engine.dispose()
+
+
+def test_pool_timeout_is_counted(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = _engine(
+        tmp_path, monkeypatch, "test-timeout", DB_POOL_SIZE="1", DB_MAX_OVERFLOW="0", DB_POOL_TIMEOUT="0.01"
+    )
+    timeouts = _sample("db_pool_checkout_timeouts_total", "test-timeout")
+
+    with engine.connect(), pytest.raises(exc.TimeoutError):
+        engine.connect()
+    assert _sample("db_pool_checkout_timeouts_total", "test-timeout") - timeouts == 1
+    engine.dispose()
+
+
+def test_connection_lifetime_is_recorded_when_closed(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = _engine(tmp_path, monkeypatch, "test-lifetime")
+    closed = _sample("db_pool_connection_lifetime_seconds_count", "test-lifetime")
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    engine.dispose()
+
+    assert _sample("db_pool_connection_lifetime_seconds_count", "test-lifetime") - closed == 1
+    assert _sample("db_pool_size", "test-lifetime") == Settings().db_pool_size
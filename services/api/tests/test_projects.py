@@ -2,13 +2,40 @@
 
 from __future__ import annotations
 
+import gzip
+import json
+import sqlite3
+
+import numpy as np
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert
 
-from app.db.base import SessionLocal
-from app.db.models import Client, Organization, PersonaRole, ProjectStatus, RequirementType
+from app.config import get_settings
+from app.db.base import SessionLocal, engine
+from app.db.models import (
+    Client,
+    Organization,
+    Persona,
+    PersonaRole,
+    ProjectStats,
+    ProjectStatus,
+    Requirement,
+    RequirementType,
+)
+from app.db.rollups import rebuild_project_stats
 from app.main import app
 
+_STATS_COLUMNS = (
+    "persona_count",
+    "requirement_count",
+    "feature_count",
+    "bug_count",
+    "improvement_count",
+    "constraint_count",
+    "conversation_turn_count",
+)
+
 
 def _create_organization_with_client() -> tuple[int, int]:
     """Helper to seed an organization and client for tests."""
@@ -165,3 +192,246 @@ async def test_persona_requirement_flow_with_projects() -> None:
         assert retrieved_requirement["persona_id"] == persona_id
         assert retrieved_requirement["project_id"] == project_id
 
+
+
+@pytest.mark.asyncio
+async def test_project_stats_rollup_tracks_writes_and_rebuilds(project, persona_id) -> None:
+    """The rollup follows creates, type changes and cascades, and a rebuild reproduces it."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        extract_resp = await async_client.post(
+            "/v1/intake/extract",
+            json={
+                "project_id": project.id,
+                "persona_id": str(persona_id),
+                "text": "Single sign-on\nAudit log export",
+            },
+        )
+        assert extract_resp.status_code == 201
+        requirement_id = extract_resp.json()[0]["id"]
+
+        update_resp = await async_client.patch(
+            f"/v1/requirements/{requirement_id}",
+            json={"type": RequirementType.CONSTRAINT.value},
+        )
+        assert update_resp.status_code == 200
+
+        turn_resp = await async_client.post(
+            "/v1/conversations",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "Hello"},
+        )
+        assert turn_resp.status_code == 201
+
+        detail_resp = await async_client.get(f"/v1/projects/{project.id}")
+        assert detail_resp.json()["requirement_counts"] == {
+            "total": 2,
+            "by_type": {RequirementType.FEATURE.value: 1, RequirementType.CONSTRAINT.value: 1},
+        }
+
+    with SessionLocal() as session:
+        stats = session.get(ProjectStats, project.id)
+        assert stats.persona_count == 1
+        assert stats.conversation_turn_count == 1
+        tracked = {column: getattr(stats, column) for column in _STATS_COLUMNS}
+
+        stats.requirement_count = 99
+        session.commit()
+
+        assert rebuild_project_stats(session) == 1
+        session.commit()
+        rebuilt = session.get(ProjectStats, project.id, populate_existing=True)
+        assert {column: getattr(rebuilt, column) for column in _STATS_COLUMNS} == tracked
+
+    async with AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        delete_resp = await async_client.delete(f"/v1/personas/{persona_id}")
+        assert delete_resp.status_code == 204
+
+        projects_resp = await async_client.get(f"/v1/projects?organization_id={project.organization_id}")
+        assert projects_resp.json()[0]["persona_count"] == 0
+        assert projects_resp.json()[0]["requirement_count"] == 0
+
+    with SessionLocal() as session:
+        stats = session.get(ProjectStats, project.id)
+        assert stats.conversation_turn_count == 0
+        assert stats.constraint_count == 0
+
+
+@pytest.mark.asyncio
+async def test_project_endpoints_return_selected_fields(project, persona_id) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        list_resp = await async_client.get(
+            "/v1/projects", params={"organization_id": project.organization_id, "fields": "name,persona_count"}
+        )
+        detail_resp = await async_client.get(f"/v1/projects/{project.id}", params={"fields": "id,personas"})
+        unknown_resp = await async_client.get(f"/v1/projects/{project.id}", params={"fields": "owner"})
+
+    assert list_resp.json() == [{"name": project.name, "persona_count": 1}]
+    assert detail_resp.json()["id"] == project.id
+    assert set(detail_resp.json()) == {"id", "personas"}
+    assert [persona["id"] for persona in detail_resp.json()["personas"]] == [str(persona_id)]
+    assert unknown_resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_project_snapshot_round_trips_into_another_organization(project, persona_id) -> None:
+    target_organization_id = _create_organization("Import Org")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        await async_client.post(
+            "/v1/intake/extract",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "Single sign-on\nAudit log export"},
+        )
+        await async_client.post(
+            "/v1/conversations",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "We need SSO"},
+        )
+        export_resp = await async_client.get(f"/v1/projects/{project.id}/export")
+        import_resp = await async_client.post(
+            "/v1/projects/import",
+            params={"organization_id": target_organization_id, "name": "Imported"},
+            content=export_resp.content,
+            headers={"Content-Type": "application/gzip"},
+        )
+        imported = import_resp.json()
+        requirements_resp = await async_client.get(f"/v1/requirements?project_id={imported['id']}")
+        turns_resp = await async_client.get(f"/v1/conversations?project_id={imported['id']}&include=embedding")
+        source_turns_resp = await async_client.get(f"/v1/conversations?project_id={project.id}&include=embedding")
+        invalid_resp = await async_client.post(
+            "/v1/projects/import", params={"organization_id": target_organization_id}, content=b"not a snapshot"
+        )
+        missing_resp = await async_client.get("/v1/projects/999999/export")
+
+    assert export_resp.status_code == 200
+    assert export_resp.headers["content-type"] == "application/gzip"
+    lines = [json.loads(line) for line in gzip.decompress(export_resp.content).splitlines()]
+    assert [line["kind"] for line in lines] == ["project", "persona", "requirement", "requirement", "conversation_turn"]
+
+    assert import_resp.status_code == 201
+    assert imported["id"] != project.id
+    assert imported["name"] == "Imported"
+    assert imported["organization_id"] == target_organization_id
+    assert [persona["display_name"] for persona in imported["personas"]] == ["Primary Persona"]
+    assert imported["personas"][0]["id"] != str(persona_id)
+    assert imported["requirement_counts"]["total"] == 2
+    assert sorted(item["text"] for item in requirements_resp.json()) == ["Audit log export", "Single sign-on"]
+    assert all(item["persona_id"] == imported["personas"][0]["id"] for item in requirements_resp.json())
+    np.testing.assert_allclose(turns_resp.json()[0]["embedding"], source_turns_resp.json()[0]["embedding"])
+    assert invalid_resp.status_code == 400
+    assert missing_resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_project_import_rejects_snapshots_over_the_size_limit(project, monkeypatch) -> None:
+    monkeypatch.setenv("SNAPSHOT_MAX_UPLOAD_BYTES", "1024")
+    get_settings.cache_clear()
+
+    async def chunks():
+        for _ in range(4):
+            yield b"x" * 512
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        declared_resp = await async_client.post(
+            "/v1/projects/import", params={"organization_id": project.organization_id}, content=b"x" * 2048
+        )
+        streamed_resp = await async_client.post(
+            "/v1/projects/import", params={"organization_id": project.organization_id}, content=chunks()
+        )
+
+    assert declared_resp.status_code == 413
+    assert streamed_resp.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_clone_project_copies_selected_children(project, persona_id) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        await async_client.post(
+            "/v1/intake/extract",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "Single sign-on\nAudit log export"},
+        )
+        await async_client.post(
+            "/v1/conversations",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "We need SSO"},
+        )
+        full_resp = await async_client.post(
+            f"/v1/projects/{project.id}/clone",
+            json={"name": "From template", "include_conversation_turns": True},
+        )
+        clone = full_resp.json()
+        requirements_resp = await async_client.get(f"/v1/requirements?project_id={clone['id']}")
+        turns_resp = await async_client.get(f"/v1/conversations?project_id={clone['id']}&include=embedding")
+        source_turns_resp = await async_client.get(f"/v1/conversations?project_id={project.id}&include=embedding")
+        personas_only_resp = await async_client.post(
+            f"/v1/projects/{project.id}/clone", json={"include_requirements": False}
+        )
+        invalid_resp = await async_client.post(
+            f"/v1/projects/{project.id}/clone", json={"include_personas": False}
+        )
+        missing_resp = await async_client.post("/v1/projects/999999/clone", json={})
+
+    assert full_resp.status_code == 201
+    assert clone["name"] == "From template"
+    assert clone["organization_id"] == project.organization_id
+    assert clone["requirement_counts"]["total"] == 2
+    [cloned_persona] = clone["personas"]
+    assert cloned_persona["id"] != str(persona_id)
+    assert cloned_persona["display_name"] == "Primary Persona"
+    requirements = requirements_resp.json()
+    assert sorted(item["text"] for item in requirements) == ["Audit log export", "Single sign-on"]
+    assert {item["persona_id"] for item in requirements} == {cloned_persona["id"]}
+    assert len({item["id"] for item in requirements}) == 2
+    [turn] = turns_resp.json()
+    assert turn["persona_id"] == cloned_persona["id"]
+    assert turn["embedding"] == source_turns_resp.json()[0]["embedding"]
+
+    assert personas_only_resp.status_code == 201
+    assert personas_only_resp.json()["name"] == project.name
+    assert len(personas_only_resp.json()["personas"]) == 1
+    assert personas_only_resp.json()["requirement_counts"]["total"] == 0
+    assert invalid_resp.status_code == 422
+    assert missing_resp.status_code == 404
+
+    with SessionLocal() as session:
+        stats = session.get(ProjectStats, clone["id"])
+        assert (stats.persona_count, stats.requirement_count, stats.conversation_turn_count) == (1, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_clone_project_remaps_personas_past_the_parameter_limit(project, persona_id) -> None:
+    persona_count = 600
+    with SessionLocal() as session:
+        session.execute(
+            insert(Persona),
+            [
+                {"project_id": project.id, "role": PersonaRole.CLIENT, "display_name": f"Persona {index}"}
+                for index in range(persona_count - 1)
+            ],
+        )
+        session.add(
+            Requirement(project_id=project.id, persona_id=persona_id, text="Single sign-on", type=RequirementType.FEATURE)
+        )
+        session.commit()
+
+    def limit_parameters(dbapi_connection, connection_record, connection_proxy) -> None:
+        # The SQLite default before 3.32; remapping two parameters per persona would exceed it.
+        dbapi_connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+
+    event.listen(engine, "checkout", limit_parameters)
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+            clone_resp = await async_client.post(f"/v1/projects/{project.id}/clone", json={})
+            clone = clone_resp.json()
+            requirements_resp = await async_client.get(f"/v1/requirements?project_id={clone['id']}")
+    finally:
+        event.remove(engine, "checkout", limit_parameters)
+
+    assert clone_resp.status_code == 201
+    assert len(clone["personas"]) == persona_count
+    cloned_ids = {persona["id"] for persona in clone["personas"]}
+    assert str(persona_id) not in cloned_ids
+    [requirement] = requirements_resp.json()
+    primary = next(persona for persona in clone["personas"] if persona["id"] == requirement["persona_id"])
+    assert primary["display_name"] == "Primary Persona"
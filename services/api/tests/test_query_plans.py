@@ -0,0 +1,183 @@
+"""Query-plan regression tests for the v1 read paths.
+
+Every SELECT issued while serving a route is captured and re-run under
+``EXPLAIN``. A plan that falls back to a full table scan or an explicit sort
+means an index covering the filter and ``(created_at, id)`` ordering is missing.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from common.embeddings import EMBEDDING_DIMENSION
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+from app.db.base import SessionLocal, engine
+from app.db.models import (
+    Client,
+    ConversationTurn,
+    Organization,
+    Persona,
+    PersonaRole,
+    Project,
+    Requirement,
+    RequirementType,
+    User,
+)
+from app.main import app
+
+_SQLITE_TABLE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+
+
+@contextmanager
+def _capture_selects() -> Iterator[list[tuple[str, Any]]]:
+    statements: list[tuple[str, Any]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _walk_postgresql_plan(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk_postgresql_plan(child)
+
+
+def _plan_problems(statement: str, parameters: Any) -> list[str]:
+    problems: list[str] = []
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            # With these disabled the planner only picks a seq scan or sort when no index can serve the query.
+            connection.exec_driver_sql("SET enable_seqscan = off")
+            connection.exec_driver_sql("SET enable_sort = off")
+            raw_plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            plan = raw_plan if isinstance(raw_plan, list) else json.loads(raw_plan)
+            for node in _walk_postgresql_plan(plan[0]["Plan"]):
+                if node["Node Type"] == "Seq Scan":
+                    problems.append(f"sequential scan on {node['Relation Name']}")
+                elif node["Node Type"] in {"Sort", "Incremental Sort"}:
+                    problems.append(f"sort on {node.get('Sort Key')}")
+        else:
+            for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+                detail = row[-1]
+                match = _SQLITE_TABLE_SCAN.match(detail)
+                if match:
+                    problems.append(f"full table scan on {match.group(1)}")
+                elif "USE TEMP B-TREE" in detail:
+                    problems.append(detail.lower())
+    return problems
+
+
+@pytest.fixture
+def seeded() -> dict[str, Any]:
+    """Seed enough rows across two organizations that the planner has choices to make."""
+    with SessionLocal() as session:
+        ids: dict[str, Any] = {}
+        for org_index in range(2):
+            organization = Organization(name=f"Plan Org {org_index}")
+            session.add(organization)
+            session.flush()
+            customer = Client(name=f"Plan Client {org_index}", organization_id=organization.id)
+            user = User(email=f"planner{org_index}@example.com", organization_id=organization.id)
+            session.add_all([customer, user])
+            session.flush()
+
+            for project_index in range(5):
+                project = Project(
+                    name=f"Plan Project {org_index}-{project_index}",
+                    organization_id=organization.id,
+                    client_id=customer.id,
+                )
+                session.add(project)
+                session.flush()
+                personas = [
+                    Persona(
+                        project_id=project.id,
+                        user_id=user.id if persona_index == 0 else None,
+                        role=PersonaRole.CLIENT,
+                        display_name=f"Persona {persona_index}",
+                    )
+                    for persona_index in range(3)
+                ]
+                session.add_all(personas)
+                session.flush()
+                for persona in personas:
+                    session.add_all(
+                        Requirement(
+                            project_id=project.id,
+                            persona_id=persona.id,
+                            text=f"Requirement {requirement_index}",
+                            type=RequirementType.FEATURE,
+                        )
+                        for requirement_index in range(10)
+                    )
+                    session.add_all(
+                        ConversationTurn(
+                            project_id=project.id,
+                            persona_id=persona.id,
+                            text=f"Turn {turn_index}",
+                            embedding=[0.0] * EMBEDDING_DIMENSION,
+                        )
+                        for turn_index in range(5)
+                    )
+
+                ids.update(
+                    organization_id=organization.id,
+                    client_id=customer.id,
+                    user_id=user.id,
+                    project_id=project.id,
+                    persona_id=str(personas[0].id),
+                )
+        session.commit()
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+    return ids
+
+
+ROUTES = [
+    "/v1/projects?organization_id={organization_id}&limit=2",
+    "/v1/projects?organization_id={organization_id}&client_id={client_id}&limit=2",
+    "/v1/projects?organization_id={organization_id}&user_id={user_id}&limit=2",
+    "/v1/projects/{project_id}",
+    "/v1/personas?project_id={project_id}&limit=2",
+    "/v1/requirements?project_id={project_id}&limit=5",
+    "/v1/requirements?project_id={project_id}&persona_id={persona_id}&limit=5",
+    "/v1/conversations?project_id={project_id}&limit=5",
+    "/v1/conversations?project_id={project_id}&persona_id={persona_id}&limit=5",
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("route", ROUTES)
+async def test_read_routes_use_indexes(seeded: dict[str, Any], route: str) -> None:
+    url = route.format(**seeded)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        with _capture_selects() as statements:
+            response = await client.get(url)
+            assert response.status_code == 200
+            next_cursor = response.headers.get("x-next-cursor")
+            if next_cursor:
+                # Deep pages add the keyset predicate, so their plans are checked too.
+                next_response = await client.get(f"{url}&cursor={next_cursor}")
+                assert next_response.status_code == 200
+
+    assert statements
+    problems = {
+        statement: found for statement, parameters in statements if (found := _plan_problems(statement, parameters))
+    }
+    assert problems == {}
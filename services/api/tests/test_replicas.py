@@ -0,0 +1,82 @@
+"""Tests for routing read-only endpoints to read replicas."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.models import Base, Organization, Project
+from app.db.replicas import (
+    CONSISTENCY_TOKEN_HEADER,
+    DB_REPLICA_EJECTIONS,
+    consistency_token,
+    get_replica_router,
+)
+from app.main import app
+
+
+@pytest.fixture
+def replica_url(tmp_path) -> str:
+    """A second database standing in for a replica, holding a differently named project."""
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        organization = Organization(name="Replica Org")
+        session.add(organization)
+        session.flush()
+        session.add(Project(name="Replica Project", organization_id=organization.id))
+        session.commit()
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def configure_replicas(monkeypatch: pytest.MonkeyPatch):
+    def configure(*urls: str) -> None:
+        monkeypatch.setenv("DATABASE_REPLICA_URLS", json.dumps(list(urls)))
+        get_replica_router.cache_clear()
+
+    yield configure
+    get_replica_router.cache_clear()
+
+
+async def _project_name(project_id: int, headers: dict[str, str] | None = None) -> str:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get(f"/v1/projects/{project_id}", params={"fields": "name"}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["name"]
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_unless_pinned_by_a_recent_write(project, replica_url, configure_replicas) -> None:
+    configure_replicas(replica_url)
+
+    assert await _project_name(project.id) == "Replica Project"
+    assert await _project_name(project.id, {CONSISTENCY_TOKEN_HEADER: consistency_token()}) == "Test Project"
+    stale = str(time.time() - 60)
+    assert await _project_name(project.id, {CONSISTENCY_TOKEN_HEADER: stale}) == "Replica Project"
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_is_ejected(project, replica_url, configure_replicas, tmp_path) -> None:
+    configure_replicas(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}", replica_url)
+    ejections = DB_REPLICA_EJECTIONS.labels(replica="replica0")._value.get()
+
+    names = [await _project_name(project.id) for _ in range(4)]
+
+    assert names == ["Replica Project"] * 4
+    assert DB_REPLICA_EJECTIONS.labels(replica="replica0")._value.get() - ejections == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_use_primary_when_every_replica_is_down(project, configure_replicas, tmp_path) -> None:
+    configure_replicas(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+
+    assert await _project_name(project.id) == "Test Project"
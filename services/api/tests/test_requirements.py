@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import uuid
 
 import pytest
@@ -97,4 +98,159 @@ async def test_delete_requirement(project, persona_id: uuid.UUID) -> None:
 
         list_response = await client.get(f"/v1/requirements?project_id={project.id}")
         assert list_response.status_code == 200
-        assert list_response.json() == []
\ No newline at end of file
+        assert list_response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_list_requirements_paginates_with_cursor(project, persona_id: uuid.UUID) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        created_ids = []
+        for index in range(5):
+            response = await client.post(
+                "/v1/requirements",
+                json={
+                    "project_id": project.id,
+                    "persona_id": str(persona_id),
+                    "text": f"Requirement {index}",
+                    "type": RequirementType.FEATURE.value,
+                },
+            )
+            created_ids.append(response.json()["id"])
+
+        seen_ids: list[str] = []
+        cursor = None
+        pages = 0
+        while True:
+            url = f"/v1/requirements?project_id={project.id}&limit=2"
+            if cursor:
+                url += f"&cursor={cursor}"
+            page_response = await client.get(url)
+            assert page_response.status_code == 200
+            page_items = page_response.json()
+            assert len(page_items) <= 2
+            seen_ids.extend(item["id"] for item in page_items)
+            pages += 1
+
+            cursor = page_response.headers.get("x-next-cursor")
+            if cursor is None:
+                assert "link" not in page_response.headers
+                break
+            assert 'rel="next"' in page_response.headers["link"]
+
+        assert pages == 3
+        assert sorted(seen_ids) == sorted(created_ids)
+        assert len(set(seen_ids)) == len(seen_ids)
+
+        invalid_response = await client.get(f"/v1/requirements?project_id={project.id}&cursor=not-a-cursor")
+        assert invalid_response.status_code == 400
+
+        oversized_response = await client.get(f"/v1/requirements?project_id={project.id}&limit=100000")
+        assert oversized_response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_requirement_lifecycle_reports_item_errors(project, persona_id: uuid.UUID) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        other_project = await client.post(
+            "/v1/projects", json={"name": "Other Project", "organization_id": project.organization_id}
+        )
+        items = [
+            {
+                "project_id": project.id,
+                "persona_id": str(persona_id),
+                "text": f"Synced requirement {index}",
+                "type": RequirementType.FEATURE.value,
+            }
+            for index in range(3)
+        ]
+        items.insert(1, {**items[0], "persona_id": str(uuid.uuid4())})
+        items.append({**items[0], "project_id": project.id + 1000})
+        items.append({**items[0], "project_id": other_project.json()["id"]})
+
+        create_response = await client.post("/v1/requirements/bulk", json={"items": items})
+        assert create_response.status_code == 200
+        created_payload = create_response.json()
+        assert [item["text"] for item in created_payload["created"]] == [
+            "Synced requirement 0",
+            "Synced requirement 1",
+            "Synced requirement 2",
+        ]
+        assert created_payload["errors"] == [
+            {"index": 1, "detail": "Persona not found"},
+            {"index": 4, "detail": "Project not found"},
+            {"index": 5, "detail": "Persona does not belong to the provided project"},
+        ]
+        created_ids = [item["id"] for item in created_payload["created"]]
+
+        update_response = await client.patch(
+            "/v1/requirements/bulk",
+            json={
+                "items": [
+                    {"id": created_ids[0], "type": RequirementType.BUG.value},
+                    {"id": str(uuid.uuid4()), "confidence": 0.5},
+                    {"id": created_ids[1], "confidence": 0.25},
+                ]
+            },
+        )
+        assert update_response.status_code == 200
+        updated_payload = update_response.json()
+        assert [item["id"] for item in updated_payload["updated"]] == created_ids[:2]
+        assert updated_payload["updated"][0]["type"] == RequirementType.BUG.value
+        assert updated_payload["updated"][1]["confidence"] == 0.25
+        assert updated_payload["errors"] == [{"index": 1, "detail": "Requirement not found"}]
+
+        missing_id = str(uuid.uuid4())
+        delete_response = await client.request(
+            "DELETE",
+            "/v1/requirements/bulk",
+            json={"ids": [created_ids[2], missing_id]},
+        )
+        assert delete_response.status_code == 200
+        assert delete_response.json() == {
+            "deleted": [created_ids[2]],
+            "errors": [{"index": 1, "detail": "Requirement not found"}],
+        }
+
+        detail_response = await client.get(f"/v1/projects/{project.id}")
+        assert detail_response.json()["requirement_counts"] == {
+            "total": 2,
+            "by_type": {RequirementType.FEATURE.value: 1, RequirementType.BUG.value: 1},
+        }
+
+
+@pytest.mark.asyncio
+async def test_list_requirements_streams_ndjson(project, persona_id: uuid.UUID) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        created_ids = []
+        for index in range(5):
+            response = await client.post(
+                "/v1/requirements",
+                json={
+                    "project_id": project.id,
+                    "persona_id": str(persona_id),
+                    "text": f"Requirement {index}",
+                    "type": RequirementType.FEATURE.value,
+                },
+            )
+            created_ids.append(response.json()["id"])
+
+        headers = {"Accept": "application/x-ndjson"}
+        first_page = await client.get(f"/v1/requirements?project_id={project.id}&limit=2")
+        cursor = first_page.headers["x-next-cursor"]
+        streamed = await client.get(
+            f"/v1/requirements?project_id={project.id}&limit=2&fields=id,text", headers=headers
+        )
+        remainder = await client.get(f"/v1/requirements?project_id={project.id}&cursor={cursor}", headers=headers)
+
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    assert "x-next-cursor" not in streamed.headers
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    streamed_ids = [line["id"] for line in lines]
+    assert sorted(streamed_ids) == sorted(created_ids)
+    assert all(set(line) == {"id", "text"} for line in lines)
+    assert [item["id"] for item in first_page.json()] == streamed_ids[:2]
+    assert [json.loads(line)["id"] for line in remainder.text.splitlines()] == streamed_ids[2:]
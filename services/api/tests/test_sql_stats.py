@@ -0,0 +1,146 @@
+"""Tests for per-request SQL statistics and query guards."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.base import SessionLocal, engine
+from app.db.models import Project
+from app.main import app
+from app.telemetry.slow_queries import (
+    StatementTiming,
+    _explain_engine,
+    get_slow_query_log,
+    parameter_shape,
+    record_slow_request,
+)
+from app.telemetry.sql import QueryGuardError, track_queries
+
+
+@pytest.mark.asyncio
+async def test_requests_are_measured_per_route(project) -> None:
+    labels = {"route": "/v1/projects/{project_id}"}
+    before = REGISTRY.get_sample_value("db_queries_per_request_count", labels) or 0.0
+    queries_before = REGISTRY.get_sample_value("db_queries_per_request_sum", labels) or 0.0
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get(f"/v1/projects/{project.id}")
+
+    assert response.status_code == 200
+    assert REGISTRY.get_sample_value("db_queries_per_request_count", labels) - before == 1
+    assert REGISTRY.get_sample_value("db_queries_per_request_sum", labels) - queries_before >= 1
+
+
+@pytest.mark.asyncio
+async def test_query_budget_fails_a_route_that_exceeds_it(project) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        with track_queries(budget=10) as stats:
+            response = await client.get(f"/v1/projects/{project.id}", params={"fields": "id,name"})
+        assert response.status_code == 200
+        assert stats.count == 1
+
+        with pytest.raises(QueryGuardError, match="exceed the budget of 1"), track_queries(budget=1):
+            await client.get(f"/v1/projects/{project.id}")
+
+
+def test_repeated_statements_are_flagged_as_n_plus_one(project) -> None:
+    with (
+        SessionLocal() as session,
+        pytest.raises(QueryGuardError, match="possible N\\+1"),
+        track_queries(repeat_threshold=2) as stats,
+    ):
+        for _ in range(3):
+            session.execute(select(Project.name).where(Project.id == project.id)).one()
+
+    assert stats.count == 3
+    assert stats.rows >= 0
+
+
+def test_parameter_shapes_hide_values() -> None:
+    assert parameter_shape({"name": "secret", "ids": [1, 2, 3], "limit": 5, "after": None}) == {
+        "name": "str[6]",
+        "ids": "list[3]",
+        "limit": "int",
+        "after": "null",
+    }
+    assert parameter_shape([("a", 1), ("b", 2)], executemany=True) == {"rows": 2, "first": ["str[1]", "int"]}
+
+
+def test_async_statements_are_explained_on_the_sync_engine() -> None:
+    pytest.importorskip("aiosqlite")
+    async_engine = create_async_engine("sqlite+aiosqlite://")
+
+    # The async engine's sync facade raises MissingGreenlet outside of a greenlet.
+    assert _explain_engine(async_engine.sync_engine) is engine
+    assert _explain_engine(engine) is engine
+
+
+@pytest.mark.asyncio
+async def test_slow_statements_are_listed_for_admins() -> None:
+    get_slow_query_log().clear()
+    statement = "SELECT projects.name FROM projects WHERE projects.name = ?"
+    record_slow_request("/v1/projects", 2.5, 2.0, [StatementTiming(statement, 2.0, ("secret",), False, engine)])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        forbidden = await client.get("/v1/admin/slow-queries", headers={"x-dev-user": "lead@example.com|lead"})
+        response = await client.get("/v1/admin/slow-queries", headers={"x-dev-user": "ops@example.com|admin"})
+
+    assert forbidden.status_code == 403
+    assert response.status_code == 200
+    [entry] = response.json()
+    assert entry["route"] == "/v1/projects"
+    assert entry["statement"] == statement
+    assert entry["parameters"] == ["str[6]"]
+    assert entry["plan"] is None  # EXPLAIN is only captured on PostgreSQL
+
+
+@pytest.mark.asyncio
+async def test_write_endpoints_validate_and_write_in_few_statements(project, persona_id) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        # Reference lookup, INSERT ... RETURNING, rollup UPDATE.
+        with track_queries(budget=3):
+            created = await client.post(
+                "/v1/requirements",
+                json={"project_id": project.id, "persona_id": str(persona_id), "text": "Export", "type": "feature"},
+            )
+        assert created.status_code == 201
+        assert created.json()["created_at"] is not None
+
+        with track_queries(budget=3):
+            persona = await client.post(
+                "/v1/personas", json={"project_id": project.id, "role": "client", "display_name": "Second"}
+            )
+        assert persona.status_code == 201
+
+        with track_queries(budget=3):
+            new_project = await client.post(
+                "/v1/projects", json={"name": "Another", "organization_id": project.organization_id}
+            )
+        assert new_project.status_code == 201
+        assert new_project.json()["requirement_counts"] == {"total": 0, "by_type": {}}
+
+        # Project with personas and rollup in one SELECT, then the UPDATE.
+        with track_queries(budget=2):
+            updated = await client.patch(f"/v1/projects/{project.id}", json={"name": "Renamed"})
+        assert updated.status_code == 200
+        body = updated.json()
+        assert body["name"] == "Renamed"
+        assert sorted(item["display_name"] for item in body["personas"]) == ["Primary Persona", "Second"]
+        assert body["requirement_counts"] == {"total": 1, "by_type": {"feature": 1}}
+
+        missing = await client.post(
+            "/v1/requirements",
+            json={"project_id": project.id, "persona_id": str(uuid.uuid4()), "text": "Export", "type": "feature"},
+        )
+        assert missing.status_code == 404
+        assert missing.json()["detail"] == "Persona not found"
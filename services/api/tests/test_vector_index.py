@@ -0,0 +1,186 @@
+"""Tests for the file-backed local vector index."""
+
+from __future__ import annotations
+
+import uuid
+
+import numpy as np
+import pytest
+from common.embeddings import EMBEDDING_DIMENSION, get_embedder
+from httpx import ASGITransport, AsyncClient
+
+from app.config import get_settings
+from app.db.base import SessionLocal
+from app.db.models import ConversationTurn
+from app.db.vector_index import LocalVectorIndex, quantize_int8
+from app.main import app
+
+
+def _unit(*values: float) -> np.ndarray:
+    vector = np.zeros(4, dtype=np.float32)
+    vector[: len(values)] = values
+    return vector
+
+
+def test_search_ranks_rebuilt_and_appended_rows(tmp_path) -> None:
+    index = LocalVectorIndex(tmp_path, dimension=4)
+    ids = [uuid.uuid4() for _ in range(3)]
+    assert index.count(1) is None
+    assert index.search(1, _unit(1), k=3) == []
+
+    index.rebuild(1, [(ids[:2], np.stack([_unit(1, 0), _unit(0, 1)]))], watermark="2")
+    assert index.watermark(1) == "2"
+    with index.lock(1):
+        index.append(1, ids[2:], np.stack([_unit(3, 1)]), watermark="3")
+
+    assert index.count(1) == 3 and index.watermark(1) == "3"
+    assert index.watermark(2) is None
+    assert index.count(2) is None
+    results = index.search(1, _unit(2), k=2)
+    assert [turn_id for turn_id, _ in results] == [ids[0], ids[2]]
+    assert results[0][1] == pytest.approx(0.0, abs=1e-6)
+    assert results[1][1] == pytest.approx(1 - 3 / np.sqrt(10), abs=1e-6)
+
+
+def test_torn_append_is_ignored_and_rebuild_replaces_generation(tmp_path) -> None:
+    index = LocalVectorIndex(tmp_path, dimension=4)
+    first, second = uuid.uuid4(), uuid.uuid4()
+    index.rebuild(7, [([first], np.stack([_unit(1)]))])
+    project_dir = tmp_path / "project-7"
+    generation = (project_dir / "HEAD").read_text()
+
+    # A vector written without its id (an interrupted append) is not a row yet.
+    with open(project_dir / f"{generation}.vectors", "ab") as handle:
+        handle.write(_unit(0, 1).tobytes())
+    assert index.count(7) == 1
+
+    index.rebuild(7, [([second], np.stack([_unit(0, 1)]))])
+    assert [turn_id for turn_id, _ in index.search(7, _unit(0, 1), k=5)] == [second]
+    assert sorted(path.name for path in project_dir.iterdir() if path.name != "HEAD") == sorted(
+        f"{(project_dir / 'HEAD').read_text()}{suffix}" for suffix in (".vectors", ".ids", ".mark")
+    )
+
+
+@pytest.mark.parametrize("storage", ["half", "int8"])
+def test_reduced_precision_storage_ranks_like_float32(tmp_path, storage: str) -> None:
+    rng = np.random.default_rng(3)
+    vectors = rng.standard_normal((200, 4)).astype(np.float32)
+    ids = [uuid.uuid4() for _ in vectors]
+    exact = LocalVectorIndex(tmp_path, dimension=4)
+    reduced = LocalVectorIndex(tmp_path, dimension=4, storage=storage)
+    for index in (exact, reduced):
+        index.rebuild(3, [(ids[:150], vectors[:150])])
+        index.append(3, ids[150:], vectors[150:])
+
+    assert reduced.count(3) == 200 and not reduced.exact
+    query = vectors[17] + 0.01
+    expected = exact.search(3, query, k=5)
+    found = reduced.search(3, query, k=5)
+    assert found[0][0] == expected[0][0] == ids[17]
+    assert [distance for _, distance in found] == pytest.approx([distance for _, distance in expected], abs=0.02)
+    # Each storage mode keeps its own files.
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(["project-3", f"project-3.{storage}"])
+
+
+def test_quantize_int8_round_trips_within_one_step() -> None:
+    vectors = np.array([[0.5, -1.0, 0.25, 0.0], [0.0, 0.0, 0.0, 0.0]], dtype=np.float32)
+    codes, scales = quantize_int8(vectors)
+
+    assert codes.dtype == np.int8 and codes[0].tolist()[1] == -127
+    np.testing.assert_allclose(codes * scales[:, None], vectors, atol=scales.max() / 2)
+    assert not codes[1].any()
+
+
+@pytest.mark.asyncio
+async def test_int8_index_results_are_reranked_at_full_precision(
+    project, persona_id: uuid.UUID, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("VECTOR_INDEX_STORAGE", "int8")
+    get_settings.cache_clear()
+    texts = ["Export invoices as CSV", "Invoices export to CSV files", "Weekly status email", "Dark mode for mobile"]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for text in texts:
+            created = await client.post(
+                "/v1/conversations",
+                json={"project_id": project.id, "persona_id": str(persona_id), "text": text},
+            )
+            assert created.status_code == 201
+        similar = await client.get(
+            "/v1/conversations/similar",
+            params={"project_id": project.id, "text": "export invoices to CSV", "k": 2, "include": "embedding"},
+        )
+
+    query = get_embedder().embed(["export invoices to CSV"])[0]
+    results = similar.json()
+    assert {turn["text"] for turn in results} == set(texts[:2])
+    for turn in results:
+        exact = 1.0 - float(np.dot(turn["embedding"], query))
+        assert turn["distance"] == pytest.approx(exact, abs=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_similar_rebuilds_index_for_turns_written_elsewhere(project, persona_id: uuid.UUID) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        created = await client.post(
+            "/v1/conversations",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "Weekly status email"},
+        )
+        assert created.status_code == 201
+        # The first search builds the index; the next turn is appended to it.
+        first = await client.get("/v1/conversations/similar", params={"project_id": project.id, "text": "status"})
+        appended = await client.post(
+            "/v1/conversations",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "Invoices export to CSV"},
+        )
+        assert appended.status_code == 201
+
+        # Turns inserted without going through the endpoint are picked up by a lazy rebuild.
+        imported_text = "Export invoices as CSV files"
+        with SessionLocal() as session:
+            embedding = get_embedder().embed([imported_text])[0]
+            assert embedding.shape == (EMBEDDING_DIMENSION,)
+            session.add(
+                ConversationTurn(project_id=project.id, persona_id=persona_id, text=imported_text, embedding=embedding)
+            )
+            session.commit()
+
+        similar = await client.get(
+            "/v1/conversations/similar",
+            params={"project_id": project.id, "text": "export invoices to CSV", "k": 3},
+        )
+
+    assert [turn["text"] for turn in first.json()] == ["Weekly status email"]
+    texts = [turn["text"] for turn in similar.json()]
+    assert len(texts) == 3
+    assert set(texts[:2]) == {"Invoices export to CSV", imported_text}
+
+
+@pytest.mark.asyncio
+async def test_similar_rebuilds_index_when_turns_are_swapped(project, persona_id: uuid.UUID) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        created = await client.post(
+            "/v1/conversations",
+            json={"project_id": project.id, "persona_id": str(persona_id), "text": "Weekly status email"},
+        )
+        await client.get("/v1/conversations/similar", params={"project_id": project.id, "text": "status"})
+
+        # Deleting one turn and importing another leaves the row count unchanged.
+        replacement = "Export invoices as CSV files"
+        with SessionLocal() as session:
+            session.delete(session.get(ConversationTurn, uuid.UUID(created.json()["id"])))
+            session.add(
+                ConversationTurn(
+                    project_id=project.id,
+                    persona_id=persona_id,
+                    text=replacement,
+                    embedding=get_embedder().embed([replacement])[0],
+                )
+            )
+            session.commit()
+
+        similar = await client.get("/v1/conversations/similar", params={"project_id": project.id, "text": "status"})
+
+    assert [turn["text"] for turn in similar.json()] == [replacement]
@@ -4,17 +4,28 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from temporalio.client import Client
 from temporalio.worker import Worker
 
-from worker.activities import echo_activity, process_intake_activity
+from worker.activities import (
+    count_turns_activity,
+    echo_activity,
+    embed_batch_activity,
+    mark_intake_running_activity,
+    process_intake_activity,
+    record_intake_outcome_activity,
+    reembed_page_activity,
+)
 from worker.settings import settings
 from worker.telemetry import configure_telemetry
-from worker.workflows import EchoWorkflow, IntakeWorkflow
+from worker.workflows import EchoWorkflow, EmbedBatchWorkflow, IntakeWorkflow, ReembedWorkflow
 
 TASK_QUEUE = "ai-pm-default"
 
+logger = logging.getLogger(__name__)
+
 
 async def main() -> None:
     """Start the Temporal worker."""
@@ -22,15 +33,25 @@ async def main() -> None:
     configure_telemetry(settings)
     client = await Client.connect(settings.host, namespace=settings.namespace)
 
-    worker = Worker(
-        client,
-        task_queue=TASK_QUEUE,
-        workflows=[EchoWorkflow, IntakeWorkflow],
-        activities=[echo_activity, process_intake_activity],
-    )
-
-    logging.info("Starting worker on task queue '%s'", TASK_QUEUE)
-    await worker.run()
+    with ThreadPoolExecutor(max_workers=settings.activity_threads) as activity_executor:
+        worker = Worker(
+            client,
+            task_queue=TASK_QUEUE,
+            workflows=[EchoWorkflow, EmbedBatchWorkflow, IntakeWorkflow, ReembedWorkflow],
+            activities=[
+                count_turns_activity,
+                echo_activity,
+                embed_batch_activity,
+                mark_intake_running_activity,
+                process_intake_activity,
+                record_intake_outcome_activity,
+                reembed_page_activity,
+            ],
+            activity_executor=activity_executor,
+        )
+
+        logger.info("Starting worker on task queue '%s'", TASK_QUEUE)
+        await worker.run()
 
 
 if __name__ == "__main__":
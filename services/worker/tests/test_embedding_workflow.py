@@ -0,0 +1,49 @@
+"""Tests for the batch embedding workflow."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from common.embeddings import EMBEDDING_DIMENSION, EmbedBatchRequest, get_embedder
+from temporalio.testing import ActivityEnvironment, WorkflowEnvironment
+from temporalio.worker import Worker
+
+from worker.activities import embed_batch_activity
+from worker.workflows import EmbedBatchWorkflow
+
+
+async def _run_embed_batch_workflow() -> None:
+    texts = ["Export reports as CSV", "Schedule the kickoff call"]
+    env = await WorkflowEnvironment.start_time_skipping()
+    async with env:
+        with ThreadPoolExecutor(max_workers=2) as activity_executor:
+            async with Worker(
+                env.client,
+                task_queue="ai-pm-default",
+                workflows=[EmbedBatchWorkflow],
+                activities=[embed_batch_activity],
+                activity_executor=activity_executor,
+            ):
+                result = await env.client.execute_workflow(
+                    EmbedBatchWorkflow.run,
+                    EmbedBatchRequest(texts=texts),
+                    id="embed-batch-workflow",
+                    task_queue="ai-pm-default",
+                )
+
+        assert result.vectors == get_embedder().embed(texts).tolist()
+
+
+def test_embed_batch_workflow() -> None:
+    asyncio.run(_run_embed_batch_workflow())
+
+
+def test_embed_batch_activity_returns_unit_vectors_in_order() -> None:
+    result = ActivityEnvironment().run(embed_batch_activity, EmbedBatchRequest(texts=["dark mode", "", "dark mode"]))
+
+    assert [len(vector) for vector in result.vectors] == [EMBEDDING_DIMENSION] * 3
+    assert math.isclose(math.hypot(*result.vectors[0]), 1.0, rel_tol=1e-5)
+    assert result.vectors[0] == result.vectors[2]
+    assert not any(result.vectors[1])
@@ -0,0 +1,137 @@
+"""Tests for the intake workflow."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import sqlalchemy as sa
+from common.intake import ExtractedRequirement, IntakeJobOutcome, IntakeRequest, RequirementType
+from temporalio.testing import ActivityEnvironment, WorkflowEnvironment
+from temporalio.worker import Worker
+
+from worker.activities import (
+    mark_intake_running_activity,
+    process_intake_activity,
+    record_intake_outcome_activity,
+)
+from worker.activities.intake_activity import intake_jobs, project_stats, requirements
+from worker.settings import settings
+from worker.workflows import IntakeWorkflow
+
+PERSONA_ID = str(uuid.uuid4())
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch: pytest.MonkeyPatch) -> sa.Engine:
+    """A database holding one pending intake job and an empty stats row for its project."""
+    url = f"sqlite:///{tmp_path / 'intake.db'}"
+    monkeypatch.setattr(settings, "database_url", url)
+    engine = sa.create_engine(url)
+    metadata = sa.MetaData()
+    for table in (intake_jobs, requirements, project_stats):
+        sa.Table(table.name, metadata, *(sa.Column(column.name, column.type) for column in table.columns))
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            project_stats.insert(), {column.name: 0 for column in project_stats.columns if column.name != "last_activity_at"}
+        )
+        connection.execute(intake_jobs.insert(), {"id": uuid.UUID(int=1), "status": "pending"})
+    return engine
+
+
+def _job(engine: sa.Engine) -> sa.Row:
+    with engine.connect() as connection:
+        return connection.execute(sa.select(intake_jobs)).one()
+
+
+def _outcome(**kwargs) -> IntakeJobOutcome:
+    return IntakeJobOutcome(job_id=str(uuid.UUID(int=1)), project_id=0, persona_id=PERSONA_ID, **kwargs)
+
+
+async def _run_intake_workflow() -> None:
+    env = await WorkflowEnvironment.start_time_skipping()
+    async with env:
+        with ThreadPoolExecutor(max_workers=2) as activity_executor:
+            async with Worker(
+                env.client,
+                task_queue="ai-pm-default",
+                workflows=[IntakeWorkflow],
+                activities=[process_intake_activity],
+                activity_executor=activity_executor,
+            ):
+                result = await env.client.execute_workflow(
+                    IntakeWorkflow.run,
+                    IntakeRequest(project_id=1, persona_id="persona", text="Offline mode\n- CSV export\n"),
+                    id="intake-workflow",
+                    task_queue="ai-pm-default",
+                )
+
+        assert [requirement.text for requirement in result.requirements] == ["Offline mode", "CSV export"]
+        assert {requirement.type for requirement in result.requirements} == {RequirementType.FEATURE}
+
+
+def test_intake_workflow() -> None:
+    asyncio.run(_run_intake_workflow())
+
+
+def test_process_intake_activity_falls_back_to_whole_text() -> None:
+    result = ActivityEnvironment().run(
+        process_intake_activity,
+        IntakeRequest(project_id=1, persona_id="persona", text="   Single requirement   "),
+    )
+
+    assert [requirement.text for requirement in result.requirements] == ["Single requirement"]
+
+
+def test_process_intake_activity_classifies_segments() -> None:
+    result = ActivityEnvironment().run(
+        process_intake_activity,
+        IntakeRequest(
+            project_id=1,
+            persona_id="persona",
+            text="The login page crashes on Safari. Passwords must never be stored in plain text\n",
+        ),
+    )
+
+    assert [(requirement.text, requirement.type) for requirement in result.requirements] == [
+        ("The login page crashes on Safari.", RequirementType.BUG),
+        ("Passwords must never be stored in plain text", RequirementType.CONSTRAINT),
+    ]
+    assert all(0.25 < (requirement.confidence or 0) <= 1 for requirement in result.requirements)
+
+
+def test_record_intake_outcome_activity_stores_requirements_once(database: sa.Engine) -> None:
+    env = ActivityEnvironment()
+    env.run(mark_intake_running_activity, str(uuid.UUID(int=1)))
+    assert _job(database).status == "running"
+
+    outcome = _outcome(
+        requirements=[
+            ExtractedRequirement(text="Offline mode"),
+            ExtractedRequirement(text="Login crashes", type=RequirementType.BUG, confidence=0.9),
+        ]
+    )
+    env.run(record_intake_outcome_activity, outcome)
+    # A retried activity finds the job closed and writes nothing more.
+    env.run(record_intake_outcome_activity, outcome)
+
+    with database.connect() as connection:
+        stored = connection.execute(sa.select(requirements.c.id, requirements.c.text, requirements.c.type)).all()
+        stats = connection.execute(sa.select(project_stats)).one()
+    job = _job(database)
+    assert job.status == "completed" and job.completed_at is not None
+    assert job.requirement_ids == [str(row.id) for row in stored]
+    assert [(row.text, row.type) for row in stored] == [("Offline mode", "feature"), ("Login crashes", "bug")]
+    assert (stats.requirement_count, stats.feature_count, stats.bug_count) == (2, 1, 1)
+
+
+def test_record_intake_outcome_activity_fails_open_jobs_only(database: sa.Engine) -> None:
+    env = ActivityEnvironment()
+    env.run(record_intake_outcome_activity, _outcome(error="Requirement extraction failed"))
+    env.run(mark_intake_running_activity, str(uuid.UUID(int=1)))
+
+    job = _job(database)
+    assert (job.status, job.error) == ("failed", "Requirement extraction failed")
@@ -0,0 +1,96 @@
+"""Tests for the re-embed workflow."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import sqlalchemy as sa
+from common.embeddings import get_embedder
+from common.reembed import ReembedPageRequest, ReembedRequest, split_id_space
+from temporalio.testing import ActivityEnvironment, WorkflowEnvironment
+from temporalio.worker import Worker
+
+from worker.activities import count_turns_activity, reembed_page_activity
+from worker.activities.reembed_activity import turns
+from worker.settings import settings
+from worker.workflows import ReembedWorkflow
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch: pytest.MonkeyPatch) -> sa.Engine:
+    """A database holding turns with stale (all-zero) embeddings."""
+    url = f"sqlite:///{tmp_path / 'turns.db'}"
+    monkeypatch.setattr(settings, "database_url", url)
+    engine = sa.create_engine(url)
+    metadata = sa.MetaData()
+    sa.Table("conversation_turns", metadata, *(sa.Column(column.name, column.type) for column in turns.columns))
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            turns.insert(),
+            [{"id": uuid.uuid4(), "text": f"Requirement {index}", "embedding": [0.0] * 384} for index in range(11)],
+        )
+    return engine
+
+
+def _stored(engine: sa.Engine) -> dict[str, np.ndarray]:
+    with engine.connect() as connection:
+        rows = connection.execute(sa.select(turns.c.text, turns.c.embedding))
+        return {row.text: np.asarray(row.embedding) for row in rows}
+
+
+def test_split_id_space_covers_every_id_once() -> None:
+    partitions = split_id_space(3)
+
+    bounds = [partition.before_id for partition in partitions[:-1]]
+    assert [partition.after_id for partition in partitions[1:]] == bounds
+    assert partitions[0].after_id is None and partitions[-1].before_id is None
+
+
+def test_reembed_page_activity_walks_a_partition_by_keyset(database: sa.Engine) -> None:
+    env = ActivityEnvironment()
+    first = env.run(reembed_page_activity, ReembedPageRequest(provider="hashing", page_size=8))
+    second = env.run(reembed_page_activity, ReembedPageRequest(provider="hashing", page_size=8, after_id=first.last_id))
+
+    assert (first.count, second.count) == (8, 3)
+    assert env.run(count_turns_activity) == 11
+    stored = _stored(database)
+    np.testing.assert_allclose(
+        [stored[text] for text in sorted(stored)], get_embedder().embed(sorted(stored)), atol=1e-6
+    )
+
+
+async def _run_reembed_workflow() -> None:
+    env = await WorkflowEnvironment.start_time_skipping()
+    async with env:
+        with ThreadPoolExecutor(max_workers=4) as activity_executor:
+            async with Worker(
+                env.client,
+                task_queue="ai-pm-default",
+                workflows=[ReembedWorkflow],
+                activities=[count_turns_activity, reembed_page_activity],
+                activity_executor=activity_executor,
+            ):
+                # Two pages per run forces several continue-as-new hand-offs.
+                result = await env.client.execute_workflow(
+                    ReembedWorkflow.run,
+                    ReembedRequest(page_size=2, concurrency=3, pages_per_run=2, rows_per_second=100),
+                    id="reembed-workflow",
+                    task_queue="ai-pm-default",
+                )
+
+    assert (result.processed, result.total) == (11, 11)
+    assert result.completed_partitions == result.partitions == 3
+
+
+def test_reembed_workflow_reembeds_every_turn(database: sa.Engine) -> None:
+    asyncio.run(_run_reembed_workflow())
+
+    stored = _stored(database)
+    np.testing.assert_allclose(
+        [stored[text] for text in sorted(stored)], get_embedder().embed(sorted(stored)), atol=1e-6
+    )
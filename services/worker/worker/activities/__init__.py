@@ -1,6 +1,22 @@
 ﻿"""Activity definitions."""
 
 from .demo_activity import echo_activity
-from .intake_activity import RequirementType, process_intake_activity
+from .embedding_activity import embed_batch_activity
+from .intake_activity import (
+    RequirementType,
+    mark_intake_running_activity,
+    process_intake_activity,
+    record_intake_outcome_activity,
+)
+from .reembed_activity import count_turns_activity, reembed_page_activity
 
-__all__ = ["echo_activity", "process_intake_activity", "RequirementType"]
+__all__ = [
+    "RequirementType",
+    "count_turns_activity",
+    "echo_activity",
+    "embed_batch_activity",
+    "mark_intake_running_activity",
+    "process_intake_activity",
+    "record_intake_outcome_activity",
+    "reembed_page_activity",
+]
@@ -0,0 +1,22 @@
+"""Embedding activity implementations."""
+
+from __future__ import annotations
+
+from common.embeddings import EmbedBatchRequest, EmbedBatchResult, get_embedder
+from temporalio import activity
+
+
+@activity.defn
+def embed_batch_activity(request: EmbedBatchRequest) -> EmbedBatchResult:
+    """Embed a batch of texts with the requested provider.
+
+    Embedding is CPU-bound, so like extraction this runs on the worker's thread
+    pool; one call per batch amortizes the provider's per-call overhead.
+    """
+
+    activity.logger.info("Embedding %d texts with %s", len(request.texts), request.provider)
+    vectors = get_embedder(request.provider).embed(request.texts)
+    return EmbedBatchResult(vectors=vectors.tolist())
+
+
+__all__ = ["embed_batch_activity"]
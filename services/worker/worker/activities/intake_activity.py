@@ -0,0 +1,141 @@
+"""Intake extraction activity implementations."""
+
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+
+import sqlalchemy as sa
+from common.extraction import get_classifier
+from common.intake import (
+    IntakeJobOutcome,
+    IntakeRequest,
+    IntakeResult,
+    RequirementType,
+    extract_requirements,
+)
+from temporalio import activity
+
+from worker.database import get_engine
+from worker.settings import settings
+
+# Only the columns the worker writes; the tables are owned by the API service's migrations.
+intake_jobs = sa.table(
+    "intake_jobs",
+    sa.column("id", sa.Uuid()),
+    sa.column("status", sa.String()),
+    sa.column("error", sa.Text()),
+    sa.column("requirement_ids", sa.JSON()),
+    sa.column("completed_at", sa.DateTime(timezone=True)),
+)
+requirements = sa.table(
+    "requirements",
+    sa.column("id", sa.Uuid()),
+    sa.column("project_id", sa.Integer()),
+    sa.column("persona_id", sa.Uuid()),
+    sa.column("text", sa.Text()),
+    sa.column("type", sa.String()),
+    sa.column("confidence", sa.Float()),
+)
+project_stats = sa.table(
+    "project_stats",
+    sa.column("project_id", sa.Integer()),
+    sa.column("requirement_count", sa.Integer()),
+    *(sa.column(f"{requirement_type.value}_count", sa.Integer()) for requirement_type in RequirementType),
+    sa.column("last_activity_at", sa.DateTime(timezone=True)),
+)
+
+_OPEN_JOB_STATUSES = ("pending", "running")
+
+
+@activity.defn
+def process_intake_activity(request: IntakeRequest) -> IntakeResult:
+    """Extract structured requirements from raw intake text.
+
+    Extraction is CPU-bound, so this is a synchronous activity executed on the
+    worker's thread pool rather than on the event loop.
+    """
+
+    activity.logger.info(
+        "Extracting requirements for project %s persona %s (%d chars)",
+        request.project_id,
+        request.persona_id,
+        len(request.text),
+    )
+    classifier = get_classifier(settings.intake_classifier)
+    return IntakeResult(requirements=extract_requirements(request.text, classifier))
+
+
+@activity.defn
+def mark_intake_running_activity(job_id: str) -> None:
+    """Move a pending intake job to running; finished jobs are left untouched."""
+
+    with get_engine(settings.database_url).begin() as connection:
+        connection.execute(
+            intake_jobs.update()
+            .where(intake_jobs.c.id == uuid.UUID(job_id), intake_jobs.c.status == "pending")
+            .values(status="running")
+        )
+
+
+@activity.defn
+def record_intake_outcome_activity(outcome: IntakeJobOutcome) -> None:
+    """Store a finished job's requirements, or its error, in one transaction.
+
+    The job row is claimed while it is still open before anything else is
+    written, so a retried activity never stores the requirements twice.
+    """
+
+    job_is_open = sa.and_(
+        intake_jobs.c.id == uuid.UUID(outcome.job_id), intake_jobs.c.status.in_(_OPEN_JOB_STATUSES)
+    )
+    with get_engine(settings.database_url).begin() as connection:
+        if outcome.error is not None:
+            connection.execute(
+                intake_jobs.update()
+                .where(job_is_open)
+                .values(status="failed", error=outcome.error, completed_at=sa.func.now())
+            )
+            return
+
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "project_id": outcome.project_id,
+                "persona_id": uuid.UUID(outcome.persona_id),
+                "text": requirement.text,
+                "type": RequirementType(requirement.type).value,
+                "confidence": requirement.confidence,
+            }
+            for requirement in outcome.requirements
+        ]
+        claimed = connection.execute(
+            intake_jobs.update()
+            .where(job_is_open)
+            .values(
+                status="completed",
+                requirement_ids=[str(row["id"]) for row in rows],
+                completed_at=sa.func.now(),
+            )
+        )
+        if not claimed.rowcount or not rows:
+            return
+
+        connection.execute(requirements.insert(), rows)
+        # Core inserts bypass the API's rollup listeners, so the counters are adjusted here.
+        counts = Counter(f"{row['type']}_count" for row in rows)
+        counts["requirement_count"] = len(rows)
+        values: dict[str, object] = {column: project_stats.c[column] + amount for column, amount in counts.items()}
+        values["last_activity_at"] = sa.func.now()
+        connection.execute(
+            project_stats.update().where(project_stats.c.project_id == outcome.project_id).values(values)
+        )
+        activity.logger.info("Stored %d requirements for intake job %s", len(rows), outcome.job_id)
+
+
+__all__ = [
+    "RequirementType",
+    "mark_intake_running_activity",
+    "process_intake_activity",
+    "record_intake_outcome_activity",
+]
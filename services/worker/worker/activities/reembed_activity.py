@@ -0,0 +1,67 @@
+"""Activities that recompute stored conversation turn embeddings."""
+
+from __future__ import annotations
+
+import uuid
+from functools import cache
+
+import sqlalchemy as sa
+from common.embeddings import EMBEDDING_DIMENSION, EmbeddingProvider, load_embedder
+from common.reembed import ReembedPageRequest, ReembedPageResult
+from pgvector.sqlalchemy import Vector
+from temporalio import activity
+
+from worker.database import get_engine
+from worker.settings import settings
+
+# Only the columns the re-embed touches; the table itself is owned by the API service's migrations.
+turns = sa.table(
+    "conversation_turns",
+    sa.column("id", sa.Uuid()),
+    sa.column("text", sa.Text()),
+    sa.column("embedding", Vector(EMBEDDING_DIMENSION)),
+)
+
+
+@cache
+def _embedder(spec: str) -> EmbeddingProvider:
+    return load_embedder(spec, EMBEDDING_DIMENSION)
+
+
+@activity.defn
+def count_turns_activity() -> int:
+    """Return the number of conversation turns, used as the run's progress total."""
+
+    with get_engine(settings.database_url).connect() as connection:
+        return connection.scalar(sa.select(sa.func.count()).select_from(turns)) or 0
+
+
+@activity.defn
+def reembed_page_activity(request: ReembedPageRequest) -> ReembedPageResult:
+    """Re-embed the next keyset page of a partition and write it back with one bulk UPDATE.
+
+    Re-running a page is harmless, so a retried activity simply writes the
+    same embeddings again.
+    """
+
+    query = sa.select(turns.c.id, turns.c.text).order_by(turns.c.id).limit(request.page_size)
+    if request.after_id is not None:
+        query = query.where(turns.c.id > uuid.UUID(request.after_id))
+    if request.before_id is not None:
+        query = query.where(turns.c.id <= uuid.UUID(request.before_id))
+
+    with get_engine(settings.database_url).begin() as connection:
+        rows = connection.execute(query).all()
+        if not rows:
+            return ReembedPageResult()
+        activity.heartbeat(len(rows))
+        vectors = _embedder(request.provider).embed([row.text for row in rows])
+        connection.execute(
+            turns.update().where(turns.c.id == sa.bindparam("turn_id")),
+            [{"turn_id": row.id, "embedding": vector} for row, vector in zip(rows, vectors)],
+        )
+
+    return ReembedPageResult(count=len(rows), last_id=str(rows[-1].id))
+
+
+__all__ = ["count_turns_activity", "reembed_page_activity"]
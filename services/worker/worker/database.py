@@ -0,0 +1,20 @@
+"""Database access shared by the worker's activities.
+
+The worker writes to tables owned by the API service's migrations, so
+activities declare only the columns they touch with ``sa.table``.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+
+import sqlalchemy as sa
+
+
+@cache
+def get_engine(url: str) -> sa.Engine:
+    """Return the process-wide engine for ``url``."""
+    return sa.create_engine(url, pool_pre_ping=True)
+
+
+__all__ = ["get_engine"]
@@ -9,6 +9,20 @@ class Settings(BaseSettings):
 
     host: str = "localhost:7233"
     namespace: str = "default"
+    activity_threads: int = Field(
+        default=8,
+        description="Thread pool size for synchronous (CPU-bound) activities.",
+    )
+    intake_classifier: str = Field(
+        default="hashed-linear",
+        alias="INTAKE_CLASSIFIER",
+        description="Requirement classifier: built-in name, .npz weights path or module:factory.",
+    )
+    database_url: str = Field(
+        default="sqlite:///./app.db",
+        alias="DATABASE_URL",
+        description="Database read and written by the re-embed workflow; the API service's database.",
+    )
     otel_exporter_otlp_endpoint: str | None = Field(
         default=None,
         alias="OTEL_EXPORTER_OTLP_ENDPOINT",
@@ -1,6 +1,8 @@
 ﻿"""Workflow definitions."""
 
 from .demo_workflow import EchoWorkflow
+from .embedding_workflow import EmbedBatchWorkflow
 from .intake_workflow import IntakeWorkflow
+from .reembed_workflow import ReembedWorkflow
 
-__all__ = ["EchoWorkflow", "IntakeWorkflow"]
+__all__ = ["EchoWorkflow", "EmbedBatchWorkflow", "IntakeWorkflow", "ReembedWorkflow"]
@@ -0,0 +1,39 @@
+"""Workflow that embeds a batch of conversation turn texts."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from opentelemetry import trace
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+
+with workflow.unsafe.imports_passed_through():
+    from common.embeddings import (
+        EMBED_BATCH_WORKFLOW_NAME,
+        EmbedBatchRequest,
+        EmbedBatchResult,
+    )
+
+    from worker.activities.embedding_activity import embed_batch_activity
+
+tracer = trace.get_tracer(__name__)
+
+
+@workflow.defn(name=EMBED_BATCH_WORKFLOW_NAME)
+class EmbedBatchWorkflow:
+    """Embed a batch of texts, retrying the activity on failure."""
+
+    @workflow.run
+    async def run(self, request: EmbedBatchRequest) -> EmbedBatchResult:
+        """Execute the embedding activity and return the vectors in request order."""
+
+        with tracer.start_as_current_span("EmbedBatchWorkflow.run") as span:
+            span.set_attribute("workflow.input.batch_size", len(request.texts))
+
+            return await workflow.execute_activity(
+                embed_batch_activity,
+                request,
+                start_to_close_timeout=timedelta(minutes=2),
+                retry_policy=RetryPolicy(maximum_attempts=3),
+            )
@@ -0,0 +1,83 @@
+"""Workflow that runs requirement extraction for an intake submission."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from opentelemetry import trace
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError
+
+with workflow.unsafe.imports_passed_through():
+    from common.intake import (
+        INTAKE_WORKFLOW_NAME,
+        IntakeJobOutcome,
+        IntakeRequest,
+        IntakeResult,
+    )
+
+    from worker.activities.intake_activity import (
+        mark_intake_running_activity,
+        process_intake_activity,
+        record_intake_outcome_activity,
+    )
+
+tracer = trace.get_tracer(__name__)
+
+_JOB_UPDATE_TIMEOUT = timedelta(seconds=30)
+
+
+@workflow.defn(name=INTAKE_WORKFLOW_NAME)
+class IntakeWorkflow:
+    """Extract requirements from intake text, retrying the activity on failure.
+
+    When the request carries an intake job, the worker moves the job to running
+    and records its requirements (or the failure) itself, so the API only reads
+    job rows and nothing depends on a client polling for the result.
+    """
+
+    @workflow.run
+    async def run(self, request: IntakeRequest) -> IntakeResult:
+        """Execute the extraction activity and return the extracted requirements."""
+
+        with tracer.start_as_current_span("IntakeWorkflow.run") as span:
+            span.set_attribute("workflow.input.project_id", request.project_id)
+            span.set_attribute("workflow.input.text_length", len(request.text))
+
+            if request.job_id is not None:
+                await workflow.execute_activity(
+                    mark_intake_running_activity,
+                    request.job_id,
+                    start_to_close_timeout=_JOB_UPDATE_TIMEOUT,
+                )
+
+            try:
+                result = await workflow.execute_activity(
+                    process_intake_activity,
+                    request,
+                    start_to_close_timeout=timedelta(minutes=5),
+                    retry_policy=RetryPolicy(maximum_attempts=5),
+                )
+            except ActivityError:
+                await self._record(request, IntakeResult(), error="Requirement extraction failed")
+                raise
+
+            await self._record(request, result)
+            span.set_attribute("workflow.result.requirement_count", len(result.requirements))
+            return result
+
+    async def _record(self, request: IntakeRequest, result: IntakeResult, error: str | None = None) -> None:
+        if request.job_id is None:
+            return
+        await workflow.execute_activity(
+            record_intake_outcome_activity,
+            IntakeJobOutcome(
+                job_id=request.job_id,
+                project_id=request.project_id,
+                persona_id=request.persona_id,
+                requirements=result.requirements,
+                error=error,
+            ),
+            start_to_close_timeout=_JOB_UPDATE_TIMEOUT,
+        )
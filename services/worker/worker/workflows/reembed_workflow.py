@@ -0,0 +1,121 @@
+"""Workflow that recomputes every conversation turn embedding with checkpointing."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from datetime import timedelta
+
+from opentelemetry import trace
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+
+with workflow.unsafe.imports_passed_through():
+    from common.reembed import (
+        REEMBED_WORKFLOW_NAME,
+        ReembedPageRequest,
+        ReembedPartition,
+        ReembedProgress,
+        ReembedRequest,
+        split_id_space,
+    )
+
+    from worker.activities.reembed_activity import (
+        count_turns_activity,
+        reembed_page_activity,
+    )
+
+tracer = trace.get_tracer(__name__)
+
+_PAGE_TIMEOUT = timedelta(minutes=10)
+_PAGE_HEARTBEAT_TIMEOUT = timedelta(minutes=2)
+_PAGE_RETRY = RetryPolicy(maximum_attempts=10, maximum_interval=timedelta(minutes=1))
+
+
+@workflow.defn(name=REEMBED_WORKFLOW_NAME)
+class ReembedWorkflow:
+    """Walk the turn id space in ``concurrency`` partitions, re-embedding one page per partition per round.
+
+    After each round the partitions' cursors are updated; after ``pages_per_run``
+    pages the workflow continues as new with the cursors as its input, keeping
+    the event history bounded. ``rows_per_second`` paces rounds with durable
+    timers so the database is not saturated.
+    """
+
+    def __init__(self) -> None:
+        self._partitions: list[ReembedPartition] = []
+        self._processed = 0
+        self._total: int | None = None
+
+    @workflow.query
+    def progress(self) -> ReembedProgress:
+        """Rows re-embedded so far and how many partitions are finished."""
+        return ReembedProgress(
+            processed=self._processed,
+            total=self._total,
+            partitions=len(self._partitions),
+            completed_partitions=sum(partition.done for partition in self._partitions),
+        )
+
+    async def _reembed_round(self, request: ReembedRequest, active: list[ReembedPartition]) -> int:
+        results = await asyncio.gather(
+            *(
+                workflow.execute_activity(
+                    reembed_page_activity,
+                    ReembedPageRequest(
+                        provider=request.provider,
+                        page_size=request.page_size,
+                        after_id=partition.after_id,
+                        before_id=partition.before_id,
+                    ),
+                    start_to_close_timeout=_PAGE_TIMEOUT,
+                    heartbeat_timeout=_PAGE_HEARTBEAT_TIMEOUT,
+                    retry_policy=_PAGE_RETRY,
+                )
+                for partition in active
+            )
+        )
+        rows = 0
+        for partition, result in zip(active, results):
+            rows += result.count
+            if result.last_id is not None:
+                partition.after_id = result.last_id
+            partition.done = result.count < request.page_size
+        self._processed += rows
+        return rows
+
+    @workflow.run
+    async def run(self, request: ReembedRequest) -> ReembedProgress:
+        """Re-embed every turn, resuming from the checkpoint in ``request`` if there is one."""
+
+        with tracer.start_as_current_span("ReembedWorkflow.run") as span:
+            self._partitions = request.partitions or split_id_space(max(request.concurrency, 1))
+            self._processed = request.processed
+            self._total = request.total
+            if self._total is None:
+                self._total = await workflow.execute_activity(
+                    count_turns_activity,
+                    start_to_close_timeout=_PAGE_TIMEOUT,
+                    retry_policy=_PAGE_RETRY,
+                )
+            span.set_attribute("workflow.input.processed", self._processed)
+
+            pages = 0
+            while active := [partition for partition in self._partitions if not partition.done]:
+                if pages >= request.pages_per_run:
+                    workflow.continue_as_new(
+                        replace(request, partitions=self._partitions, processed=self._processed, total=self._total)
+                    )
+
+                started = workflow.now()
+                rows = await self._reembed_round(request, active)
+                pages += len(active)
+
+                if request.rows_per_second:
+                    elapsed = (workflow.now() - started).total_seconds()
+                    delay = rows / request.rows_per_second - elapsed
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+            span.set_attribute("workflow.result.processed", self._processed)
+            return self.progress()